@@ -3,11 +3,19 @@
 
 import os
 import json
+import hashlib
+import argparse
 import jieba
 import pandas as pd
 from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.decomposition import TruncatedSVD
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
+from 后台写入 import BackgroundWriter
+from 性能追踪 import tracer, span, count, add_tracing_arguments, setup_tracing
+
+# 截断SVD文档嵌入的默认维度
+DEFAULT_EMBEDDING_DIMS = 128
 
 def load_cleaned_text(file_path):
     """加载清洗后的文本"""
@@ -27,7 +35,8 @@ def prepare_documents(cleaned_dir):
     scientist_names = []
     
     print("正在加载文档...")
-    for filename in os.listdir(cleaned_dir):
+    # 按文件名排序，结果与目录遍历顺序无关（分片合并的结果也按科学家名称排序）
+    for filename in sorted(os.listdir(cleaned_dir)):
         if filename.endswith('_清洗文本.txt'):
             scientist_name = filename.replace('_清洗文本.txt', '')
             file_path = os.path.join(cleaned_dir, filename)
@@ -40,19 +49,21 @@ def prepare_documents(cleaned_dir):
     
     return documents, scientist_names
 
-def calculate_tfidf(documents, scientist_names):
-    """计算TF-IDF值"""
-    print("正在计算TF-IDF值...")
-    
-    # 准备文档列表
-    docs = [documents[name] for name in scientist_names]
+def create_tfidf_vectorizer(analyzer=None):
+    """创建TF-IDF向量化器（传入analyzer时直接使用其分词结果，不再分词和去停用词）"""
+    if analyzer is not None:
+        return TfidfVectorizer(
+            analyzer=analyzer,
+            max_features=10000,
+            min_df=2,
+            max_df=0.8
+        )
     
-    # 创建TF-IDF向量化器
     # 使用中文停用词
     stop_words = get_chinese_stopwords()
     
     # 初始化TF-IDF向量化器
-    vectorizer = TfidfVectorizer(
+    return TfidfVectorizer(
         tokenizer=chinese_tokenizer,
         stop_words=stop_words,
         max_features=10000,  # 最多保留10000个特征
@@ -60,6 +71,16 @@ def calculate_tfidf(documents, scientist_names):
         min_df=2,  # 词语至少出现在2个文档中
         max_df=0.8  # 词语最多出现在80%的文档中
     )
+
+def calculate_tfidf(documents, scientist_names):
+    """计算TF-IDF值"""
+    print("正在计算TF-IDF值...")
+    
+    # 准备文档列表
+    docs = [documents[name] for name in scientist_names]
+    
+    # 创建TF-IDF向量化器
+    vectorizer = create_tfidf_vectorizer()
     
     # 计算TF-IDF矩阵
     tfidf_matrix = vectorizer.fit_transform(docs)
@@ -69,6 +90,28 @@ def calculate_tfidf(documents, scientist_names):
     
     return tfidf_matrix, feature_names, vectorizer
 
+def reduce_tfidf_dimensions(tfidf_matrix, n_components=DEFAULT_EMBEDDING_DIMS, random_state=42):
+    """使用随机化截断SVD压缩TF-IDF矩阵，得到稠密的float32文档嵌入"""
+    print("正在进行截断SVD降维...")
+    
+    # 维度不能超过矩阵的秩上限（文档数或特征数）
+    max_components = max(1, min(tfidf_matrix.shape) - 1)
+    if n_components > max_components:
+        print(f"  目标维度 {n_components} 超过矩阵上限，自动调整为 {max_components}")
+        n_components = max_components
+    
+    svd = TruncatedSVD(
+        n_components=n_components,
+        algorithm='randomized',
+        n_iter=5,
+        random_state=random_state
+    )
+    embeddings = svd.fit_transform(tfidf_matrix).astype(np.float32)
+    
+    print(f"  嵌入矩阵形状: {embeddings.shape}，保留方差比例: {svd.explained_variance_ratio_.sum():.4f}")
+    
+    return embeddings, svd
+
 def chinese_tokenizer(text):
     """中文分词器"""
     # 使用jieba进行分词
@@ -118,12 +161,12 @@ def get_top_tfidf_words(tfidf_matrix, feature_names, scientist_names, top_n=50):
     
     return results
 
-def calculate_document_similarity(tfidf_matrix, scientist_names):
-    """计算文档相似度"""
+def calculate_document_similarity(tfidf_matrix, scientist_names, embeddings=None):
+    """计算文档相似度（传入embeddings时在降维后的嵌入空间中计算）"""
     print("正在计算文档相似度...")
     
     # 计算余弦相似度矩阵
-    similarity_matrix = cosine_similarity(tfidf_matrix)
+    similarity_matrix = cosine_similarity(embeddings if embeddings is not None else tfidf_matrix)
     
     # 创建相似度DataFrame
     similarity_df = pd.DataFrame(
@@ -183,26 +226,99 @@ def save_similarity_results(similarity_df, output_dir):
         for similar_scientist, similarity in top_similar.items():
             print(f"  {similar_scientist}: {similarity:.4f}")
 
+def feature_checksum(feature_names):
+    """TF-IDF特征列表的md5，用于确认SVD成分与当前特征空间一致"""
+    return hashlib.md5('\n'.join(feature_names).encode('utf-8')).hexdigest()
+
+def save_document_embeddings(embeddings, svd, scientist_names, feature_names, output_dir):
+    """保存文档嵌入矩阵和拟合好的SVD成分（其他文本可用同一SVD投影到嵌入空间）"""
+    print("正在保存文档嵌入矩阵...")
+    
+    # 创建输出目录
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    
+    # 嵌入矩阵以float32二进制保存，行顺序与科学家列表一致
+    np.save(os.path.join(output_dir, "文档嵌入矩阵.npy"), embeddings.astype(np.float32))
+    np.save(os.path.join(output_dir, "截断SVD成分.npy"), svd.components_)
+    
+    embedding_info = {
+        '科学家': list(scientist_names),
+        '维度': int(embeddings.shape[1]),
+        '保留方差比例': float(svd.explained_variance_ratio_.sum()),
+        '特征数': len(feature_names),
+        '特征校验': feature_checksum(feature_names)
+    }
+    with open(os.path.join(output_dir, "文档嵌入信息.json"), 'w', encoding='utf-8') as f:
+        json.dump(embedding_info, f, ensure_ascii=False, indent=2)
+    
+    print(f"文档嵌入矩阵已保存到 {output_dir} 目录")
+
+def load_document_embeddings(output_dir):
+    """加载文档嵌入矩阵，返回 (嵌入矩阵, 科学家列表)"""
+    embeddings = np.load(os.path.join(output_dir, "文档嵌入矩阵.npy"))
+    with open(os.path.join(output_dir, "文档嵌入信息.json"), 'r', encoding='utf-8') as f:
+        embedding_info = json.load(f)
+    return embeddings, embedding_info['科学家']
+
+def load_svd_components(output_dir, feature_names):
+    """加载 TFIDF分析.py 拟合的SVD成分，特征空间与当前TF-IDF不一致时报错"""
+    with open(os.path.join(output_dir, "文档嵌入信息.json"), 'r', encoding='utf-8') as f:
+        embedding_info = json.load(f)
+    if embedding_info.get('特征校验') != feature_checksum(feature_names):
+        raise ValueError(f"{output_dir} 中的SVD与当前TF-IDF特征不一致，请重新运行 TFIDF分析.py")
+    return np.load(os.path.join(output_dir, "截断SVD成分.npy"))
+
+def project_to_embeddings(tfidf_matrix, components):
+    """用已拟合的SVD成分把TF-IDF向量投影到文档嵌入空间（与 TruncatedSVD.transform 相同）"""
+    return np.asarray(tfidf_matrix @ components.T, dtype=np.float32)
+
 def main():
+    parser = argparse.ArgumentParser(description="TF-IDF分析与文档相似度")
+    parser.add_argument('--dims', type=int, default=DEFAULT_EMBEDDING_DIMS, help="截断SVD文档嵌入的维度")
+    parser.add_argument('--embedding-similarity', action='store_true',
+                        help="在降维后的文档嵌入空间中计算文档相似度（默认使用完整的TF-IDF向量）")
+    add_tracing_arguments(parser)
+    args = parser.parse_args()
+    setup_tracing(args)
+    
     # 设置目录路径
     cleaned_dir = "output/cleaned_data"
     output_dir = "output/tfidf_analysis"
     
     # 准备文档
-    documents, scientist_names = prepare_documents(cleaned_dir)
+    with span("加载文档"):
+        documents, scientist_names = prepare_documents(cleaned_dir)
+    count("文档", len(scientist_names))
     
     # 计算TF-IDF
-    tfidf_matrix, feature_names, vectorizer = calculate_tfidf(documents, scientist_names)
+    with span("计算TF-IDF"):
+        tfidf_matrix, feature_names, vectorizer = calculate_tfidf(documents, scientist_names)
+    count("特征", len(feature_names))
+    
+    # 结果一算出来就交给后台线程保存，与后续计算同时进行
+    writer = BackgroundWriter()
     
     # 获取每个科学家的Top TF-IDF词汇
-    tfidf_results = get_top_tfidf_words(tfidf_matrix, feature_names, scientist_names, top_n=100)
+    with span("提取Top词汇"):
+        tfidf_results = get_top_tfidf_words(tfidf_matrix, feature_names, scientist_names, top_n=100)
+    writer.submit(save_tfidf_results, tfidf_results, output_dir)
+    
+    # 截断SVD降维，供聚类、相似度、投影等下游步骤按需使用
+    with span("截断SVD降维"):
+        embeddings, svd = reduce_tfidf_dimensions(tfidf_matrix, n_components=args.dims)
+    writer.submit(save_document_embeddings, embeddings, svd, scientist_names, feature_names, output_dir)
     
     # 计算文档相似度
-    similarity_df = calculate_document_similarity(tfidf_matrix, scientist_names)
+    with span("计算文档相似度"):
+        similarity_df = calculate_document_similarity(
+            tfidf_matrix, scientist_names, embeddings=embeddings if args.embedding_similarity else None)
+    writer.submit(save_similarity_results, similarity_df, output_dir)
     
-    # 保存结果
-    save_tfidf_results(tfidf_results, output_dir)
-    save_similarity_results(similarity_df, output_dir)
+    # 等待所有文件写完（后台写入出错时在这里抛出）
+    with span("等待写入完成"):
+        writer.close()
+    tracer.save("TF-IDF分析")
     
     print(f"\nTF-IDF分析完成! 结果保存在 {output_dir} 目录中。")
 
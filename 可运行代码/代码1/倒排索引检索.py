@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import argparse
+import numpy as np
+
+# 倒排表差值编码使用的整数宽度（按每个词的最大差值选择最窄的类型）
+POSTING_DTYPES = [np.uint8, np.uint16, np.uint32]
+
+
+class SentenceIndexBuilder:
+    """句子级倒排索引构建器"""
+
+    def __init__(self):
+        self.vocabulary = {}
+        self.scientists = []
+        self.term_ids = []
+        self.sentence_ids = []
+        self.term_freqs = []
+        self.sentence_scientist = []
+        self.sentence_number = []
+        self.sentence_length = []
+
+    def add_scientist(self, scientist_name, tokenized_sentences):
+        """添加一位科学家的分词后句子（句子编号从1开始，与情感分析数据一致）"""
+        scientist_id = len(self.scientists)
+        self.scientists.append(scientist_name)
+
+        for i, tokens in enumerate(tokenized_sentences):
+            sentence_id = len(self.sentence_number)
+            self.sentence_scientist.append(scientist_id)
+            self.sentence_number.append(i + 1)
+            self.sentence_length.append(len(tokens))
+
+            # 统计句内词频
+            counts = {}
+            for token in tokens:
+                term_id = self.vocabulary.setdefault(token, len(self.vocabulary))
+                counts[term_id] = counts.get(term_id, 0) + 1
+
+            for term_id, freq in counts.items():
+                self.term_ids.append(term_id)
+                self.sentence_ids.append(sentence_id)
+                self.term_freqs.append(freq)
+
+    def build(self):
+        """生成压缩倒排表"""
+        term_ids = np.asarray(self.term_ids, dtype=np.int64)
+        sentence_ids = np.asarray(self.sentence_ids, dtype=np.int64)
+        term_freqs = np.asarray(self.term_freqs, dtype=np.int64)
+
+        # 按 (词, 句子) 排序，使每个词的倒排表连续且句子编号递增
+        order = np.lexsort((sentence_ids, term_ids))
+        term_ids = term_ids[order]
+        sentence_ids = sentence_ids[order]
+        term_freqs = term_freqs[order]
+
+        num_terms = len(self.vocabulary)
+        counts = np.bincount(term_ids, minlength=num_terms)
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+        # 差值编码：每个词第一个位置保存原值，之后保存与前一项的差
+        deltas = np.diff(sentence_ids, prepend=0)
+        deltas[starts[counts > 0]] = sentence_ids[starts[counts > 0]]
+
+        chunks = []
+        byte_offsets = np.zeros(num_terms, dtype=np.int64)
+        widths = np.zeros(num_terms, dtype=np.int8)
+        position = 0
+        for term_id in range(num_terms):
+            term_deltas = deltas[starts[term_id]:starts[term_id] + counts[term_id]]
+            max_delta = int(term_deltas.max()) if term_deltas.size else 0
+            width = 0 if max_delta < 2 ** 8 else 1 if max_delta < 2 ** 16 else 2
+            encoded = term_deltas.astype(POSTING_DTYPES[width]).tobytes()
+
+            chunks.append(encoded)
+            byte_offsets[term_id] = position
+            widths[term_id] = width
+            position += len(encoded)
+
+        index = SentenceInvertedIndex()
+        index.vocabulary = dict(self.vocabulary)
+        index.scientists = list(self.scientists)
+        index.postings = np.frombuffer(b''.join(chunks), dtype=np.uint8)
+        index.byte_offsets = byte_offsets
+        index.widths = widths
+        index.posting_starts = starts
+        index.posting_counts = counts
+        index.term_freqs = np.minimum(term_freqs, np.iinfo(np.uint16).max).astype(np.uint16)
+        index.sentence_scientist = np.asarray(self.sentence_scientist, dtype=np.int32)
+        index.sentence_number = np.asarray(self.sentence_number, dtype=np.int32)
+        index.sentence_length = np.asarray(self.sentence_length, dtype=np.int32)
+        return index
+
+
+class SentenceInvertedIndex:
+    """句子级倒排索引（支持布尔检索和BM25排序）
+
+    tokenizer 为构建索引时使用的句子分词函数（如 AdvancedDataCleaningPipeline.tokenize_sentence_for_index），
+    给定时检索词先经过相同的分词和实体对齐再查找；为 None 时检索词按原样查找。
+    """
+
+    def __init__(self, tokenizer=None):
+        self.tokenizer = tokenizer
+        self.vocabulary = {}
+        self.scientists = []
+        self.postings = None
+        self.byte_offsets = None
+        self.widths = None
+        self.posting_starts = None
+        self.posting_counts = None
+        self.term_freqs = None
+        self.sentence_scientist = None
+        self.sentence_number = None
+        self.sentence_length = None
+
+    def _postings(self, term):
+        """解码一个词的倒排表，返回 (句子全局编号数组, 词频数组)"""
+        term_id = self.vocabulary.get(term)
+        if term_id is None:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.uint16)
+
+        count = int(self.posting_counts[term_id])
+        deltas = np.frombuffer(
+            self.postings,
+            dtype=POSTING_DTYPES[self.widths[term_id]],
+            count=count,
+            offset=int(self.byte_offsets[term_id])
+        )
+        sentence_ids = np.cumsum(deltas, dtype=np.int64)
+        start = int(self.posting_starts[term_id])
+        return sentence_ids, self.term_freqs[start:start + count]
+
+    def analyze(self, term):
+        """把一个检索词转换为索引中的词（与构建时相同的分词和实体对齐，如 '玛丽·居里' → ['居里夫人']）"""
+        if self.tokenizer is None:
+            return [term]
+        return list(dict.fromkeys(self.tokenizer(term)))
+
+    def _searchable(self, terms):
+        """去掉分词后没有剩下任何词的检索词（如停用词），并提示已忽略"""
+        kept = []
+        for term in terms:
+            if self.analyze(term):
+                kept.append(term)
+            else:
+                print(f"警告: 检索词 '{term}' 分词后为空（停用词或过短），已忽略")
+        return kept
+
+    def _term_sentences(self, term):
+        """包含检索词的句子：检索词分成多个词时须全部出现在同一句中"""
+        tokens = self.analyze(term)
+        if not tokens:
+            return np.empty(0, dtype=np.int64)
+        result = self._postings(tokens[0])[0]
+        for token in tokens[1:]:
+            result = np.intersect1d(result, self._postings(token)[0], assume_unique=True)
+        return result
+
+    def search(self, must=(), should=(), must_not=()):
+        """布尔检索：必须包含 must 中所有词、至少包含 should 中一个词、不包含 must_not 中任何词"""
+        result = None
+        must, should, must_not = self._searchable(must), self._searchable(should), self._searchable(must_not)
+
+        for term in must:
+            sentence_ids = self._term_sentences(term)
+            result = sentence_ids if result is None else np.intersect1d(result, sentence_ids, assume_unique=True)
+
+        if should:
+            any_ids = np.unique(np.concatenate([self._term_sentences(term) for term in should]))
+            result = any_ids if result is None else np.intersect1d(result, any_ids, assume_unique=True)
+
+        # 只有排除条件时没有可检索的候选集
+        if result is None:
+            return []
+
+        for term in must_not:
+            result = np.setdiff1d(result, self._term_sentences(term), assume_unique=True)
+
+        return self._to_hits(result)
+
+    def rank(self, terms, top_k=10, require_all=False, k1=1.5, b=0.75):
+        """BM25排序检索，返回 [(科学家, 句子编号, 得分), ...]"""
+        num_sentences = len(self.sentence_number)
+        if num_sentences == 0:
+            return []
+        avg_length = max(1.0, float(self.sentence_length.mean()))
+
+        # 检索词按构建时的方式分词后逐词计分
+        terms = list(dict.fromkeys(token for term in self._searchable(terms) for token in self.analyze(term)))
+        hit_ids = []
+        hit_scores = []
+        for term in terms:
+            sentence_ids, freqs = self._postings(term)
+            if sentence_ids.size == 0:
+                continue
+
+            df = sentence_ids.size
+            idf = np.log(1 + (num_sentences - df + 0.5) / (df + 0.5))
+            freqs = freqs.astype(np.float64)
+            norm = k1 * (1 - b + b * self.sentence_length[sentence_ids] / avg_length)
+            hit_ids.append(sentence_ids)
+            hit_scores.append(idf * freqs * (k1 + 1) / (freqs + norm))
+
+        if not hit_ids:
+            return []
+
+        # 按句子汇总各词得分
+        unique_ids, inverse = np.unique(np.concatenate(hit_ids), return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(hit_scores))
+
+        if require_all:
+            # 有任何一个词不在词表中时不可能全部命中
+            if len(hit_ids) < len(terms):
+                return []
+            matched = np.bincount(inverse) == len(hit_ids)
+            unique_ids, scores = unique_ids[matched], scores[matched]
+
+        if top_k < len(scores):
+            top = np.argpartition(-scores, top_k)[:top_k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind='stable')]
+
+        return [
+            (self.scientists[self.sentence_scientist[i]], int(self.sentence_number[i]), round(float(s), 4))
+            for i, s in zip(unique_ids[top], scores[top])
+        ]
+
+    def _to_hits(self, sentence_ids):
+        """把句子全局编号转换为 (科学家, 句子编号)"""
+        return [
+            (self.scientists[self.sentence_scientist[i]], int(self.sentence_number[i]))
+            for i in sentence_ids
+        ]
+
+    def save(self, index_dir):
+        """保存索引到目录"""
+        if not os.path.exists(index_dir):
+            os.makedirs(index_dir)
+
+        np.savez(
+            os.path.join(index_dir, "sentence_index.npz"),
+            postings=self.postings,
+            byte_offsets=self.byte_offsets,
+            widths=self.widths,
+            posting_starts=self.posting_starts,
+            posting_counts=self.posting_counts,
+            term_freqs=self.term_freqs,
+            sentence_scientist=self.sentence_scientist,
+            sentence_number=self.sentence_number,
+            sentence_length=self.sentence_length
+        )
+
+        # 词表按词编号顺序保存
+        terms = sorted(self.vocabulary, key=self.vocabulary.get)
+        with open(os.path.join(index_dir, "vocabulary.json"), 'w', encoding='utf-8') as f:
+            json.dump({'科学家': self.scientists, '词表': terms}, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, index_dir, tokenizer=None):
+        """从目录加载索引（tokenizer 见类说明）"""
+        index = cls(tokenizer)
+        data = np.load(os.path.join(index_dir, "sentence_index.npz"))
+        for name in data.files:
+            setattr(index, name, data[name])
+
+        with open(os.path.join(index_dir, "vocabulary.json"), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        index.scientists = meta['科学家']
+        index.vocabulary = {term: i for i, term in enumerate(meta['词表'])}
+        return index
+
+
+def load_sentence_text(sentiment_dir, hits):
+    """读取检索结果对应的句子原文（每位科学家的文件只读取一次）"""
+    sentences = {}
+    texts = []
+    for hit in hits:
+        scientist_name, sentence_number = hit[0], hit[1]
+        if scientist_name not in sentences:
+            file_path = os.path.join(sentiment_dir, f"{scientist_name}_情感分析.json")
+            with open(file_path, 'r', encoding='utf-8') as f:
+                sentences[scientist_name] = json.load(f)
+        texts.append(sentences[scientist_name][sentence_number - 1])
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="在清洗后的句子中检索词语")
+    parser.add_argument('terms', nargs='+', help="检索词")
+    parser.add_argument('--mode', choices=['and', 'or', 'bm25'], default='bm25', help="检索方式")
+    parser.add_argument('--exclude', nargs='*', default=[], help="排除包含这些词的句子")
+    parser.add_argument('--top', type=int, default=10, help="显示的结果数量")
+    args = parser.parse_args()
+
+    # 设置目录路径
+    index_dir = "output/sentence_index"
+    sentiment_dir = "output/sentiment_data"
+
+    # 检索词使用与构建索引时相同的分词、停用词和实体对齐（清洗模块导入本模块，在这里延迟导入）
+    from 高级数据清理 import AdvancedDataCleaningPipeline
+    index = SentenceInvertedIndex.load(index_dir, AdvancedDataCleaningPipeline().tokenize_sentence_for_index)
+
+    if args.mode == 'bm25':
+        hits = index.rank(args.terms, top_k=args.top)
+    elif args.mode == 'and':
+        hits = index.search(must=args.terms, must_not=args.exclude)
+    else:
+        hits = index.search(should=args.terms, must_not=args.exclude)
+
+    print(f"共找到 {len(hits)} 个句子")
+    shown = hits[:args.top]
+    for hit, sentence in zip(shown, load_sentence_text(sentiment_dir, shown)):
+        score = f" 得分: {hit[2]}" if len(hit) > 2 else ""
+        print(f"  [{hit[0]} #{hit[1]}]{score} {sentence}")
+
+if __name__ == "__main__":
+    main()
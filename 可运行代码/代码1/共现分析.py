@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import re
+import json
+import argparse
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from 倒排索引检索 import SentenceInvertedIndex
+from 高级数据清理 import AdvancedDataCleaningPipeline
+
+def load_association_data(association_dir):
+    """加载所有科学家的关联分析词语序列"""
+    token_lists = {}
+    for filename in sorted(os.listdir(association_dir)):
+        if filename.endswith('_关联分析.json'):
+            scientist_name = filename.replace('_关联分析.json', '')
+            with open(os.path.join(association_dir, filename), 'r', encoding='utf-8') as f:
+                token_lists[scientist_name] = json.load(f)
+    return token_lists
+
+def sentence_segment_ids(cleaned_text, tokenize):
+    """按清洗文本的分句（与情感分析相同的句末标点）给关联分析词序列中的每个词标上句子编号
+
+    tokenize 为清洗阶段的关联分析分词函数；jieba在句末标点处总会断开，逐句分词拼接后与整篇分词结果相同。
+    """
+    lengths = [len(tokenize(sentence)) for sentence in re.split(r'[。！？]', cleaned_text)]
+    return np.repeat(np.arange(len(lengths), dtype=np.int32), lengths)
+
+def load_sentence_segments(cleaned_dir, token_ids):
+    """读取各科学家的清洗文本，生成与词编号数组等长的句子编号数组"""
+    pipeline = AdvancedDataCleaningPipeline()
+    segments = {}
+    for scientist_name, ids in token_ids.items():
+        with open(os.path.join(cleaned_dir, f"{scientist_name}_清洗文本.txt"), 'r', encoding='utf-8') as f:
+            segment_ids = sentence_segment_ids(f.read(), pipeline.prepare_for_association_analysis)
+        if len(segment_ids) != len(ids):
+            raise ValueError(f"{scientist_name} 的清洗文本与关联分析数据不一致（{len(segment_ids)} ≠ {len(ids)} 个词），请重新运行清洗")
+        segments[scientist_name] = segment_ids
+    return segments
+
+def encode_tokens(token_lists):
+    """建立全局词表，把每个科学家的词语序列转换为词编号数组"""
+    names = list(token_lists)
+    lengths = [len(token_lists[name]) for name in names]
+    all_tokens = np.array([token for name in names for token in token_lists[name]], dtype=object)
+
+    vocabulary, ids = np.unique(all_tokens, return_inverse=True)
+    ids = ids.astype(np.int32)
+
+    # 按长度切回每个科学家
+    boundaries = np.cumsum(lengths)[:-1]
+    return list(vocabulary), dict(zip(names, np.split(ids, boundaries)))
+
+def build_window_cooccurrence(token_ids, vocab_size, window=5, segment_ids=None):
+    """统计滑动窗口内的词共现次数，返回对称稀疏矩阵（对角线为0）
+
+    segment_ids 给定时，不同片段（如不同句子）之间的词不计共现。
+    """
+    rows = []
+    cols = []
+    for offset in range(1, window):
+        left = token_ids[:-offset]
+        right = token_ids[offset:]
+
+        keep = left != right
+        if segment_ids is not None:
+            keep &= segment_ids[:-offset] == segment_ids[offset:]
+        rows.append(left[keep])
+        cols.append(right[keep])
+
+    rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int32)
+    cols = np.concatenate(cols) if cols else np.empty(0, dtype=np.int32)
+
+    # 同时写入 (a, b) 和 (b, a)，转换为CSR时重复项自动相加
+    data = np.ones(2 * len(rows), dtype=np.int32)
+    matrix = sparse.coo_matrix(
+        (data, (np.concatenate([rows, cols]), np.concatenate([cols, rows]))),
+        shape=(vocab_size, vocab_size)
+    )
+    return matrix.tocsr()
+
+def sentence_term_matrix(index):
+    """由句子倒排索引构建 句子×词 的0/1矩阵"""
+    term_ids = []
+    sentence_ids = []
+    for term, term_id in index.vocabulary.items():
+        postings, _ = index._postings(term)
+        sentence_ids.append(postings)
+        term_ids.append(np.full(len(postings), term_id, dtype=np.int32))
+
+    sentence_ids = np.concatenate(sentence_ids) if sentence_ids else np.empty(0, dtype=np.int64)
+    term_ids = np.concatenate(term_ids) if term_ids else np.empty(0, dtype=np.int32)
+    data = np.ones(len(sentence_ids), dtype=np.int32)
+    return sparse.csr_matrix(
+        (data, (sentence_ids, term_ids)),
+        shape=(len(index.sentence_number), len(index.vocabulary))
+    )
+
+def build_sentence_cooccurrence(incidence):
+    """统计同句共现的句子数，返回对称稀疏矩阵（对角线为0）"""
+    matrix = (incidence.T @ incidence).tocsr()
+    matrix.setdiag(0)
+    matrix.eliminate_zeros()
+    return matrix
+
+def association_scores(matrix, min_count=5):
+    """计算词对的PMI和NPMI，返回按NPMI降序的 (词1编号, 词2编号, 共现次数, PMI, NPMI)"""
+    total = matrix.sum()
+    if total == 0:
+        return [np.empty(0)] * 5
+    marginals = np.asarray(matrix.sum(axis=1)).ravel()
+
+    # 只取上三角，每个词对出现一次
+    upper = sparse.triu(matrix, k=1).tocoo()
+    keep = upper.data >= min_count
+    rows, cols, counts = upper.row[keep], upper.col[keep], upper.data[keep].astype(np.float64)
+
+    # 边际概率是对称矩阵的行和，联合概率也按同一矩阵中的单元 (a, b) 计算（(b, a) 计入另一半），
+    # 这样 p(a,b) ≤ min(p(a), p(b))，NPMI 落在 [-1, 1]
+    joint = counts / total
+    pmi = np.log(joint / (marginals[rows] / total) / (marginals[cols] / total))
+    npmi = pmi / -np.log(joint)
+    if npmi.size and (npmi.max() > 1 + 1e-9 or npmi.min() < -1 - 1e-9):
+        raise ValueError(f"NPMI 超出 [-1, 1]: [{npmi.min()}, {npmi.max()}]，共现矩阵应为对称矩阵")
+
+    order = np.lexsort((-counts, -npmi))
+    return rows[order], cols[order], counts[order].astype(np.int64), pmi[order], npmi[order]
+
+def top_pairs(matrix, vocabulary, top_n=100, min_count=5, scientist_name=None):
+    """生成关联度最高的词对列表"""
+    rows, cols, counts, pmi, npmi = association_scores(matrix, min_count)
+
+    results = []
+    for i in range(min(top_n, len(rows))):
+        record = {}
+        if scientist_name is not None:
+            record['科学家'] = scientist_name
+        record.update({
+            '词语1': vocabulary[rows[i]],
+            '词语2': vocabulary[cols[i]],
+            '共现次数': int(counts[i]),
+            'PMI': round(float(pmi[i]), 4),
+            'NPMI': round(float(npmi[i]), 4)
+        })
+        results.append(record)
+    return results
+
+def save_pair_results(results, output_file):
+    """保存词对结果为JSON和CSV"""
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+
+    csv_file = output_file.replace('.json', '.csv')
+    pd.DataFrame(results).to_csv(csv_file, index=False, encoding='utf-8-sig')
+
+    print(f"结果已保存到 {csv_file} 和 {output_file}")
+
+def save_cooccurrence_matrix(matrix, vocabulary, output_dir):
+    """保存整体共现矩阵和词表，供后续分析复用"""
+    sparse.save_npz(os.path.join(output_dir, "整体共现矩阵.npz"), matrix)
+    with open(os.path.join(output_dir, "共现词表.json"), 'w', encoding='utf-8') as f:
+        json.dump(list(vocabulary), f, ensure_ascii=False)
+
+def main():
+    parser = argparse.ArgumentParser(description="词语共现与PMI关联分析")
+    parser.add_argument('--mode', choices=['window', 'sentence'], default='window',
+                        help="共现范围：滑动窗口（关联分析词序列）或同一句子（句子检索索引）")
+    parser.add_argument('--window', type=int, default=5, help="滑动窗口大小（词数）")
+    parser.add_argument('--within-sentence', action='store_true',
+                        help="滑动窗口不跨句（按清洗文本的分句切分关联分析词序列）")
+    parser.add_argument('--min-count', type=int, default=5, help="参与排序的最小共现次数")
+    parser.add_argument('--top', type=int, default=100, help="输出的词对数量")
+    args = parser.parse_args()
+
+    # 设置目录路径
+    association_dir = "output/association_data"
+    cleaned_dir = "output/cleaned_data"
+    index_dir = "output/sentence_index"
+    output_dir = "output/cooccurrence"
+
+    # 创建输出目录
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    scientist_matrices = {}
+    if args.mode == 'window':
+        print("正在统计滑动窗口共现...")
+        vocabulary, scientist_ids = encode_tokens(load_association_data(association_dir))
+        segments = load_sentence_segments(cleaned_dir, scientist_ids) if args.within_sentence else {}
+        for scientist_name, token_ids in scientist_ids.items():
+            scientist_matrices[scientist_name] = build_window_cooccurrence(
+                token_ids, len(vocabulary), args.window, segments.get(scientist_name))
+    else:
+        print("正在统计同句共现...")
+        index = SentenceInvertedIndex.load(index_dir)
+        vocabulary = sorted(index.vocabulary, key=index.vocabulary.get)
+        incidence = sentence_term_matrix(index)
+        for scientist_id, scientist_name in enumerate(index.scientists):
+            rows = np.flatnonzero(index.sentence_scientist == scientist_id)
+            scientist_matrices[scientist_name] = build_sentence_cooccurrence(incidence[rows])
+
+    if not scientist_matrices:
+        print("没有可分析的词语序列，请先运行数据清洗")
+        return
+
+    # 每个科学家的关联词对
+    for scientist_name, matrix in scientist_matrices.items():
+        results = top_pairs(matrix, vocabulary, args.top, args.min_count, scientist_name)
+        save_pair_results(results, os.path.join(output_dir, f"{scientist_name}_共现词对.json"))
+
+        print(f"\n{scientist_name} 关联度最高的5个词对:")
+        for record in results[:5]:
+            print(f"  {record['词语1']} - {record['词语2']}: NPMI {record['NPMI']} (共现 {record['共现次数']} 次)")
+
+    # 整体关联词对
+    overall_matrix = sum(scientist_matrices.values())
+    overall_results = top_pairs(overall_matrix, vocabulary, args.top, args.min_count)
+    save_pair_results(overall_results, os.path.join(output_dir, "整体共现词对.json"))
+    save_cooccurrence_matrix(overall_matrix, vocabulary, output_dir)
+
+    print("\n整体关联度最高的10个词对:")
+    for record in overall_results[:10]:
+        print(f"  {record['词语1']} - {record['词语2']}: NPMI {record['NPMI']} (共现 {record['共现次数']} 次)")
+
+    print(f"\n共现分析完成! 结果保存在 {output_dir} 目录中。")
+
+if __name__ == "__main__":
+    main()
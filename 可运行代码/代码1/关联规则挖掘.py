@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import argparse
+from collections import Counter
+import pandas as pd
+from 高级数据清理 import AdvancedDataCleaningPipeline
+
+
+class FPTree:
+    """FP树（节点保存在并行列表中，节省内存）"""
+
+    def __init__(self, weighted_transactions, min_count):
+        # 统计项的加权支持度，只保留频繁项
+        item_counts = Counter()
+        for items, weight in weighted_transactions:
+            for item in items:
+                item_counts[item] += weight
+        self.item_counts = {item: c for item, c in item_counts.items() if c >= min_count}
+
+        # 按支持度降序（相同时按词语）确定项在路径中的顺序
+        ranked = sorted(self.item_counts, key=lambda item: (-self.item_counts[item], item))
+        self.rank = {item: i for i, item in enumerate(ranked)}
+
+        # 根节点编号为0
+        self.node_item = [None]
+        self.node_count = [0]
+        self.node_parent = [-1]
+        self.node_children = [{}]
+        self.header = {item: [] for item in ranked}
+
+        for items, weight in weighted_transactions:
+            path = sorted((item for item in items if item in self.rank), key=self.rank.get)
+            self._insert(path, weight)
+
+    def _insert(self, path, weight):
+        """插入一条按顺序排列的事务"""
+        node = 0
+        for item in path:
+            child = self.node_children[node].get(item)
+            if child is None:
+                child = len(self.node_item)
+                self.node_item.append(item)
+                self.node_count.append(0)
+                self.node_parent.append(node)
+                self.node_children.append({})
+                self.node_children[node][item] = child
+                self.header[item].append(child)
+            self.node_count[child] += weight
+            node = child
+
+    def prefix_paths(self, item):
+        """返回某一项的条件模式基 [(路径上的项, 计数), ...]"""
+        paths = []
+        for node in self.header[item]:
+            path = []
+            parent = self.node_parent[node]
+            while parent > 0:
+                path.append(self.node_item[parent])
+                parent = self.node_parent[parent]
+            if path:
+                paths.append((path, self.node_count[node]))
+        return paths
+
+
+def fp_growth(weighted_transactions, min_count, max_length=None):
+    """FP-growth 挖掘频繁项集，返回 {frozenset(项集): 支持计数}"""
+    itemsets = {}
+
+    def mine(tree, suffix):
+        # 从支持度最低的项开始，逐个构建条件FP树
+        for item in sorted(tree.item_counts, key=lambda i: (tree.item_counts[i], i)):
+            itemset = suffix | {item}
+            itemsets[frozenset(itemset)] = tree.item_counts[item]
+
+            if max_length is not None and len(itemset) >= max_length:
+                continue
+
+            conditional = FPTree(tree.prefix_paths(item), min_count)
+            if conditional.item_counts:
+                mine(conditional, itemset)
+
+    mine(FPTree(weighted_transactions, min_count), set())
+    return itemsets
+
+
+def generate_rules(itemsets, num_transactions, min_confidence):
+    """由频繁项集生成单后项关联规则：前项 -> 后项"""
+    rules = []
+    for itemset, count in itemsets.items():
+        if len(itemset) < 2:
+            continue
+
+        for consequent in itemset:
+            antecedent = itemset - {consequent}
+            confidence = count / itemsets[antecedent]
+            if confidence < min_confidence:
+                continue
+
+            lift = confidence / (itemsets[frozenset([consequent])] / num_transactions)
+            rules.append({
+                '前项': ' + '.join(sorted(antecedent)),
+                '后项': consequent,
+                '句子数': count,
+                '支持度': round(count / num_transactions, 6),
+                '置信度': round(confidence, 4),
+                '提升度': round(lift, 4)
+            })
+
+    rules.sort(key=lambda rule: (-rule['提升度'], -rule['置信度'], rule['前项'], rule['后项']))
+    return rules
+
+
+def load_transactions(sentiment_dir, pipeline):
+    """把每个句子的关联分析词语集合作为一条事务，相同事务合并计数"""
+    transactions = Counter()
+    for filename in sorted(os.listdir(sentiment_dir)):
+        if filename.endswith('_情感分析.json'):
+            print(f"正在处理 {filename.replace('_情感分析.json', '')} 的句子...")
+            with open(os.path.join(sentiment_dir, filename), 'r', encoding='utf-8') as f:
+                sentences = json.load(f)
+
+            for sentence in sentences:
+                items = frozenset(pipeline.prepare_for_association_analysis(sentence))
+                if items:
+                    transactions[items] += 1
+
+    return list(transactions.items())
+
+
+def save_table(records, output_file):
+    """保存结果为JSON和CSV"""
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(records, f, ensure_ascii=False, indent=2)
+
+    csv_file = output_file.replace('.json', '.csv')
+    pd.DataFrame(records).to_csv(csv_file, index=False, encoding='utf-8-sig')
+
+    print(f"结果已保存到 {csv_file} 和 {output_file}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="基于句子词语集合的FP-growth关联规则挖掘")
+    parser.add_argument('--min-support', type=float, default=0.001, help="最小支持度（句子比例）")
+    parser.add_argument('--min-confidence', type=float, default=0.3, help="最小置信度")
+    parser.add_argument('--max-length', type=int, default=4, help="项集的最大词数")
+    parser.add_argument('--top', type=int, default=200, help="保存的规则数量")
+    args = parser.parse_args()
+
+    # 设置目录路径
+    sentiment_dir = "output/sentiment_data"
+    output_dir = "output/association_rules"
+
+    # 创建输出目录
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    pipeline = AdvancedDataCleaningPipeline()
+    transactions = load_transactions(sentiment_dir, pipeline)
+    num_transactions = sum(weight for _, weight in transactions)
+    min_count = max(1, int(args.min_support * num_transactions + 0.999999))
+    print(f"共 {num_transactions} 条事务（{len(transactions)} 条不重复），最小支持计数 {min_count}")
+
+    # 挖掘频繁项集
+    itemsets = fp_growth(transactions, min_count, args.max_length)
+    print(f"共找到 {len(itemsets)} 个频繁项集")
+
+    itemset_records = [
+        {'项集': ' + '.join(sorted(itemset)), '词数': len(itemset),
+         '句子数': count, '支持度': round(count / num_transactions, 6)}
+        for itemset, count in itemsets.items() if len(itemset) >= 2
+    ]
+    itemset_records.sort(key=lambda record: (-record['句子数'], record['项集']))
+    save_table(itemset_records, os.path.join(output_dir, "频繁项集.json"))
+
+    # 生成关联规则
+    rules = generate_rules(itemsets, num_transactions, args.min_confidence)
+    print(f"共生成 {len(rules)} 条关联规则")
+    save_table(rules[:args.top], os.path.join(output_dir, "关联规则.json"))
+
+    print("\n提升度最高的10条规则:")
+    for rule in rules[:10]:
+        print(f"  {rule['前项']} -> {rule['后项']}: 置信度 {rule['置信度']}, 提升度 {rule['提升度']}")
+
+    print(f"\n关联规则挖掘完成! 结果保存在 {output_dir} 目录中。")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import argparse
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from 词频统计 import count_all_scientists, load_partial_counts
+
+def build_count_matrix(scientist_freqs):
+    """由各科学家的词频构建 科学家×词 的稀疏计数矩阵（没有科学家时为 0×0 矩阵）"""
+    scientist_names = sorted(scientist_freqs)
+    if not scientist_names:
+        return sparse.csr_matrix((0, 0), dtype=np.int64), [], []
+    vocabulary = {}
+    rows = []
+    cols = []
+    data = []
+    for row, scientist_name in enumerate(scientist_names):
+        word_freq = scientist_freqs[scientist_name]
+        rows.append(np.full(len(word_freq), row, dtype=np.int32))
+        cols.append(np.fromiter(
+            (vocabulary.setdefault(word, len(vocabulary)) for word in word_freq),
+            dtype=np.int32, count=len(word_freq)))
+        data.append(np.fromiter(word_freq.values(), dtype=np.int64, count=len(word_freq)))
+
+    matrix = sparse.csr_matrix(
+        (np.concatenate(data), (np.concatenate(rows), np.concatenate(cols))),
+        shape=(len(scientist_names), len(vocabulary))
+    )
+    terms = sorted(vocabulary, key=vocabulary.get)
+    return matrix, scientist_names, terms
+
+def keyness_scores(matrix):
+    """对矩阵中每个非零单元计算对数似然值(G2)和卡方值，返回 (行, 列, 目标频次, 其余频次, G2, 卡方)
+
+    目标语料为该科学家，参照语料为其余所有科学家；G2 对频率偏低的词取负值。
+    """
+    coo = matrix.tocoo()
+    rows, cols = coo.row, coo.col
+    a = coo.data.astype(np.float64)
+
+    row_totals = np.asarray(matrix.sum(axis=1)).ravel().astype(np.float64)
+    col_totals = np.asarray(matrix.sum(axis=0)).ravel().astype(np.float64)
+    total = row_totals.sum()
+
+    # 2x2 列联表：a=目标中该词, b=参照中该词, c=目标中其他词, d=参照中其他词
+    b = col_totals[cols] - a
+    c = row_totals[rows] - a
+    d = total - row_totals[rows] - b
+    target_size = a + c
+    reference_size = b + d
+
+    # 对数似然值
+    expected_a = target_size * (a + b) / total
+    expected_b = reference_size * (a + b) / total
+    with np.errstate(divide='ignore', invalid='ignore'):
+        g2 = 2 * (a * np.log(a / expected_a) + np.where(b > 0, b * np.log(b / expected_b), 0.0))
+        chi2 = total * (a * d - b * c) ** 2 / ((a + b) * (c + d) * (a + c) * (b + d))
+    chi2 = np.nan_to_num(chi2)
+
+    # 相对频率低于参照语料的词记为负值
+    under = a / target_size < np.where(reference_size > 0, b / np.maximum(reference_size, 1), 0)
+    g2 = np.where(under, -g2, g2)
+
+    return rows, cols, a.astype(np.int64), b.astype(np.int64), g2, chi2
+
+def top_keywords(matrix, scientist_names, terms, top_n=50, min_count=5):
+    """为每个科学家选出对数似然值最高的显著词"""
+    rows, cols, a, b, g2, chi2 = keyness_scores(matrix)
+
+    keep = (a >= min_count) & (g2 > 0)
+    rows, cols, a, b, g2, chi2 = rows[keep], cols[keep], a[keep], b[keep], g2[keep], chi2[keep]
+
+    # 按 科学家 升序、G2 降序 排列后，每个科学家取前 top_n 个
+    order = np.lexsort((-g2, rows))
+    rows, cols, a, b, g2, chi2 = rows[order], cols[order], a[order], b[order], g2[order], chi2[order]
+    starts = np.searchsorted(rows, np.arange(len(scientist_names)))
+    rank = np.arange(len(rows)) - starts[rows]
+    keep = rank < top_n
+
+    results = {name: [] for name in scientist_names}
+    for row, col, freq, other, ll, chi in zip(rows[keep], cols[keep], a[keep], b[keep], g2[keep], chi2[keep]):
+        results[scientist_names[row]].append({
+            '科学家': scientist_names[row],
+            '词语': terms[col],
+            '频次': int(freq),
+            '其他科学家频次': int(other),
+            '对数似然值': round(float(ll), 4),
+            '卡方值': round(float(chi), 4)
+        })
+    return results
+
+def save_keyword_results(results, output_file):
+    """保存显著词结果"""
+    csv_file = output_file.replace('.json', '.csv')
+    pd.DataFrame(results).to_csv(csv_file, index=False, encoding='utf-8-sig')
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+
+    print(f"结果已保存到 {csv_file} 和 {output_file}")
+
+def main():
+    parser = argparse.ArgumentParser(description="计算各科学家相对于其余语料的显著词（对数似然值/卡方）")
+    parser.add_argument('--from-partial', action='store_true', help="从词频分片的部分计数读取，而不是重新统计")
+    parser.add_argument('--top', type=int, default=50, help="每个科学家输出的显著词数量")
+    parser.add_argument('--min-count', type=int, default=5, help="显著词在该科学家中的最小频次")
+    args = parser.parse_args()
+
+    # 设置目录路径
+    association_dir = "output/association_data"
+    output_dir = "output/word_frequency"
+    partial_dir = os.path.join(output_dir, "partial_counts")
+
+    # 创建输出目录
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    if args.from_partial:
+        scientist_freqs = load_partial_counts(partial_dir)
+    else:
+        scientist_freqs, _ = count_all_scientists(association_dir)
+
+    if not scientist_freqs:
+        source = partial_dir if args.from_partial else association_dir
+        print(f"{source} 中没有可用的词频数据，请先运行数据清洗和词频统计")
+        return
+
+    print("正在计算显著词...")
+    matrix, scientist_names, terms = build_count_matrix(scientist_freqs)
+    results = top_keywords(matrix, scientist_names, terms, args.top, args.min_count)
+
+    all_results = []
+    for scientist_name in scientist_names:
+        save_keyword_results(results[scientist_name],
+                             os.path.join(output_dir, f"{scientist_name}_关键词统计.json"))
+        all_results.extend(results[scientist_name])
+
+        print(f"\n{scientist_name} 的前10个显著词:")
+        for i, record in enumerate(results[scientist_name][:10]):
+            print(f"  {i+1}. {record['词语']}: G2={record['对数似然值']} (频次 {record['频次']})")
+
+    save_keyword_results(all_results, os.path.join(output_dir, "所有科学家关键词统计.json"))
+
+    print(f"\n显著词统计完成! 结果保存在 {output_dir} 目录中。")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import argparse
+import pandas as pd
+from 高级数据清理 import AdvancedDataCleaningPipeline
+from 情感分析 import (analyze_scientist_sentiment, generate_overall_sentiment,
+                  save_sentiment_results, save_all_sentiment_results)
+from TFIDF分析 import (calculate_tfidf, get_top_tfidf_words, calculate_document_similarity,
+                     save_tfidf_results, save_similarity_results)
+from 词频统计 import (calculate_word_frequency, generate_overall_frequency,
+                  save_scientist_frequencies, save_frequency_results)
+from 提取消极情感句子 import extract_negative_sentences
+from 消极句子存储 import NegativeSentenceStore
+from 流水线清单 import record_stage
+from 后台写入 import BackgroundWriter
+from 性能追踪 import tracer, span, count, add_tracing_arguments, setup_tracing
+
+
+def run_cleaning(folder_path=".", pipeline=None):
+    """清洗阶段：返回 {科学家: {'sentiment_data', 'association_data', 'cleaned_text'}}"""
+    if pipeline is None:
+        pipeline = AdvancedDataCleaningPipeline()
+    results = pipeline.process_all_documents(folder_path)
+    # 科学家按名称排序，后续各阶段的输出顺序与目录遍历顺序无关
+    return dict(sorted(results.items()))
+
+
+def run_sentiment(results):
+    """情感评分阶段：返回 ({科学家: 每句评分列表}, {科学家: 整体统计})"""
+    sentiment_details = {}
+    sentiment_stats = {}
+    for scientist_name, data in results.items():
+        details = analyze_scientist_sentiment(scientist_name, data['sentiment_data'])
+        sentiment_details[scientist_name] = details
+        sentiment_stats[scientist_name] = generate_overall_sentiment(details)
+    return sentiment_details, sentiment_stats
+
+
+def run_tfidf(results, top_n=100):
+    """TF-IDF阶段：直接使用清洗后的文本，返回 (每个科学家的Top词汇, 相似度矩阵)"""
+    scientist_names = list(results)
+    documents = {name: results[name]['cleaned_text'] for name in scientist_names}
+    tfidf_matrix, feature_names, _ = calculate_tfidf(documents, scientist_names)
+    tfidf_results = get_top_tfidf_words(tfidf_matrix, feature_names, scientist_names, top_n=top_n)
+    similarity_df = calculate_document_similarity(tfidf_matrix, scientist_names)
+    return tfidf_results, similarity_df
+
+
+def run_word_frequency(results):
+    """词频阶段：返回 ({科学家: Counter}, 整体前100词列表)"""
+    scientist_freqs = {
+        scientist_name: calculate_word_frequency(data['association_data'])
+        for scientist_name, data in results.items()
+    }
+    overall_results, _ = generate_overall_frequency(scientist_freqs)
+    return scientist_freqs, overall_results
+
+
+def run_negative_extraction(sentiment_details):
+    """消极句子阶段：返回 {科学家: 消极句子列表}"""
+    return {
+        scientist_name: extract_negative_sentences(details, scientist_name)
+        for scientist_name, details in sentiment_details.items()
+    }
+
+
+class OutputSink:
+    """可选的结果落盘：各阶段算完后交给后台线程写出与各脚本相同的文件"""
+
+    def __init__(self, output_dir="output"):
+        self.output_dir = output_dir
+        self.writer = BackgroundWriter()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.writer.__exit__(exc_type, exc_value, traceback)
+
+    def _dir(self, name):
+        path = os.path.join(self.output_dir, name)
+        if not os.path.exists(path):
+            os.makedirs(path)
+        return path
+
+    def cleaning(self, pipeline, results):
+        self.writer.submit(pipeline.save_results, results, self.output_dir)
+
+    def sentiment(self, sentiment_details, sentiment_stats):
+        output_dir = self._dir("sentiment_analysis")
+        all_results = []
+        for scientist_name, details in sentiment_details.items():
+            all_results.extend(details)
+            self.writer.submit(save_sentiment_results, details, sentiment_stats[scientist_name],
+                               output_dir, scientist_name)
+        self.writer.submit(save_all_sentiment_results, all_results, output_dir)
+        self.negative_store(sentiment_details, sentiment_stats)
+
+    def negative_store(self, sentiment_details, sentiment_stats):
+        """只写入消极句子库和情感分析清单（sentiment_details 可以只含消极句子）"""
+        self.writer.submit(self._save_negative_store, sentiment_details, sentiment_stats)
+
+    def _save_negative_store(self, sentiment_details, sentiment_stats):
+        """写入消极句子库和情感分析清单"""
+        manifest_counters = {}
+        with NegativeSentenceStore(os.path.join(self.output_dir, "negative_sentences.db")) as store:
+            store.clear()
+            for scientist_name, details in sentiment_details.items():
+                negative_count = store.add_scientist_results(scientist_name, details)
+                manifest_counters[scientist_name] = dict(sentiment_stats[scientist_name], 消极句子数=negative_count)
+        record_stage("sentiment", manifest_counters, os.path.join(self.output_dir, "manifest"))
+
+    def tfidf(self, tfidf_results, similarity_df):
+        output_dir = self._dir("tfidf_analysis")
+        self.writer.submit(save_tfidf_results, tfidf_results, output_dir)
+        if similarity_df is not None:
+            self.writer.submit(save_similarity_results, similarity_df, output_dir)
+
+    def word_frequency(self, scientist_freqs, overall_results):
+        output_dir = self._dir("word_frequency")
+        all_scientist_results = save_scientist_frequencies(scientist_freqs, output_dir, self.writer)
+        self.writer.submit(save_frequency_results, overall_results,
+                           os.path.join(output_dir, "整体词频统计.json"))
+        self.writer.submit(save_frequency_results, all_scientist_results,
+                           os.path.join(output_dir, "所有科学家词频统计.json"))
+
+    def negatives(self, negative_sentences):
+        output_dir = self._dir("negative_sentences")
+        self.writer.submit(self._save_negatives, negative_sentences, output_dir)
+
+    def _save_negatives(self, negative_sentences, output_dir):
+        all_negative_sentences = []
+        for scientist_name, sentences in negative_sentences.items():
+            if not sentences:
+                continue
+            all_negative_sentences.extend(sentences)
+            output_file = os.path.join(output_dir, f"{scientist_name}_消极情感句子.json")
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(sentences, f, ensure_ascii=False, indent=2)
+            pd.DataFrame(sentences).to_csv(output_file.replace('.json', '.csv'), index=False, encoding='utf-8-sig')
+
+        if all_negative_sentences:
+            all_output_file = os.path.join(output_dir, "所有科学家消极情感句子.json")
+            with open(all_output_file, 'w', encoding='utf-8') as f:
+                json.dump(all_negative_sentences, f, ensure_ascii=False, indent=2)
+            pd.DataFrame(all_negative_sentences).to_csv(all_output_file.replace('.json', '.csv'),
+                                                        index=False, encoding='utf-8-sig')
+
+    def close(self):
+        """等待所有文件写完（后台写入出错时在这里抛出）"""
+        self.writer.close()
+
+
+def run_in_memory_pipeline(folder_path=".", results=None, sink=None):
+    """在同一进程内依次运行 清洗 → 情感评分 → TF-IDF → 词频 → 消极句子
+
+    各阶段之间直接传递内存中的数据，不经过 output/*.json 中转。
+    注意：运行清洗阶段时加入jieba的领域词会同时作用于后续阶段的分词。
+
+    Args:
+        folder_path: Word文档所在目录
+        results: 已有的清洗结果（给定时跳过清洗阶段）
+        sink: 可选的 OutputSink，给定时各阶段结果同时写出到文件
+
+    Returns:
+        包含各阶段结果的字典
+    """
+    if results is None:
+        with span("清洗"):
+            pipeline = AdvancedDataCleaningPipeline()
+            results = run_cleaning(folder_path, pipeline)
+        if sink is not None:
+            sink.cleaning(pipeline, results)
+    count("文档", len(results))
+
+    with span("情感评分"):
+        sentiment_details, sentiment_stats = run_sentiment(results)
+    count("句子", sum(len(details) for details in sentiment_details.values()))
+    if sink is not None:
+        sink.sentiment(sentiment_details, sentiment_stats)
+
+    with span("TF-IDF"):
+        tfidf_results, similarity_df = run_tfidf(results)
+    if sink is not None:
+        sink.tfidf(tfidf_results, similarity_df)
+
+    with span("词频统计"):
+        scientist_freqs, overall_frequency = run_word_frequency(results)
+    count("关联词汇", sum(sum(freq.values()) for freq in scientist_freqs.values()))
+    if sink is not None:
+        sink.word_frequency(scientist_freqs, overall_frequency)
+
+    with span("提取消极句子"):
+        negative_sentences = run_negative_extraction(sentiment_details)
+    count("消极句子", sum(len(sentences) for sentences in negative_sentences.values()))
+    if sink is not None:
+        sink.negatives(negative_sentences)
+
+    return {
+        'cleaning': results,
+        'sentiment_details': sentiment_details,
+        'sentiment_stats': sentiment_stats,
+        'tfidf': tfidf_results,
+        'similarity': similarity_df,
+        'word_frequency': scientist_freqs,
+        'overall_frequency': overall_frequency,
+        'negative_sentences': negative_sentences
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="在同一进程内运行清洗、情感评分、TF-IDF、词频和消极句子提取")
+    parser.add_argument('--folder', default=".", help="Word文档所在目录")
+    parser.add_argument('--output-dir', default="output", help="结果输出目录")
+    parser.add_argument('--no-output', action='store_true', help="只在内存中计算，不写出结果文件")
+    add_tracing_arguments(parser)
+    args = parser.parse_args()
+    setup_tracing(args)
+
+    if args.no_output:
+        pipeline_results = run_in_memory_pipeline(args.folder)
+    else:
+        with OutputSink(args.output_dir) as sink:
+            pipeline_results = run_in_memory_pipeline(args.folder, sink=sink)
+            with span("等待写入完成"):
+                sink.close()
+    tracer.save("内存流水线")
+
+    print("\n各科学家结果摘要:")
+    for scientist_name, stats in pipeline_results['sentiment_stats'].items():
+        negative_count = len(pipeline_results['negative_sentences'][scientist_name])
+        print(f"  {scientist_name}: {stats['总句子数']} 句，平均情感得分 {stats['平均情感得分']}，"
+              f"消极句子 {negative_count} 个")
+
+    print("\n内存流水线运行完成!")
+
+if __name__ == "__main__":
+    main()
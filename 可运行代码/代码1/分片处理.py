@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+import multiprocessing
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfTransformer
+from 高级数据清理 import AdvancedDataCleaningPipeline
+from 内存流水线 import run_sentiment, run_negative_extraction, OutputSink
+from 情感分析 import save_sentiment_results
+from TFIDF分析 import (create_tfidf_vectorizer, get_top_tfidf_words, calculate_document_similarity)
+from 词频统计 import calculate_word_frequency, generate_overall_frequency, shard_of
+from 消极句子存储 import is_negative
+from 流水线清单 import record_stage
+from 检查点 import atomic_json
+from 倒排索引检索 import SentenceIndexBuilder
+
+# 各分片的部分统计结果目录（多台机器共享，或拷贝到同一目录后合并）
+SHARD_DIR = "output/shards"
+
+# 合并时为每位科学家保留的最相似科学家数
+SIMILARITY_TOP_K = 10
+
+# 计算相似度TopK时每次相乘的行数（内存为 行数 × 科学家数）
+SIMILARITY_BLOCK_SIZE = 1024
+
+# 科学家不超过该数量时才输出完整的 N×N 相似度矩阵（与单机结果相同），否则只输出TopK
+DENSE_SIMILARITY_LIMIT = 2000
+
+
+def list_scientists(folder_path, cleaned_dir=None):
+    """列出语料中的全部科学家（Word文档或已有清洗结果）"""
+    if cleaned_dir is not None:
+        sentiment_dir = os.path.join(cleaned_dir, "sentiment_data")
+        return sorted(f.replace('_情感分析.json', '') for f in os.listdir(sentiment_dir)
+                      if f.endswith('_情感分析.json'))
+    return sorted(f.replace('.docx', '') for f in os.listdir(folder_path) if f.endswith('.docx'))
+
+
+def load_cleaned_results(cleaned_dir, scientist_names):
+    """从已有的清洗结果目录读取指定科学家的数据（跳过清洗阶段）"""
+    results = {}
+    for scientist in scientist_names:
+        with open(os.path.join(cleaned_dir, "sentiment_data", f"{scientist}_情感分析.json"), 'r', encoding='utf-8') as f:
+            sentiment_data = json.load(f)
+        with open(os.path.join(cleaned_dir, "association_data", f"{scientist}_关联分析.json"), 'r', encoding='utf-8') as f:
+            association_data = json.load(f)
+        with open(os.path.join(cleaned_dir, "cleaned_data", f"{scientist}_清洗文本.txt"), 'r', encoding='utf-8') as f:
+            cleaned_text = f.read()
+        results[scientist] = {
+            'sentiment_data': sentiment_data,
+            'association_data': association_data,
+            'cleaned_text': cleaned_text
+        }
+    return results
+
+
+def partial_file(shard_dir, shard_index, num_shards):
+    return os.path.join(shard_dir, f"分片_{shard_index}_{num_shards}.json")
+
+
+def count_terms(documents):
+    """按 TFIDF分析.py 的分词、停用词和n-gram统计每篇文档的词项计数"""
+    analyzer = create_tfidf_vectorizer().build_analyzer()
+    return {scientist: Counter(analyzer(text)) for scientist, text in documents.items()}
+
+
+def count_terms_isolated(documents):
+    """在新启动的进程中统计词项计数
+
+    清洗管道会向jieba加入领域词，之后的分词结果随之改变；单机的 TFIDF分析.py 在独立进程中运行，
+    jieba中没有这些词。用 spawn 启动的子进程分词，保证与单机的TF-IDF分词相同。
+    """
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+        return executor.submit(count_terms, documents).result()
+
+
+def run_shard(shard_index, num_shards, folder_path=".", cleaned_dir=None, shard_dir=SHARD_DIR, output_dir="output"):
+    """处理一个分片：清洗、情感评分、词频、TF-IDF词项计数和句子索引分词
+
+    清洗文本和逐句情感详情等原始数据只在分片上写入 output_dir 中各科学家自己的文件，
+    部分统计结果（JSON）只保存合并需要的汇总：各文档的词项计数、文档频率、词频计数、情感统计、
+    消极句子和句子索引的分词结果。
+    """
+    scientist_names = [name for name in list_scientists(folder_path, cleaned_dir)
+                       if shard_of(name, num_shards) == shard_index]
+    print(f"分片 {shard_index}/{num_shards}: {len(scientist_names)} 位科学家")
+
+    # 清洗和句子索引分词与 高级数据清理.py 相同，使用加入了领域词的jieba
+    pipeline = AdvancedDataCleaningPipeline()
+    if cleaned_dir is not None:
+        results = load_cleaned_results(cleaned_dir, scientist_names)
+    else:
+        results = {}
+        for scientist in scientist_names:
+            result = pipeline.process_single_document(os.path.join(folder_path, f"{scientist}.docx"))
+            if result is not None:
+                results[scientist] = result
+
+    sentiment_details, sentiment_stats = run_sentiment(results)
+    scientist_freqs = {scientist: calculate_word_frequency(data['association_data'])
+                       for scientist, data in results.items()}
+
+    sentence_tokens = {scientist: [pipeline.tokenize_sentence_for_index(sentence) for sentence in data['sentiment_data']]
+                       for scientist, data in results.items()}
+
+    # TF-IDF的部分统计是每篇文档的词项计数（与单机相同的分词、停用词和n-gram）以及本分片的文档频率和总词频，
+    # idf和特征筛选依赖全部文档，在合并时由这些汇总计算
+    term_counts = count_terms_isolated({scientist: data['cleaned_text'] for scientist, data in results.items()})
+    document_frequency = Counter()
+    term_frequency = Counter()
+    for counts in term_counts.values():
+        document_frequency.update(counts.keys())
+        term_frequency.update(counts)
+
+    # 各科学家自己的文件在分片上直接写出（已从 output_dir 读取清洗结果时不重复写清洗文件）
+    if cleaned_dir is None or os.path.abspath(cleaned_dir) != os.path.abspath(output_dir):
+        pipeline.save_results(results, output_dir)
+    sentiment_dir = os.path.join(output_dir, "sentiment_analysis")
+    for scientist, details in sentiment_details.items():
+        save_sentiment_results(details, sentiment_stats[scientist], sentiment_dir, scientist)
+
+    partial = {
+        'shard': [shard_index, num_shards],
+        'scientists': sorted(results),
+        'cleaning_counts': {
+            scientist: {
+                '情感句子数': len(data['sentiment_data']),
+                '关联词汇数': len(data['association_data']),
+                '清洗后字符数': len(data['cleaned_text'])
+            }
+            for scientist, data in results.items()
+        },
+        'sentiment_stats': sentiment_stats,
+        'negative_details': {scientist: [item for item in details if is_negative(item)]
+                             for scientist, details in sentiment_details.items()},
+        'word_frequency': scientist_freqs,
+        'term_counts': term_counts,
+        'document_frequency': document_frequency,
+        'term_frequency': term_frequency,
+        'sentence_tokens': sentence_tokens
+    }
+
+    if not os.path.exists(shard_dir):
+        os.makedirs(shard_dir)
+    atomic_json(partial, partial_file(shard_dir, shard_index, num_shards))
+    print(f"分片 {shard_index}/{num_shards} 的部分统计已保存到 {shard_dir}")
+
+
+def load_partials(shard_dir, num_shards):
+    """读取全部分片的部分统计，缺少分片或科学家重复时报错"""
+    if num_shards < 1:
+        raise ValueError(f"分片数必须为正整数: {num_shards}")
+    partials = []
+    for shard_index in range(num_shards):
+        file_path = partial_file(shard_dir, shard_index, num_shards)
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"缺少分片 {shard_index}/{num_shards} 的结果: {file_path}")
+        with open(file_path, 'r', encoding='utf-8') as f:
+            partial = json.load(f)
+        # 计数按保存时的顺序恢复为 Counter，频次相同的词排序与单机一致
+        for key in ('word_frequency', 'term_counts'):
+            partial[key] = {scientist: Counter(counts) for scientist, counts in partial[key].items()}
+        partials.append(partial)
+
+    seen = set()
+    for partial in partials:
+        duplicated = seen & set(partial['scientists'])
+        if duplicated:
+            raise ValueError(f"科学家出现在多个分片中: {', '.join(sorted(duplicated))}")
+        seen.update(partial['scientists'])
+    return partials
+
+
+def merge_by_scientist(partials, key):
+    """按科学家名合并各分片的同名结果，顺序与分片顺序无关"""
+    merged = {}
+    for partial in partials:
+        merged.update(partial[key])
+    return dict(sorted(merged.items()))
+
+
+def merge_counters(partials, key):
+    """把各分片的计数（文档频率、总词频）相加"""
+    merged = Counter()
+    for partial in partials:
+        merged.update(partial[key])
+    return merged
+
+
+def select_vocabulary(document_frequency, term_frequency, num_documents, vectorizer):
+    """按与 TfidfVectorizer 拟合时相同的规则（min_df、max_df、max_features）选出特征，返回按词排序的特征列表"""
+    terms = sorted(document_frequency)
+    dfs = np.array([document_frequency[term] for term in terms], dtype=np.int64)
+    max_df, min_df = vectorizer.max_df, vectorizer.min_df
+    max_doc_count = max_df if isinstance(max_df, int) else max_df * num_documents
+    min_doc_count = min_df if isinstance(min_df, int) else min_df * num_documents
+
+    mask = (dfs <= max_doc_count) & (dfs >= min_doc_count)
+    limit = vectorizer.max_features
+    if limit is not None and mask.sum() > limit:
+        tfs = np.array([term_frequency[term] for term in terms], dtype=np.int64)
+        kept = (-tfs[mask]).argsort()[:limit]
+        new_mask = np.zeros(len(dfs), dtype=bool)
+        new_mask[np.where(mask)[0][kept]] = True
+        mask = new_mask
+    if not mask.any():
+        raise ValueError("合并后没有满足 min_df/max_df 的特征")
+    return [term for term, keep in zip(terms, mask) if keep]
+
+
+def build_tfidf_matrix(term_counts, document_frequency, term_frequency):
+    """由各文档的词项计数和全局文档频率构建与单机拟合相同的TF-IDF稀疏矩阵
+
+    Returns:
+        (TF-IDF矩阵, 特征名数组, 科学家列表)
+    """
+    vectorizer = create_tfidf_vectorizer(analyzer=lambda counts: counts.elements())
+    scientist_names = list(term_counts)
+    feature_names = select_vocabulary(document_frequency, term_frequency, len(scientist_names), vectorizer)
+    vocabulary = {term: index for index, term in enumerate(feature_names)}
+
+    # 每行的元素按词项在语料中首次出现的顺序排列（与 CountVectorizer 相同），归一化时的求和顺序也就相同，结果逐位一致
+    first_seen = {}
+    for scientist in scientist_names:
+        for term in term_counts[scientist]:
+            first_seen.setdefault(term, len(first_seen))
+
+    indptr, indices, data = [0], [], []
+    for scientist in scientist_names:
+        row = sorted((first_seen[term], vocabulary[term], value)
+                     for term, value in term_counts[scientist].items() if term in vocabulary)
+        indices.extend(col for _, col, _ in row)
+        data.extend(value for _, _, value in row)
+        indptr.append(len(indices))
+    counts = sparse.csr_matrix((np.array(data, dtype=np.float64), np.array(indices, dtype=np.int32),
+                                np.array(indptr, dtype=np.int32)),
+                               shape=(len(scientist_names), len(feature_names)))
+
+    # 合并时所有文档都在，计数矩阵各列的文档频率就是全局文档频率，直接复用 TfidfTransformer
+    transformer = TfidfTransformer(norm=vectorizer.norm, use_idf=vectorizer.use_idf,
+                                   smooth_idf=vectorizer.smooth_idf, sublinear_tf=vectorizer.sublinear_tf)
+    counts = transformer.fit_transform(counts)
+    return sparse.csr_matrix(counts), np.array(feature_names, dtype=object), scientist_names
+
+
+def similarity_top_k(tfidf_matrix, scientist_names, k=SIMILARITY_TOP_K, block_size=SIMILARITY_BLOCK_SIZE):
+    """每位科学家最相似的k位科学家（不含自己），相似度相同时按名称排序
+
+    按行分块计算余弦相似度，每块只保留候选的前k个，不构建完整的 N×N 矩阵。
+    """
+    top_k = {}
+    transposed = tfidf_matrix.T.tocsc()
+    for start in range(0, tfidf_matrix.shape[0], block_size):
+        block = (tfidf_matrix[start:start + block_size] @ transposed).toarray()
+        for offset, similarities in enumerate(block):
+            row = start + offset
+            similarities[row] = -np.inf
+            if len(similarities) - 1 > k:
+                # 第k大的相似度及与其相同的全部候选，再按 (相似度降序, 名称) 排序
+                threshold = np.partition(similarities, -k)[-k]
+                candidates = np.nonzero(similarities >= threshold)[0]
+            else:
+                candidates = np.nonzero(similarities > -np.inf)[0]
+            ranked = sorted(((scientist_names[i], float(similarities[i])) for i in candidates),
+                            key=lambda x: (-x[1], x[0]))[:k]
+            top_k[scientist_names[row]] = [{'科学家': name, '相似度': value} for name, value in ranked]
+    return top_k
+
+
+def write_all_sentiment_details(sentiment_dir, scientist_names):
+    """逐个读取分片写出的各科学家情感详情，流式拼接为 所有科学家情感分析详情.json/csv（与单机输出相同）"""
+    json_file = os.path.join(sentiment_dir, "所有科学家情感分析详情.json")
+    csv_file = os.path.join(sentiment_dir, "所有科学家情感分析详情.csv")
+    first = True
+    with open(json_file, 'w', encoding='utf-8') as json_out, open(csv_file, 'w', encoding='utf-8-sig', newline='') as csv_out:
+        json_out.write("[")
+        for scientist in scientist_names:
+            detail_file = os.path.join(sentiment_dir, f"{scientist}_情感分析详情.json")
+            if not os.path.exists(detail_file):
+                raise FileNotFoundError(f"缺少 {scientist} 的情感分析详情（应由分片写入同一输出目录）: {detail_file}")
+            with open(detail_file, 'r', encoding='utf-8') as f:
+                details = json.load(f)
+            if not details:
+                continue
+            for item in details:
+                text = json.dumps(item, ensure_ascii=False, indent=2)
+                json_out.write(("\n" if first else ",\n") + "\n".join("  " + line for line in text.splitlines()))
+                first = False
+            pd.DataFrame(details).to_csv(csv_out, index=False, header=csv_out.tell() == 0)
+        json_out.write("]" if first else "\n]")
+
+
+def build_sentence_index(sentence_tokens, output_dir):
+    """按科学家名称顺序构建句子倒排索引（与 高级数据清理.py 构建的索引相同）"""
+    builder = SentenceIndexBuilder()
+    for scientist in sorted(sentence_tokens):
+        builder.add_scientist(scientist, sentence_tokens[scientist])
+    index_dir = os.path.join(output_dir, "sentence_index")
+    builder.build().save(index_dir)
+    print(f"句子索引已保存到 {index_dir}")
+
+
+def merge_shards(num_shards, shard_dir=SHARD_DIR, output_dir="output"):
+    """合并所有分片的部分统计，生成与单机运行相同的结果文件"""
+    partials = load_partials(shard_dir, num_shards)
+
+    cleaning_counts = merge_by_scientist(partials, 'cleaning_counts')
+    sentiment_stats = merge_by_scientist(partials, 'sentiment_stats')
+    negative_details = merge_by_scientist(partials, 'negative_details')
+    scientist_freqs = merge_by_scientist(partials, 'word_frequency')
+    term_counts = merge_by_scientist(partials, 'term_counts')
+    document_frequency = merge_counters(partials, 'document_frequency')
+    term_frequency = merge_counters(partials, 'term_frequency')
+    scientist_names = list(cleaning_counts)
+    print(f"已合并 {num_shards} 个分片，共 {len(scientist_names)} 位科学家")
+
+    # 用全局文档频率和各文档的词项计数构建TF-IDF：特征筛选和idf与单机计算一致
+    tfidf_matrix, feature_names, tfidf_names = build_tfidf_matrix(term_counts, document_frequency, term_frequency)
+    tfidf_results = get_top_tfidf_words(tfidf_matrix, feature_names, tfidf_names, top_n=100)
+
+    overall_frequency, _ = generate_overall_frequency(scientist_freqs)
+    negative_sentences = run_negative_extraction(negative_details)
+
+    record_stage("cleaning", cleaning_counts, os.path.join(output_dir, "manifest"))
+    build_sentence_index(merge_by_scientist(partials, 'sentence_tokens'), output_dir)
+    sentiment_dir = os.path.join(output_dir, "sentiment_analysis")
+    write_all_sentiment_details(sentiment_dir, scientist_names)
+
+    with OutputSink(output_dir) as sink:
+        sink.negative_store(negative_details, sentiment_stats)
+        if len(tfidf_names) <= DENSE_SIMILARITY_LIMIT:
+            sink.tfidf(tfidf_results, calculate_document_similarity(tfidf_matrix, tfidf_names))
+        else:
+            print(f"科学家数超过 {DENSE_SIMILARITY_LIMIT}，不输出完整相似度矩阵，只输出TopK")
+            sink.tfidf(tfidf_results, None)
+        sink.word_frequency(scientist_freqs, overall_frequency)
+        sink.negatives(negative_sentences)
+
+    top_k_file = os.path.join(output_dir, "tfidf_analysis", "科学家相似度TopK.json")
+    with open(top_k_file, 'w', encoding='utf-8') as f:
+        json.dump(similarity_top_k(tfidf_matrix, tfidf_names), f, ensure_ascii=False, indent=2)
+
+    print(f"\n分片合并完成! 结果保存在 {output_dir} 目录中。")
+
+
+def run_local(num_shards, folder_path=".", cleaned_dir=None, shard_dir=SHARD_DIR, output_dir="output"):
+    """在本机启动 num_shards 个分片进程，共享分片目录，全部完成后合并"""
+    processes = []
+    for shard_index in range(num_shards):
+        command = [sys.executable, os.path.abspath(__file__), '--shard', f"{shard_index}/{num_shards}",
+                   '--folder', folder_path, '--shard-dir', shard_dir, '--output-dir', output_dir]
+        if cleaned_dir is not None:
+            command += ['--cleaned-dir', cleaned_dir]
+        processes.append(subprocess.Popen(command))
+
+    failed = [i for i, process in enumerate(processes) if process.wait() != 0]
+    if failed:
+        raise RuntimeError(f"分片进程失败: {failed}")
+
+    merge_shards(num_shards, shard_dir, output_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="按科学家哈希分片处理语料，并确定性地合并各分片结果")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument('--shard', help="处理一个分片，格式为 序号/分片数（如 0/4）")
+    mode.add_argument('--merge', type=int, metavar='分片数', help="合并全部分片的部分统计")
+    mode.add_argument('--local', type=int, metavar='分片数', help="在本机并行运行全部分片后合并")
+    parser.add_argument('--folder', default=".", help="Word文档所在目录")
+    parser.add_argument('--cleaned-dir', default=None, help="使用已有的清洗结果目录（如 output），跳过清洗")
+    parser.add_argument('--shard-dir', default=SHARD_DIR, help="分片部分统计目录")
+    parser.add_argument('--output-dir', default="output", help="结果输出目录（分片写入各科学家的文件，合并写入汇总文件）")
+    args = parser.parse_args()
+
+    if args.shard:
+        shard_index, num_shards = (int(x) for x in args.shard.split('/'))
+        run_shard(shard_index, num_shards, args.folder, args.cleaned_dir, args.shard_dir, args.output_dir)
+    elif args.merge is not None:
+        merge_shards(args.merge, args.shard_dir, args.output_dir)
+    else:
+        run_local(args.local, args.folder, args.cleaned_dir, args.shard_dir, args.output_dir)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import pandas as pd
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# 分区列，每位科学家一个目录：<数据集>/科学家=<名称>/data.parquet
+PARTITION_COLUMN = '科学家'
+
+
+def check_available():
+    """列式存储依赖 pyarrow，未安装时给出提示"""
+    if pa is None:
+        raise ImportError("列式存储需要安装 pyarrow：pip install pyarrow")
+
+
+def partition_dir(dataset_dir, scientist_name):
+    """返回某位科学家的分区目录"""
+    return os.path.join(dataset_dir, f"{PARTITION_COLUMN}={scientist_name}")
+
+
+def write_scientist_partition(records, dataset_dir, scientist_name):
+    """写入（覆盖）一位科学家的分区，分区内不重复保存科学家列"""
+    check_available()
+
+    df = pd.DataFrame(records)
+    if PARTITION_COLUMN in df.columns:
+        df = df.drop(columns=[PARTITION_COLUMN])
+
+    target_dir = partition_dir(dataset_dir, scientist_name)
+    if not os.path.exists(target_dir):
+        os.makedirs(target_dir)
+
+    # 先写临时文件再替换，读取方不会看到写了一半的文件
+    target_file = os.path.join(target_dir, "data.parquet")
+    temp_file = target_file + ".tmp"
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), temp_file, compression='zstd')
+    os.replace(temp_file, target_file)
+
+
+def clear_dataset(dataset_dir):
+    """删除整个数据集（重新生成全部分区前调用）"""
+    if os.path.exists(dataset_dir):
+        shutil.rmtree(dataset_dir)
+
+
+def read_dataset(dataset_dir, columns=None, scientists=None):
+    """读取数据集，只加载指定的列和科学家分区
+
+    Args:
+        dataset_dir: 数据集目录
+        columns: 需要的列（如 ['情感得分', '情感类别']），为 None 时读取全部列
+        scientists: 需要的科学家列表，为 None 时读取全部分区
+
+    Returns:
+        DataFrame，总是包含科学家列
+    """
+    check_available()
+
+    dataset = ds.dataset(dataset_dir, format='parquet', partitioning='hive', exclude_invalid_files=True)
+
+    if columns is not None and PARTITION_COLUMN not in columns:
+        columns = [PARTITION_COLUMN] + list(columns)
+
+    filter_expr = None
+    if scientists is not None:
+        filter_expr = ds.field(PARTITION_COLUMN).isin(list(scientists))
+
+    table = dataset.to_table(columns=columns, filter=filter_expr)
+    df = table.to_pandas()
+
+    # 分区列的类型由目录名推断，统一转换为普通字符串
+    df[PARTITION_COLUMN] = df[PARTITION_COLUMN].astype(str)
+    return df
+
+
+def list_scientists(dataset_dir):
+    """列出数据集中已有的科学家分区（只读目录，不读数据）"""
+    if not os.path.exists(dataset_dir):
+        return []
+    prefix = f"{PARTITION_COLUMN}="
+    return sorted(
+        name[len(prefix):] for name in os.listdir(dataset_dir)
+        if name.startswith(prefix)
+    )
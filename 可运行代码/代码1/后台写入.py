@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import queue
+import threading
+
+# 队列结束标记
+_STOP = object()
+
+
+class BackgroundWriter:
+    """后台写入线程：按提交顺序执行保存任务，使编码和写盘与下一步计算重叠
+
+    队列有上限，写入跟不上时 submit 会阻塞（背压）；
+    后台任务出错后不再执行后续任务，错误在下一次 submit 或 close 时抛给主循环。
+    """
+
+    def __init__(self, max_pending=4):
+        self.tasks = queue.Queue(maxsize=max_pending)
+        self.error = None
+        self.closed = False
+        self.thread = threading.Thread(target=self._run, name="BackgroundWriter", daemon=True)
+        self.thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # 主循环已经出错时只等待队列写完，不用写入错误覆盖原异常
+        if exc_type is None:
+            self.close()
+        else:
+            self._shutdown()
+
+    def _run(self):
+        """单个后台线程依次执行任务，保证写入顺序"""
+        while True:
+            task = self.tasks.get()
+            try:
+                if task is _STOP:
+                    return
+                if self.error is None:
+                    func, args, kwargs = task
+                    func(*args, **kwargs)
+            except BaseException as e:
+                self.error = e
+            finally:
+                self.tasks.task_done()
+
+    def check(self):
+        """如果后台写入出错，在调用方线程中重新抛出"""
+        if self.error is not None:
+            raise RuntimeError(f"后台写入失败: {self.error}") from self.error
+
+    def submit(self, func, *args, **kwargs):
+        """提交一个保存任务（队列已满时阻塞等待）"""
+        if self.closed:
+            raise RuntimeError("后台写入线程已关闭")
+        self.check()
+        self.tasks.put((func, args, kwargs))
+
+    def flush(self):
+        """等待已提交的任务全部完成"""
+        self.tasks.join()
+        self.check()
+
+    def _shutdown(self):
+        """发送结束标记并等待线程退出"""
+        if not self.closed:
+            self.closed = True
+            self.tasks.put(_STOP)
+            self.thread.join()
+
+    def close(self):
+        """按顺序写完所有任务后关闭，并抛出后台错误"""
+        self._shutdown()
+        self.check()
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import io
+import os
+import gc
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+import tracemalloc
+import contextlib
+from datetime import datetime
+import matplotlib
+matplotlib.use('Agg')
+from docx import Document
+from 高级数据清理 import AdvancedDataCleaningPipeline
+from 情感分析 import get_sentiment_lexicon
+from 内存流水线 import run_sentiment, run_tfidf, run_word_frequency
+from 生成详细科学家关系图谱 import extract_entities_from_text, build_detailed_person_graph, visualize_detailed_graph
+try:
+    from 使用SnowNLP情感分析 import analyze_scientist_sentiment as analyze_snownlp_sentiment
+except ImportError:
+    analyze_snownlp_sentiment = None
+
+# 基准结果目录（每次运行一个文件，文件名带提交号）
+BENCHMARK_DIR = "output/benchmarks"
+
+# 耗时超过基线的这个倍数时标记为回归
+REGRESSION_THRESHOLD = 1.2
+
+# 合成传记使用的素材
+SURNAMES = ['王', '李', '张', '刘', '陈', '杨', '黄', '赵', '吴', '周', '徐', '孙', '马', '朱', '胡', '郭', '何', '林', '罗', '高',
+            '谢', '屠', '欧阳', '司马', '诸葛']
+GIVEN_NAMES = ['慧', '敏', '静', '丽', '秀英', '桂英', '玉兰', '淑珍', '雅琴', '芳', '婷', '晓燕', '希德', '呦呦', '泽慧',
+               '健雄', '巧稚', '若兰', '思源', '明华', '文清', '佳怡']
+FOREIGN_NAMES = ['玛丽·居里', '丽丝·迈特纳', '卡塔林·考里科', '珍妮佛·杜德娜', '埃达·洛夫莱斯', '罗莎琳德·富兰克林',
+                 '芭芭拉·麦克林托克', '多萝西·霍奇金']
+INSTITUTIONS = ['北京大学', '清华大学', '复旦大学', '中国科学院', '协和医学院', '巴黎大学', '柏林大学', '哥伦比亚大学',
+                '剑桥大学', '中国中医研究院', '加州大学伯克利分校', '宾夕法尼亚大学']
+FIELDS = ['物理学', '化学', '医学', '生物化学', '核物理', '固体物理', '妇产科学', '药学', '数学', '基因编辑', '免疫学']
+ACHIEVEMENTS = ['诺贝尔奖', '国家最高科学技术奖', '拉斯克奖', '沃尔夫奖', '院士称号', '终身成就奖']
+TEMPLATES = [
+    "{year}年，{name}出生于{place}的一个{family}家庭。",
+    "{name}自幼{trait}，对{field}产生了浓厚的兴趣。",
+    "{year}年，她考入{institution}，师从{mentor}教授学习{field}。",
+    "在{institution}期间，{name}与{colleague}合作，完成了关于{topic}的研究。",
+    "这项工作{pos}，被同行誉为“{field}领域的重要{discovery}”。",
+    "然而，{hardship}使她的研究一度陷入{neg}的境地。",
+    "面对{neg2}和质疑，她没有放弃，而是{pos2}地继续实验。",
+    "{year}年，{name}因{topic}方面的贡献获得{achievement}。",
+    "她常说：“科学没有国界，但科学家有祖国。”",
+    "晚年，{name}仍然{pos2}指导学生，培养了{number}名研究生。",
+    "（据{institution}档案记载，{name}一生发表论文{number}余篇。）",
+    "{colleague}回忆道：她{trait}、{pos2}，对学生{pos3}。",
+    "在{place}的实验室里，她常常工作到深夜；有时连续{number}天不回家！",
+    "难道{hardship}就能阻止她吗？当然不能。",
+]
+PLACES = ['北京', '上海', '福建厦门', '江苏苏州', '浙江宁波', '华沙', '维也纳', '匈牙利索尔诺克', '夏威夷', '湖北武汉']
+FAMILIES = ['知识分子', '普通工人', '书香', '商人', '医生', '教师']
+TRAITS = ['聪明好学', '勤奋刻苦', '性格坚毅', '谦逊温和', '专注认真', '勇敢无畏']
+TOPICS = ['青蒿素提取', '放射性元素', '宇称不守恒', '核裂变', '信使核糖核酸', '基因编辑技术', '表面物理', '铀核三分裂']
+DISCOVERIES = ['突破', '发现', '里程碑', '成果']
+HARDSHIPS = ['战争', '经费短缺', '疾病', '性别歧视', '实验设备匮乏', '长期的误解']
+NUMBERS = ['三', '十', '二十', '五十', '一百', '三百']
+
+
+def make_name(rng):
+    """随机生成一个中文或译名人名"""
+    if rng.random() < 0.25:
+        return rng.choice(FOREIGN_NAMES)
+    return rng.choice(SURNAMES) + rng.choice(GIVEN_NAMES)
+
+
+def make_sentence(rng, name, positive_words, negative_words):
+    """按模板生成一句带标点、人名和情感词的传记句子"""
+    template = rng.choice(TEMPLATES)
+    return template.format(
+        year=rng.randint(1850, 2020),
+        name=name,
+        place=rng.choice(PLACES),
+        family=rng.choice(FAMILIES),
+        trait=rng.choice(TRAITS),
+        field=rng.choice(FIELDS),
+        institution=rng.choice(INSTITUTIONS),
+        mentor=make_name(rng),
+        colleague=make_name(rng),
+        topic=rng.choice(TOPICS),
+        pos=rng.choice(positive_words),
+        pos2=rng.choice(positive_words),
+        pos3=rng.choice(positive_words),
+        neg=rng.choice(negative_words),
+        neg2=rng.choice(negative_words),
+        discovery=rng.choice(DISCOVERIES),
+        achievement=rng.choice(ACHIEVEMENTS),
+        hardship=rng.choice(HARDSHIPS),
+        number=rng.choice(NUMBERS)
+    )
+
+
+def generate_corpus(output_dir, num_docs, paragraphs=40, seed=42):
+    """生成合成传记语料（.docx），返回 {科学家: 文件路径}
+
+    每篇文档有 paragraphs 段，每段3到8句；同样的参数和随机种子生成同样的语料。
+    """
+    rng = random.Random(seed)
+    positive_words, negative_words, _, _ = get_sentiment_lexicon()
+    positive_words = sorted(positive_words)
+    negative_words = sorted(negative_words)
+
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    corpus = {}
+    for i in range(num_docs):
+        # 文件名即科学家名，加序号保证唯一
+        name = make_name(rng)
+        scientist_name = f"{name}{i:05d}"
+        doc = Document()
+        doc.add_heading(f"{name}传记", level=1)
+        for _ in range(paragraphs):
+            sentences = [make_sentence(rng, name, positive_words, negative_words)
+                         for _ in range(rng.randint(3, 8))]
+            doc.add_paragraph(''.join(sentences))
+        file_path = os.path.join(output_dir, f"{scientist_name}.docx")
+        doc.save(file_path)
+        corpus[scientist_name] = file_path
+    return corpus
+
+
+def measure(name, func, memory=True):
+    """运行一个阶段并记录耗时和（可选）内存峰值，返回 (阶段结果, 记录)"""
+    gc.collect()
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    # 各阶段函数会逐个打印进度，测量时不输出
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func()
+    elapsed = time.perf_counter() - start
+    record = {'阶段': name, '耗时秒': round(elapsed, 4)}
+    if memory:
+        record['内存峰值MB'] = round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 2)
+        tracemalloc.stop()
+    print(f"  {name:<12} {elapsed:9.3f} 秒" + (f"  峰值 {record['内存峰值MB']:.1f} MB" if memory else ""))
+    return result, record
+
+
+def run_benchmark(corpus, memory=True, snownlp_sentences=2000, render_count=3):
+    """依次测量各阶段，返回各阶段记录列表"""
+    pipeline = AdvancedDataCleaningPipeline()
+    records = []
+
+    def add(name, func, items):
+        result, record = measure(name, func, memory)
+        record['处理数量'] = items
+        record['吞吐量每秒'] = round(items / record['耗时秒'], 2) if record['耗时秒'] > 0 else None
+        records.append(record)
+        return result
+
+    texts = add("文本提取", lambda: {name: pipeline.extract_text_from_docx(path) for name, path in corpus.items()},
+                len(corpus))
+    total_chars = sum(len(text) for text in texts.values())
+
+    normalized = add("去噪标准化", lambda: {
+        name: pipeline.normalize_characters(pipeline.noise_removal(text)) for name, text in texts.items()
+    }, total_chars)
+
+    results = add("分词", lambda: {
+        name: {
+            'sentiment_data': pipeline.prepare_for_sentiment_analysis(text),
+            'association_data': pipeline.prepare_for_association_analysis(text),
+            'cleaned_text': text
+        }
+        for name, text in normalized.items()
+    }, total_chars)
+    total_sentences = sum(len(data['sentiment_data']) for data in results.values())
+
+    sentiment_details, _ = add("词典情感分析", lambda: run_sentiment(results), total_sentences)
+
+    # SnowNLP 很慢，只测量前若干句，按吞吐量比较
+    if analyze_snownlp_sentiment is not None and snownlp_sentences > 0:
+        sample = [s for data in results.values() for s in data['sentiment_data']][:snownlp_sentences]
+        add("SnowNLP情感分析", lambda: analyze_snownlp_sentiment("样本", sample), len(sample))
+
+    if len(results) >= 2:
+        add("TF-IDF", lambda: run_tfidf(results), len(results))
+
+    add("词频统计", lambda: run_word_frequency(results), len(results))
+
+    graphs = add("关系抽取", lambda: {
+        name: build_detailed_person_graph(name, extract_entities_from_text(data['association_data'], name))
+        for name, data in results.items()
+    }, len(results))
+
+    # 渲染只测量前几张关系图
+    render_dir = tempfile.mkdtemp(prefix="benchmark_render_")
+    try:
+        render_names = sorted(graphs)[:render_count]
+        add("关系图渲染", lambda: [
+            visualize_detailed_graph(graphs[name], name, os.path.join(render_dir, f"{name}.png"))
+            for name in render_names
+        ], len(render_names))
+    finally:
+        shutil.rmtree(render_dir, ignore_errors=True)
+
+    return records
+
+
+def git_commit():
+    """当前提交号（工作区有改动时加 -dirty），不在 git 仓库中时为 unknown"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], capture_output=True,
+                               text=True, check=True).stdout.strip()
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def save_benchmark(records, config, benchmark_dir=BENCHMARK_DIR):
+    """保存一次基准结果，返回文件路径"""
+    if not os.path.exists(benchmark_dir):
+        os.makedirs(benchmark_dir)
+    commit = git_commit()
+    data = {
+        '提交': commit,
+        '时间': datetime.now().isoformat(timespec='seconds'),
+        '环境': {'Python': platform.python_version(), '系统': platform.platform(), 'CPU数': os.cpu_count()},
+        '配置': config,
+        '阶段': records
+    }
+    file_path = os.path.join(benchmark_dir, f"基准_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{commit}.json")
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    return file_path
+
+
+def find_baseline(config, exclude, benchmark_dir=BENCHMARK_DIR):
+    """找到配置相同的最近一次基准结果"""
+    if not os.path.exists(benchmark_dir):
+        return None
+    for filename in sorted(os.listdir(benchmark_dir), reverse=True):
+        file_path = os.path.join(benchmark_dir, filename)
+        if not filename.endswith('.json') or os.path.abspath(file_path) == os.path.abspath(exclude):
+            continue
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data['配置'] == config:
+            return file_path
+    return None
+
+
+def compare_benchmarks(current_file, baseline_file, threshold=REGRESSION_THRESHOLD):
+    """逐阶段比较两次基准结果，返回出现回归的阶段列表"""
+    with open(current_file, 'r', encoding='utf-8') as f:
+        current = json.load(f)
+    with open(baseline_file, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    baseline_stages = {record['阶段']: record for record in baseline['阶段']}
+    print(f"\n与基线比较: {baseline['提交']} ({baseline['时间']}) → {current['提交']} ({current['时间']})")
+    print(f"{'阶段':<12} {'基线秒':>10} {'当前秒':>10} {'比值':>8}  {'内存基线MB':>10} {'内存当前MB':>10}")
+
+    regressions = []
+    for record in current['阶段']:
+        old = baseline_stages.get(record['阶段'])
+        if old is None:
+            print(f"{record['阶段']:<12} {'-':>10} {record['耗时秒']:>10.3f}")
+            continue
+        ratio = record['耗时秒'] / old['耗时秒'] if old['耗时秒'] > 0 else float('inf')
+        flag = "  回归" if ratio > threshold else ""
+        if flag:
+            regressions.append(record['阶段'])
+        print(f"{record['阶段']:<12} {old['耗时秒']:>10.3f} {record['耗时秒']:>10.3f} {ratio:>8.2f}  "
+              f"{old.get('内存峰值MB', '-'):>10} {record.get('内存峰值MB', '-'):>10}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="用合成传记语料测量各阶段的耗时和内存")
+    parser.add_argument('--docs', type=int, default=10, help="合成文档数（10 到 10000）")
+    parser.add_argument('--paragraphs', type=int, default=40, help="每篇文档的段落数（控制文档大小）")
+    parser.add_argument('--seed', type=int, default=42, help="随机种子，相同种子生成相同语料")
+    parser.add_argument('--corpus-dir', default=None, help="合成语料目录（默认使用临时目录，运行后删除）")
+    parser.add_argument('--snownlp-sentences', type=int, default=2000, help="SnowNLP 测量的句子数（0 表示跳过）")
+    parser.add_argument('--render', type=int, default=3, help="测量渲染的关系图数量")
+    parser.add_argument('--no-memory', action='store_true', help="不记录内存（tracemalloc 会使耗时变长）")
+    parser.add_argument('--compare', nargs='?', const='auto', default=None,
+                        help="与基线结果比较（不指定文件时使用配置相同的最近一次结果）")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD, help="判定回归的耗时比值")
+    args = parser.parse_args()
+
+    config = {
+        '文档数': args.docs,
+        '段落数': args.paragraphs,
+        '随机种子': args.seed,
+        'SnowNLP句子数': args.snownlp_sentences if analyze_snownlp_sentiment is not None else 0,
+        '渲染数': args.render,
+        '记录内存': not args.no_memory
+    }
+
+    corpus_dir = args.corpus_dir or tempfile.mkdtemp(prefix="benchmark_corpus_")
+    try:
+        print(f"正在生成 {args.docs} 篇合成传记...")
+        start = time.perf_counter()
+        corpus = generate_corpus(corpus_dir, args.docs, args.paragraphs, args.seed)
+        print(f"  语料生成耗时 {time.perf_counter() - start:.1f} 秒，目录: {corpus_dir}")
+
+        print("\n各阶段耗时:")
+        records = run_benchmark(corpus, not args.no_memory, args.snownlp_sentences, args.render)
+    finally:
+        if args.corpus_dir is None:
+            shutil.rmtree(corpus_dir, ignore_errors=True)
+
+    result_file = save_benchmark(records, config)
+    print(f"\n基准结果已保存: {result_file}")
+
+    if args.compare is not None:
+        baseline_file = find_baseline(config, result_file) if args.compare == 'auto' else args.compare
+        if baseline_file is None:
+            print("没有配置相同的基线结果，跳过比较")
+        elif compare_benchmarks(result_file, baseline_file, args.threshold):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import pickle
+import hashlib
+import numpy as np
+import networkx as nx
+from 检查点 import atomic_pickle
+from 性能追踪 import count
+
+# 布局缓存目录（每张图一个文件，保存图结构签名、布局参数和节点坐标）
+LAYOUT_CACHE_DIR = "output/layout_cache"
+
+# 图结构有变化时，从上次的坐标出发只迭代这么多次
+REFINE_ITERATIONS = 15
+
+# 至少有这么多比例的节点出现在旧布局中才热启动，否则完整重新计算
+MIN_SHARED_RATIO = 0.5
+
+
+def graph_signature(G, weight='weight'):
+    """图结构签名：节点和带权重的边排序后的md5（spring_layout 按 weight 属性计算引力）"""
+    nodes = sorted(str(node) for node in G.nodes())
+    edges = sorted('\t'.join(sorted((str(u), str(v))) + [repr(float(w))])
+                   for u, v, w in G.edges(data=weight, default=1))
+    content = '\n'.join(nodes) + '\n\n' + '\n'.join(edges)
+    return hashlib.md5(content.encode('utf-8')).hexdigest()
+
+
+def layout_cache_path(name, cache_dir=LAYOUT_CACHE_DIR):
+    digest = hashlib.md5(name.encode('utf-8')).hexdigest()
+    return os.path.join(cache_dir, f"{digest}.pkl")
+
+
+def load_layout(name, cache_dir=LAYOUT_CACHE_DIR):
+    """读取上次保存的布局，不存在或文件损坏时返回 None"""
+    try:
+        with open(layout_cache_path(name, cache_dir), 'rb') as f:
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+
+
+def warm_start_positions(G, previous_pos, seed=None):
+    """用上次的坐标作为初始位置；新节点放在已有邻居的中心附近"""
+    rng = np.random.default_rng(seed)
+    pos = {node: np.asarray(previous_pos[node], dtype=float) for node in G.nodes() if node in previous_pos}
+    if pos:
+        coords = np.array(list(pos.values()))
+        low, high = coords.min(axis=0), coords.max(axis=0)
+    else:
+        low, high = np.zeros(2), np.ones(2)
+    spread = float(np.max(high - low)) or 1.0
+
+    for node in G.nodes():
+        if node in pos:
+            continue
+        neighbors = [pos[n] for n in G.neighbors(node) if n in pos]
+        if neighbors:
+            pos[node] = np.mean(neighbors, axis=0) + rng.normal(scale=0.05 * spread, size=2)
+        else:
+            pos[node] = rng.uniform(low, high)
+    return pos
+
+
+def cached_spring_layout(G, name, cache_dir=LAYOUT_CACHE_DIR, refine_iterations=REFINE_ITERATIONS,
+                         layout_func=nx.spring_layout, **layout_kwargs):
+    """带缓存的 spring_layout
+
+    name 为这张图的名称（如“居里夫人_详细关系图谱”），layout_kwargs 原样传给布局函数。
+    layout_func 默认为 nx.spring_layout，也可以是其他支持 pos 参数的布局函数。
+    图结构和布局参数都没变时直接使用上次的坐标；结构有少量变化时以上次坐标为初始位置，
+    只迭代 refine_iterations 次；没有可用的旧布局时完整计算。
+    """
+    signature = graph_signature(G, layout_kwargs.get('weight', 'weight'))
+    params = {key: value for key, value in layout_kwargs.items() if key != 'iterations'}
+    params['layout'] = layout_func.__name__
+    cached = load_layout(name, cache_dir)
+
+    if cached is not None and cached['参数'] == params:
+        if cached['签名'] == signature:
+            count("布局缓存命中")
+            return {node: np.asarray(cached['坐标'][node]) for node in G.nodes()}
+
+        shared = sum(1 for node in G.nodes() if node in cached['坐标'])
+        if len(G) and shared / len(G) >= MIN_SHARED_RATIO:
+            initial = warm_start_positions(G, cached['坐标'], layout_kwargs.get('seed'))
+            kwargs = dict(layout_kwargs, iterations=min(refine_iterations, layout_kwargs.get('iterations', 50)))
+            pos = layout_func(G, pos=initial, **kwargs)
+            count("布局热启动")
+            save_layout(name, signature, params, pos, cache_dir)
+            return pos
+
+    pos = layout_func(G, **layout_kwargs)
+    save_layout(name, signature, params, pos, cache_dir)
+    return pos
+
+
+def save_layout(name, signature, params, pos, cache_dir=LAYOUT_CACHE_DIR):
+    if not os.path.exists(cache_dir):
+        os.makedirs(cache_dir)
+    entry = {
+        '名称': name,
+        '签名': signature,
+        '参数': params,
+        '坐标': {node: np.asarray(xy).tolist() for node, xy in pos.items()}
+    }
+    atomic_pickle(entry, layout_cache_path(name, cache_dir))
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from matplotlib import font_manager
+from 渲染配置 import get_profile, set_profile, add_profile_arguments
+
+# 各绘图脚本共用的中文字体设置
+FONT_RCPARAMS = {
+    'font.sans-serif': ['SimHei', 'Arial Unicode MS', 'DejaVu Sans'],
+    'axes.unicode_minus': False
+}
+
+
+def init_worker(rc_params=FONT_RCPARAMS, profile=None):
+    """子进程初始化：使用非交互的 Agg 后端，只设置一次字体、rcParams 和渲染配置
+
+    顺便查找一次字体，让字体缓存在进程启动时建好，而不是在第一张图上。
+    """
+    matplotlib.use('Agg')
+    plt.rcParams.update(rc_params)
+    if profile:
+        set_profile(profile)
+    font_manager.findfont(font_manager.FontProperties(family=plt.rcParams['font.sans-serif']))
+
+
+def _render(func, args):
+    """在子进程中绘制一张图，返回该函数的结果（通常是输出路径）"""
+    result = func(*args)
+    plt.close('all')
+    return result
+
+
+def resolve_workers(workers, task_count):
+    """workers 为 0 时按CPU核数自动选择，不超过图表数量"""
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    return max(1, min(workers, task_count))
+
+
+def render_all(tasks, workers=0, cache=None):
+    """渲染一组互不依赖的图表
+
+    tasks 为 (绘图函数, 参数元组) 列表，绘图函数必须定义在模块顶层，
+    参数只包含可以pickle的普通数据，并返回输出文件路径。
+    传入 cache 时，输入数据和绘图代码都没变的图表直接跳过。
+    只有一个进程时直接在当前进程中绘制。返回各任务的结果，顺序与 tasks 一致。
+    """
+    results = [None] * len(tasks)
+    pending = []
+    for index, (func, args) in enumerate(tasks):
+        key = None
+        if cache is not None:
+            key = cache.key(func, args)
+            output_path = cache.lookup(key)
+            if output_path is not None:
+                cache.hits += 1
+                results[index] = output_path
+                continue
+            cache.misses += 1
+        pending.append((index, key, func, args))
+
+    if not pending:
+        return results
+    workers = resolve_workers(workers, len(pending))
+
+    if workers == 1:
+        plt.rcParams.update(FONT_RCPARAMS)
+        rendered = [_render(func, args) for _, _, func, args in pending]
+    else:
+        print(f"使用 {workers} 个进程并行渲染 {len(pending)} 张图表...")
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                 initargs=(FONT_RCPARAMS, get_profile())) as executor:
+            futures = [executor.submit(_render, func, args) for _, _, func, args in pending]
+            rendered = [future.result() for future in futures]
+
+    for (index, key, _, _), output_path in zip(pending, rendered):
+        results[index] = output_path
+        if cache is not None:
+            cache.record(key, output_path)
+    return results
+
+
+def add_render_arguments(parser):
+    """为绘图脚本添加 --workers 以及渲染配置、渲染缓存参数"""
+    parser.add_argument('--workers', type=int, default=0,
+                        help="并行渲染的进程数，0 表示按CPU核数自动选择，1 表示不使用多进程")
+    add_profile_arguments(parser)
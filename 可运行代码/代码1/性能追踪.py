@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import time
+import pstats
+import cProfile
+import threading
+import tracemalloc
+from datetime import datetime
+from contextlib import contextmanager
+
+# 追踪结果目录
+TRACE_DIR = "output/traces"
+
+# 由流水线统一开启追踪时使用的环境变量，取值为逗号分隔的 trace、profile、memory
+TRACE_ENV = "PIPELINE_TRACE"
+
+
+class Tracer:
+    """轻量的性能追踪：嵌套计时区间、计数器，可选 cProfile 和 tracemalloc
+
+    未开启时 span 和 count 几乎没有开销，脚本中的埋点可以一直保留。
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.profiler = None
+        self.trace_memory = False
+        self.spans = []
+        self.counters = {}
+        self.counter_samples = []
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.origin = time.perf_counter_ns()
+
+    def enable(self, profile=False, memory=False):
+        """开启追踪，profile 开启 cProfile，memory 开启 tracemalloc"""
+        self.enabled = True
+        if profile and self.profiler is None:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.trace_memory = memory
+
+    def _now_us(self):
+        return (time.perf_counter_ns() - self.origin) / 1000
+
+    def _stack(self):
+        if not hasattr(self.local, 'stack'):
+            self.local.stack = []
+        return self.local.stack
+
+    @contextmanager
+    def span(self, name, **args):
+        """记录一个计时区间，可以嵌套（如 阶段 → 科学家 → 文档）"""
+        if not self.enabled:
+            yield
+            return
+
+        stack = self._stack()
+        parent = stack[-1] if stack else None
+        stack.append(name)
+        memory_start = tracemalloc.get_traced_memory()[0] if self.trace_memory else None
+        start = self._now_us()
+        try:
+            yield
+        finally:
+            end = self._now_us()
+            stack.pop()
+            record = {
+                '名称': name,
+                '父区间': parent,
+                '深度': len(stack),
+                '开始微秒': round(start, 1),
+                '耗时微秒': round(end - start, 1),
+                '线程': threading.get_ident(),
+                '参数': args
+            }
+            if memory_start is not None:
+                current, peak = tracemalloc.get_traced_memory()
+                record['内存增量KB'] = round((current - memory_start) / 1024, 1)
+                record['内存峰值KB'] = round(peak / 1024, 1)
+            with self.lock:
+                self.spans.append(record)
+
+    def count(self, name, n=1):
+        """累加计数器（句子数、词数、缓存命中等）"""
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+            self.counter_samples.append((self._now_us(), name, self.counters[name]))
+
+    def summary(self):
+        """按区间名称汇总调用次数和总耗时"""
+        totals = {}
+        for record in self.spans:
+            entry = totals.setdefault(record['名称'], {'次数': 0, '总耗时秒': 0.0})
+            entry['次数'] += 1
+            entry['总耗时秒'] += record['耗时微秒'] / 1e6
+        for entry in totals.values():
+            entry['总耗时秒'] = round(entry['总耗时秒'], 4)
+        return dict(sorted(totals.items(), key=lambda x: x[1]['总耗时秒'], reverse=True))
+
+    def chrome_trace(self):
+        """转换为 Chrome trace 格式（chrome://tracing 或 Perfetto 可直接打开）"""
+        pid = os.getpid()
+        events = []
+        for record in self.spans:
+            args = dict(record['参数'])
+            for key in ('内存增量KB', '内存峰值KB'):
+                if key in record:
+                    args[key] = record[key]
+            events.append({
+                'name': record['名称'],
+                'cat': record['父区间'] or 'stage',
+                'ph': 'X',
+                'ts': record['开始微秒'],
+                'dur': record['耗时微秒'],
+                'pid': pid,
+                'tid': record['线程'],
+                'args': {key: str(value) for key, value in args.items()}
+            })
+        for ts, name, value in self.counter_samples:
+            events.append({'name': name, 'ph': 'C', 'ts': ts, 'pid': pid, 'args': {name: value}})
+        events.sort(key=lambda e: e['ts'])
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def save(self, name, output_dir=TRACE_DIR):
+        """保存 JSON 汇总、Chrome trace 和（开启时）cProfile 结果，返回文件前缀"""
+        if not self.enabled:
+            return None
+        if not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+
+        prefix = os.path.join(output_dir, f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+
+        report = {
+            '名称': name,
+            '时间': datetime.now().isoformat(timespec='seconds'),
+            '汇总': self.summary(),
+            '计数器': self.counters,
+            '区间': self.spans
+        }
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            report['内存'] = {'当前KB': round(current / 1024, 1), '峰值KB': round(peak / 1024, 1)}
+        with open(prefix + "_追踪.json", 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+        with open(prefix + ".trace.json", 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f, ensure_ascii=False)
+
+        if self.profiler is not None:
+            self.profiler.disable()
+            self.profiler.dump_stats(prefix + ".prof")
+            with open(prefix + "_profile.txt", 'w', encoding='utf-8') as f:
+                pstats.Stats(self.profiler, stream=f).sort_stats('cumulative').print_stats(50)
+
+        print(f"性能追踪结果已保存: {prefix}_追踪.json, {prefix}.trace.json")
+        return prefix
+
+
+# 全局追踪器，各脚本共用
+tracer = Tracer()
+span = tracer.span
+count = tracer.count
+
+
+def add_tracing_arguments(parser):
+    """为脚本添加 --trace / --profile / --trace-memory 参数"""
+    parser.add_argument('--trace', action='store_true', help="记录各阶段耗时和计数，输出JSON和Chrome trace")
+    parser.add_argument('--profile', action='store_true', help="同时记录 cProfile 函数级耗时")
+    parser.add_argument('--trace-memory', action='store_true', help="同时用 tracemalloc 记录内存")
+
+
+def setup_tracing(args=None):
+    """根据命令行参数或环境变量开启追踪"""
+    options = set(filter(None, os.environ.get(TRACE_ENV, '').split(',')))
+    if args is not None:
+        if args.trace:
+            options.add('trace')
+        if args.profile:
+            options.add('profile')
+        if args.trace_memory:
+            options.add('memory')
+    if options:
+        tracer.enable(profile='profile' in options, memory='memory' in options)
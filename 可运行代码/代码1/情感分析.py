@@ -3,9 +3,23 @@
 
 import os
 import json
+import argparse
 import jieba
 import pandas as pd
 from collections import defaultdict
+from 消极句子存储 import NegativeSentenceStore
+from 流水线清单 import record_stage
+from 列式存储 import write_scientist_partition, clear_dataset, check_available
+from 后台写入 import BackgroundWriter
+from 检查点 import UnitCheckpoint
+from 性能追踪 import tracer, span, count, add_tracing_arguments, setup_tracing
+
+# 列式情感分析详情数据集（按科学家分区）
+# 列式存储只用于数据量最大的逐句情感详情；整体统计和 SnowNLP、TF-IDF、词频等阶段仍输出JSON/CSV
+DETAIL_DATASET = "情感分析详情.parquet"
+
+# JSON/CSV格式的逐句详情文件（各科学家一份，加上 所有科学家情感分析详情）
+LEGACY_DETAIL_SUFFIXES = ("情感分析详情.json", "情感分析详情.csv")
 
 def load_sentiment_data(file_path):
     """加载情感分析数据"""
@@ -171,23 +185,28 @@ def generate_overall_sentiment(results):
         '整体情感倾向': overall_sentiment
     }
 
-def save_sentiment_results(results, overall_stats, output_dir, scientist_name):
+def save_sentiment_results(results, overall_stats, output_dir, scientist_name, columnar=False, legacy_export=True):
     """保存情感分析结果"""
     # 创建输出目录
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
     
-    # 保存详细结果
-    df_detailed = pd.DataFrame(results)
+    # 列式存储：每位科学家一个Parquet分区
+    if columnar:
+        write_scientist_partition(results, os.path.join(output_dir, DETAIL_DATASET), scientist_name)
     
-    # 保存为CSV
-    csv_file = os.path.join(output_dir, f"{scientist_name}_情感分析详情.csv")
-    df_detailed.to_csv(csv_file, index=False, encoding='utf-8-sig')
-    
-    # 保存为JSON
-    json_file = os.path.join(output_dir, f"{scientist_name}_情感分析详情.json")
-    with open(json_file, 'w', encoding='utf-8') as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
+    if legacy_export:
+        # 保存详细结果
+        df_detailed = pd.DataFrame(results)
+        
+        # 保存为CSV
+        csv_file = os.path.join(output_dir, f"{scientist_name}_情感分析详情.csv")
+        df_detailed.to_csv(csv_file, index=False, encoding='utf-8-sig')
+        
+        # 保存为JSON
+        json_file = os.path.join(output_dir, f"{scientist_name}_情感分析详情.json")
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
     
     # 保存整体统计
     overall_data = {
@@ -206,13 +225,61 @@ def save_sentiment_results(results, overall_stats, output_dir, scientist_name):
     
     print(f"{scientist_name} 的情感分析结果已保存到 {output_dir} 目录")
 
+def save_all_sentiment_results(all_results, output_dir):
+    """保存所有科学家的情感分析详情"""
+    all_df = pd.DataFrame(all_results)
+    all_csv = os.path.join(output_dir, "所有科学家情感分析详情.csv")
+    all_df.to_csv(all_csv, index=False, encoding='utf-8-sig')
+    
+    all_json = os.path.join(output_dir, "所有科学家情感分析详情.json")
+    with open(all_json, 'w', encoding='utf-8') as f:
+        json.dump(all_results, f, ensure_ascii=False, indent=2)
+
+def remove_legacy_details(output_dir):
+    """删除JSON/CSV格式的逐句详情文件（列式模式下这些文件已被数据集取代，留着会是过期数据）"""
+    if not os.path.exists(output_dir):
+        return
+    for filename in os.listdir(output_dir):
+        if filename.endswith(LEGACY_DETAIL_SUFFIXES):
+            os.remove(os.path.join(output_dir, filename))
+
 def main():
+    parser = argparse.ArgumentParser(description="基于词典的情感分析")
+    parser.add_argument('--columnar', action='store_true',
+                        help="逐句详情写入按科学家分区的Parquet数据集（整体统计和其他阶段的输出仍为JSON/CSV）")
+    parser.add_argument('--legacy-export', action='store_true', help="列式模式下仍然导出JSON/CSV详情文件")
+    parser.add_argument('--resume', action='store_true', help="从上次中断处继续，已评分的科学家直接读取检查点")
+    add_tracing_arguments(parser)
+    args = parser.parse_args()
+    setup_tracing(args)
+    legacy_export = not args.columnar or args.legacy_export
+    
     # 设置目录路径
     sentiment_dir = "output/sentiment_data"
     output_dir = "output/sentiment_analysis"
     
     # 存储所有结果
     all_results = []
+    manifest_counters = {}
+    
+    # 评分的同时写入消极句子库
+    store = NegativeSentenceStore()
+    store.clear()
+    
+    # 只保留本次运行所用格式的详情，另一种格式上次留下的文件会被读取方误当作最新结果
+    if args.columnar:
+        check_available()
+    clear_dataset(os.path.join(output_dir, DETAIL_DATASET))
+    if not legacy_export:
+        remove_legacy_details(output_dir)
+    
+    # 每位科学家评分完成后保存检查点（消极句子库和输出文件在续跑时重新写入）
+    checkpoint = UnitCheckpoint("sentiment")
+    if not args.resume:
+        checkpoint.reset()
+    
+    # 保存文件交给后台线程，与下一位科学家的评分同时进行
+    writer = BackgroundWriter()
     
     # 遍历所有科学家的情感数据
     for filename in os.listdir(sentiment_dir):
@@ -220,15 +287,25 @@ def main():
             scientist_name = filename.replace('_情感分析.json', '')
             file_path = os.path.join(sentiment_dir, filename)
             
-            # 加载情感数据
-            sentences = load_sentiment_data(file_path)
-            
             # 分析情感
-            results = analyze_scientist_sentiment(scientist_name, sentences)
-            all_results.extend(results)
+            with span("情感评分", 科学家=scientist_name):
+                results = checkpoint.load(scientist_name)
+                if results is None:
+                    sentences = load_sentiment_data(file_path)
+                    results = analyze_scientist_sentiment(scientist_name, sentences)
+                    checkpoint.save(scientist_name, results)
+                else:
+                    print(f"从检查点读取 {scientist_name} 的评分结果")
+            count("句子", len(results))
+            if legacy_export:
+                all_results.extend(results)
+            with span("写入消极句子库", 科学家=scientist_name):
+                negative_count = store.add_scientist_results(scientist_name, results)
+            count("消极句子", negative_count)
             
             # 生成整体统计
             overall_stats = generate_overall_sentiment(results)
+            manifest_counters[scientist_name] = dict(overall_stats, 消极句子数=negative_count)
             
             # 打印统计信息
             print(f"\n{scientist_name} 情感分析统计:")
@@ -240,16 +317,21 @@ def main():
             print(f"  整体情感倾向: {overall_stats['整体情感倾向']}")
             
             # 保存结果
-            save_sentiment_results(results, overall_stats, output_dir, scientist_name)
+            writer.submit(save_sentiment_results, results, overall_stats, output_dir, scientist_name,
+                          args.columnar, legacy_export)
     
-    # 保存所有结果
-    all_df = pd.DataFrame(all_results)
-    all_csv = os.path.join(output_dir, "所有科学家情感分析详情.csv")
-    all_df.to_csv(all_csv, index=False, encoding='utf-8-sig')
+    store.close()
     
-    all_json = os.path.join(output_dir, "所有科学家情感分析详情.json")
-    with open(all_json, 'w', encoding='utf-8') as f:
-        json.dump(all_results, f, ensure_ascii=False, indent=2)
+    # 保存所有结果（列式模式下分区数据集本身就是全部结果）
+    if legacy_export:
+        writer.submit(save_all_sentiment_results, all_results, output_dir)
+    
+    # 等待所有文件写完（后台写入出错时在这里抛出）
+    with span("等待写入完成"):
+        writer.close()
+    record_stage("sentiment", manifest_counters)
+    checkpoint.clear()
+    tracer.save("情感分析")
     
     print(f"\n所有科学家的情感分析完成! 结果保存在 {output_dir} 目录中。")
 
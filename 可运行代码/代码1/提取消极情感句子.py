@@ -4,6 +4,8 @@
 import os
 import json
 import pandas as pd
+from 消极句子存储 import NegativeSentenceStore, DEFAULT_DB_PATH, is_negative
+from 列式存储 import read_dataset, list_scientists
 
 def load_sentiment_details(file_path):
     """加载情感分析详情数据"""
@@ -16,7 +18,7 @@ def extract_negative_sentences(sentiment_data, scientist_name):
     negative_sentences = []
     
     for item in sentiment_data:
-        if item.get('情感类别') == '负面' or item.get('情感得分', 0) < 0:
+        if is_negative(item):
             negative_sentences.append({
                 '科学家': scientist_name,
                 '句子编号': item.get('句子编号'),
@@ -26,6 +28,25 @@ def extract_negative_sentences(sentiment_data, scientist_name):
     
     return negative_sentences
 
+def populate_store_from_details(store, sentiment_details_dir):
+    """消极句子库不存在时（旧版情感分析输出），从情感分析详情文件填充"""
+    # 有列式详情数据集时只读取需要的列
+    dataset_dir = os.path.join(sentiment_details_dir, "情感分析详情.parquet")
+    if list_scientists(dataset_dir):
+        columns = ['句子编号', '句子', '情感得分', '情感类别']
+        for scientist_name, df in read_dataset(dataset_dir, columns).groupby('科学家', sort=True):
+            print(f"正在处理 {scientist_name} 的情感分析数据...")
+            store.add_scientist_results(scientist_name, df.to_dict('records'))
+        return
+    
+    for filename in sorted(os.listdir(sentiment_details_dir)):
+        if filename.endswith('_情感分析详情.json') and filename != '所有科学家情感分析详情.json':
+            scientist_name = filename.replace('_情感分析详情.json', '')
+            print(f"正在处理 {scientist_name} 的情感分析数据...")
+            
+            sentiment_data = load_sentiment_details(os.path.join(sentiment_details_dir, filename))
+            store.add_scientist_results(scientist_name, sentiment_data)
+
 def main():
     # 设置目录路径
     sentiment_details_dir = "output/sentiment_analysis"
@@ -35,38 +56,30 @@ def main():
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
     
-    # 存储所有消极句子
-    all_negative_sentences = []
-    
-    # 遍历所有科学家的情感分析详情文件
-    for filename in os.listdir(sentiment_details_dir):
-        if filename.endswith('_情感分析详情.json') and filename != '所有科学家情感分析详情.json':
-            scientist_name = filename.replace('_情感分析详情.json', '')
-            file_path = os.path.join(sentiment_details_dir, filename)
-            
-            print(f"正在处理 {scientist_name} 的情感分析数据...")
+    # 情感分析阶段已写入消极句子库，这里只做导出
+    store_exists = os.path.exists(DEFAULT_DB_PATH)
+    with NegativeSentenceStore() as store:
+        if not store_exists:
+            populate_store_from_details(store, sentiment_details_dir)
+        
+        counts = store.counts()
+        
+        # 保存单个科学家的消极句子
+        for scientist_name in counts:
+            negative_sentences = store.sentences(scientist_name)
             
-            # 加载情感分析详情
-            sentiment_data = load_sentiment_details(file_path)
+            output_file = os.path.join(output_dir, f"{scientist_name}_消极情感句子.json")
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(negative_sentences, f, ensure_ascii=False, indent=2)
             
-            # 提取消极句子
-            negative_sentences = extract_negative_sentences(sentiment_data, scientist_name)
-            all_negative_sentences.extend(negative_sentences)
+            # 也保存为CSV格式
+            df = pd.DataFrame(negative_sentences)
+            csv_file = output_file.replace('.json', '.csv')
+            df.to_csv(csv_file, index=False, encoding='utf-8-sig')
             
-            # 保存单个科学家的消极句子
-            if negative_sentences:
-                output_file = os.path.join(output_dir, f"{scientist_name}_消极情感句子.json")
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(negative_sentences, f, ensure_ascii=False, indent=2)
-                
-                # 也保存为CSV格式
-                df = pd.DataFrame(negative_sentences)
-                csv_file = output_file.replace('.json', '.csv')
-                df.to_csv(csv_file, index=False, encoding='utf-8-sig')
-                
-                print(f"  找到 {len(negative_sentences)} 个消极句子，已保存到 {output_file}")
-            else:
-                print(f"  未找到消极句子")
+            print(f"  {scientist_name}: 找到 {len(negative_sentences)} 个消极句子，已保存到 {output_file}")
+        
+        all_negative_sentences = store.sentences()
     
     # 保存所有科学家的消极句子
     if all_negative_sentences:
@@ -83,13 +96,11 @@ def main():
         print(f"所有结果已保存到 {output_dir} 目录")
         
         # 按科学家分组显示统计
-        scientists = set([item['科学家'] for item in all_negative_sentences])
         print("\n各科学家消极句子统计:")
-        for scientist in scientists:
-            count = len([item for item in all_negative_sentences if item['科学家'] == scientist])
+        for scientist, count in counts.items():
             print(f"  {scientist}: {count} 个消极句子")
     else:
         print("未找到任何消极情感句子")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
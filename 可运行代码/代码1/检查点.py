@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import shutil
+import pickle
+import hashlib
+from 性能追踪 import count
+
+# 检查点目录（每个阶段一个子目录，每个处理单元一个文件）
+CHECKPOINT_DIR = "output/checkpoints"
+
+
+def atomic_pickle(obj, file_path):
+    """先写临时文件再替换，中途中断不会留下半个检查点"""
+    temp_file = file_path + ".tmp"
+    with open(temp_file, 'wb') as f:
+        pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_file, file_path)
+
+
+def atomic_json(obj, file_path):
+    """以JSON格式原子写入（先写临时文件再替换）"""
+    temp_file = file_path + ".tmp"
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(obj, f, ensure_ascii=False)
+    os.replace(temp_file, file_path)
+
+
+class UnitCheckpoint:
+    """按处理单元（文档、科学家）保存的检查点，用于中断后续跑"""
+
+    def __init__(self, stage, checkpoint_dir=CHECKPOINT_DIR):
+        self.stage_dir = os.path.join(checkpoint_dir, stage)
+
+    def _path(self, key):
+        """单元文件名使用键的md5，避免中文或路径字符带来的问题"""
+        digest = hashlib.md5(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.stage_dir, f"{digest}.pkl")
+
+    def reset(self):
+        """不续跑时删除旧检查点，重新开始"""
+        self.clear()
+        os.makedirs(self.stage_dir)
+
+    def has(self, key):
+        return os.path.exists(self._path(key))
+
+    def load(self, key):
+        """读取单元结果，不存在或文件损坏时返回 None"""
+        try:
+            with open(self._path(key), 'rb') as f:
+                value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        count("检查点命中")
+        return value
+
+    def save(self, key, value):
+        if not os.path.exists(self.stage_dir):
+            os.makedirs(self.stage_dir)
+        atomic_pickle(value, self._path(key))
+
+    def clear(self):
+        """阶段成功完成后删除检查点"""
+        if os.path.exists(self.stage_dir):
+            shutil.rmtree(self.stage_dir)
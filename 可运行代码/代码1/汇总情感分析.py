@@ -3,27 +3,38 @@
 
 import os
 import pandas as pd
+from 流水线清单 import load_stage
 
 def summarize_all_sentiment_analysis():
     """汇总所有科学家的情感分析结果"""
     sentiment_analysis_dir = "output/sentiment_analysis"
     
-    # 存储所有统计数据
-    all_stats = []
-    
-    # 遍历所有情感分析统计文件
-    for filename in os.listdir(sentiment_analysis_dir):
-        if filename.endswith('_情感分析统计.csv'):
-            file_path = os.path.join(sentiment_analysis_dir, filename)
-            
-            # 读取CSV文件
-            df = pd.read_csv(file_path)
-            
-            # 添加到统计数据中
-            all_stats.append(df.iloc[0])  # 每个文件只有一行数据
-    
-    # 创建汇总DataFrame
-    summary_df = pd.DataFrame(all_stats)
+    # 优先使用情感分析阶段记录的清单
+    sentiment_counters = load_stage("sentiment")
+    
+    if sentiment_counters:
+        columns = ['总句子数', '正面句子数', '负面句子数', '中性句子数', '平均情感得分', '整体情感倾向']
+        summary_df = pd.DataFrame([
+            dict({'科学家': scientist_name}, **{column: counters[column] for column in columns})
+            for scientist_name, counters in sentiment_counters.items()
+        ])
+    else:
+        # 存储所有统计数据
+        all_stats = []
+        
+        # 遍历所有情感分析统计文件
+        for filename in os.listdir(sentiment_analysis_dir):
+            if filename.endswith('_情感分析统计.csv'):
+                file_path = os.path.join(sentiment_analysis_dir, filename)
+                
+                # 读取CSV文件
+                df = pd.read_csv(file_path)
+                
+                # 添加到统计数据中
+                all_stats.append(df.iloc[0])  # 每个文件只有一行数据
+        
+        # 创建汇总DataFrame
+        summary_df = pd.DataFrame(all_stats)
     
     # 按平均情感得分排序
     summary_df = summary_df.sort_values(by='平均情感得分', ascending=False)
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import json
+from datetime import datetime
+
+# 清单目录（每个阶段一个文件，避免不同阶段互相覆盖）
+MANIFEST_DIR = "output/manifest"
+
+
+def record_stage(stage, scientist_counters, manifest_dir=MANIFEST_DIR):
+    """记录一个阶段产生的各科学家计数 {科学家: {计数名: 值}}"""
+    if not os.path.exists(manifest_dir):
+        os.makedirs(manifest_dir)
+
+    data = {
+        '阶段': stage,
+        '更新时间': datetime.now().isoformat(timespec='seconds'),
+        '科学家': scientist_counters
+    }
+
+    # 先写临时文件再替换，中途失败不会留下半个清单
+    manifest_file = os.path.join(manifest_dir, f"{stage}.json")
+    temp_file = manifest_file + ".tmp"
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(temp_file, manifest_file)
+
+
+def load_stage(stage, manifest_dir=MANIFEST_DIR):
+    """读取一个阶段的计数，阶段未运行时返回空字典"""
+    manifest_file = os.path.join(manifest_dir, f"{stage}.json")
+    if not os.path.exists(manifest_file):
+        return {}
+    with open(manifest_file, 'r', encoding='utf-8') as f:
+        return json.load(f)['科学家']
+
+
+def load_manifest(manifest_dir=MANIFEST_DIR):
+    """合并所有阶段的清单，返回按科学家名排序的 {科学家: {计数名: 值}}"""
+    merged = {}
+    if os.path.exists(manifest_dir):
+        for filename in sorted(os.listdir(manifest_dir)):
+            if filename.endswith('.json'):
+                stage = filename[:-len('.json')]
+                for scientist_name, counters in load_stage(stage, manifest_dir).items():
+                    merged.setdefault(scientist_name, {}).update(counters)
+    return dict(sorted(merged.items()))
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sqlite3
+
+# 默认数据库位置
+DEFAULT_DB_PATH = "output/negative_sentences.db"
+
+
+def is_negative(item):
+    """判断一条情感分析结果是否为消极句子"""
+    return item.get('情感类别') == '负面' or item.get('情感得分', 0) < 0
+
+
+class NegativeSentenceStore:
+    """消极情感句子存储（SQLite，按 (科学家, 情感得分) 建索引）"""
+
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        db_dir = os.path.dirname(db_path)
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir)
+
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS negative_sentences (
+                scientist TEXT NOT NULL,
+                sentence_no INTEGER NOT NULL,
+                sentence TEXT NOT NULL,
+                score REAL NOT NULL,
+                PRIMARY KEY (scientist, sentence_no)
+            )
+        """)
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_scientist_score ON negative_sentences (scientist, score)"
+        )
+        self.conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """关闭数据库连接"""
+        self.conn.close()
+
+    def clear(self):
+        """清空所有句子（重新进行情感分析前调用）"""
+        with self.conn:
+            self.conn.execute("DELETE FROM negative_sentences")
+
+    def add_scientist_results(self, scientist_name, results):
+        """写入一位科学家的情感分析结果中的消极句子（替换该科学家已有的数据）"""
+        rows = [
+            (scientist_name, item.get('句子编号'), item.get('句子'), item.get('情感得分'))
+            for item in results if is_negative(item)
+        ]
+        with self.conn:
+            self.conn.execute("DELETE FROM negative_sentences WHERE scientist = ?", (scientist_name,))
+            self.conn.executemany("INSERT INTO negative_sentences VALUES (?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def _to_records(self, cursor):
+        """把查询结果转换为与原JSON一致的字典"""
+        return [
+            {'科学家': scientist, '句子编号': sentence_no, '句子': sentence, '情感得分': score}
+            for scientist, sentence_no, sentence, score in cursor
+        ]
+
+    def scientists(self):
+        """返回有消极句子的科学家（按名称排序）"""
+        cursor = self.conn.execute("SELECT DISTINCT scientist FROM negative_sentences ORDER BY scientist")
+        return [row[0] for row in cursor]
+
+    def counts(self):
+        """返回 {科学家: 消极句子数量}"""
+        cursor = self.conn.execute(
+            "SELECT scientist, COUNT(*) FROM negative_sentences GROUP BY scientist ORDER BY scientist"
+        )
+        return dict(cursor.fetchall())
+
+    def most_negative(self, scientist_name, limit=None):
+        """按情感得分从低到高返回某位科学家的消极句子（走 (科学家, 得分) 索引）"""
+        cursor = self.conn.execute(
+            "SELECT scientist, sentence_no, sentence, score FROM negative_sentences "
+            "WHERE scientist = ? ORDER BY score, sentence_no LIMIT ?",
+            (scientist_name, -1 if limit is None else limit)
+        )
+        return self._to_records(cursor)
+
+    def sentences(self, scientist_name=None):
+        """按句子编号顺序返回消极句子，不指定科学家时返回全部"""
+        if scientist_name is None:
+            cursor = self.conn.execute(
+                "SELECT scientist, sentence_no, sentence, score FROM negative_sentences "
+                "ORDER BY scientist, sentence_no"
+            )
+        else:
+            cursor = self.conn.execute(
+                "SELECT scientist, sentence_no, sentence, score FROM negative_sentences "
+                "WHERE scientist = ? ORDER BY sentence_no",
+                (scientist_name,)
+            )
+        return self._to_records(cursor)
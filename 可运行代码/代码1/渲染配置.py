@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import json
+import pickle
+import inspect
+import hashlib
+import matplotlib.pyplot as plt
+
+# 渲染配置：draft 用于分析过程中快速查看，publication 为原来的300dpi输出，svg 为矢量图
+RENDER_PROFILES = {
+    'draft': {'format': 'png', 'dpi': 80},
+    'publication': {'format': 'png', 'dpi': 300},
+    'svg': {'format': 'svg', 'dpi': 150}
+}
+DEFAULT_PROFILE = 'publication'
+
+# 由流水线统一指定渲染配置时使用的环境变量
+RENDER_PROFILE_ENV = "RENDER_PROFILE"
+
+# 渲染缓存清单目录：每个绘图脚本一个文件（任务键 → 输出文件），并行运行的绘图阶段互不覆盖
+RENDER_CACHE_DIR = "output/render_cache"
+
+_active_profile = None
+
+
+def set_profile(name):
+    """设置当前进程使用的渲染配置"""
+    global _active_profile
+    if name not in RENDER_PROFILES:
+        raise ValueError(f"未知的渲染配置: {name}，可选: {', '.join(RENDER_PROFILES)}")
+    _active_profile = name
+
+
+def get_profile():
+    """当前渲染配置名称：先看 set_profile，再看环境变量，最后用默认配置"""
+    if _active_profile is not None:
+        return _active_profile
+    name = os.environ.get(RENDER_PROFILE_ENV, DEFAULT_PROFILE)
+    return name if name in RENDER_PROFILES else DEFAULT_PROFILE
+
+
+def profile_path(output_path, profile=None):
+    """按渲染配置的格式替换扩展名（svg 配置输出 .svg）"""
+    settings = RENDER_PROFILES[profile or get_profile()]
+    return os.path.splitext(output_path)[0] + '.' + settings['format']
+
+
+def save_figure(output_path, profile=None, fig=None, **kwargs):
+    """按渲染配置保存当前图形，返回实际保存的路径
+
+    kwargs 会传给 savefig（如 facecolor），bbox_inches 默认为 'tight'。
+    """
+    settings = RENDER_PROFILES[profile or get_profile()]
+    output_path = profile_path(output_path, profile)
+    kwargs.setdefault('bbox_inches', 'tight')
+    (fig or plt).savefig(output_path, dpi=settings['dpi'], format=settings['format'], **kwargs)
+    return output_path
+
+
+def _update_hash(digest, data):
+    """把数据按稳定的方式写入哈希：DataFrame按内容、图按节点和边，其余用pickle"""
+    import pandas as pd
+    import networkx as nx
+
+    if isinstance(data, pd.DataFrame):
+        digest.update(pickle.dumps(list(data.columns), protocol=4))
+        digest.update(pd.util.hash_pandas_object(data.astype(str), index=True).values.tobytes())
+    elif isinstance(data, nx.Graph):
+        digest.update(pickle.dumps((list(data.nodes(data=True)), list(data.edges(data=True))), protocol=4))
+    elif isinstance(data, (list, tuple)):
+        digest.update(f"{type(data).__name__}:{len(data)}".encode('utf-8'))
+        for item in data:
+            _update_hash(digest, item)
+    else:
+        digest.update(pickle.dumps(data, protocol=4))
+
+
+def data_hash(data):
+    """输入数据的md5，用于判断图表是否需要重新渲染"""
+    digest = hashlib.md5()
+    _update_hash(digest, data)
+    return digest.hexdigest()
+
+
+def _function_source(func):
+    """绘图函数的源码，改了绘图代码的图表也会重新渲染"""
+    try:
+        return inspect.getsource(func)
+    except (OSError, TypeError):
+        return func.__code__.co_code.hex()
+
+
+def default_cache_file():
+    """当前脚本的渲染缓存清单路径"""
+    script_name = os.path.splitext(os.path.basename(sys.argv[0] or "render"))[0] or "render"
+    return os.path.join(RENDER_CACHE_DIR, f"{script_name}.json")
+
+
+class RenderCache:
+    """按输入数据哈希缓存的图表渲染结果，数据和绘图代码都没变时不再重新渲染
+
+    键由绘图函数名和源码、渲染配置、参数的哈希组成，值为输出文件路径。
+    """
+
+    def __init__(self, cache_file=None, enabled=True):
+        cache_file = cache_file or default_cache_file()
+        self.cache_file = cache_file
+        self.enabled = enabled
+        self.entries = {}
+        if os.path.exists(cache_file):
+            try:
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, func, data, profile=None):
+        profile = profile or get_profile()
+        parts = [
+            f"{func.__module__}.{func.__qualname__}",
+            hashlib.md5(_function_source(func).encode('utf-8')).hexdigest(),
+            profile,
+            json.dumps(RENDER_PROFILES[profile], sort_keys=True),
+            data_hash(data)
+        ]
+        return hashlib.md5('|'.join(parts).encode('utf-8')).hexdigest()
+
+    def lookup(self, key):
+        """命中且输出文件仍存在时返回路径，否则返回 None"""
+        if not self.enabled:
+            return None
+        output_path = self.entries.get(key)
+        if output_path and os.path.exists(output_path):
+            return output_path
+        return None
+
+    def record(self, key, output_path):
+        """记录渲染结果；同一输出文件只保留最新的键，避免旧键指向已被覆盖的文件"""
+        if not output_path:
+            return
+        for old_key in [k for k, path in self.entries.items() if path == output_path]:
+            del self.entries[old_key]
+        self.entries[key] = output_path
+
+    def render(self, func, args=(), data=None, profile=None):
+        """数据没变时直接返回已有图表，否则调用 func(*args) 并记录
+
+        data 为决定图表内容的输入数据，默认就是 args；绘图函数从对象属性取数据时单独传入。
+        """
+        key = self.key(func, args if data is None else data, profile)
+        output_path = self.lookup(key)
+        if output_path is not None:
+            self.hits += 1
+            return output_path
+        self.misses += 1
+        output_path = func(*args)
+        self.record(key, output_path)
+        return output_path
+
+    def save(self):
+        directory = os.path.dirname(self.cache_file)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        temp_file = self.cache_file + ".tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=2)
+        os.replace(temp_file, self.cache_file)
+        if self.hits:
+            print(f"渲染缓存: {self.hits} 张图表未变化已跳过，重新渲染 {self.misses} 张")
+
+
+def add_profile_arguments(parser):
+    """为绘图脚本添加 --render-profile / --force-render 参数"""
+    parser.add_argument('--render-profile', choices=list(RENDER_PROFILES),
+                        help=f"渲染配置：draft 低分辨率快速预览，publication 300dpi，svg 矢量图（默认读取环境变量 {RENDER_PROFILE_ENV}，否则为 {DEFAULT_PROFILE}）")
+    parser.add_argument('--force-render', action='store_true', help="忽略渲染缓存，全部重新渲染")
+
+
+def setup_rendering(args):
+    """根据命令行参数设置渲染配置，返回渲染缓存"""
+    if args.render_profile:
+        set_profile(args.render_profile)
+    return RenderCache(enabled=not args.force_render)
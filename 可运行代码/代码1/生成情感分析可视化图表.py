@@ -3,13 +3,15 @@
 
 import os
 import json
+import argparse
+from 并行渲染 import FONT_RCPARAMS, render_all, add_render_arguments
+from 渲染配置 import save_figure, setup_rendering
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
 # 设置中文字体支持
-plt.rcParams['font.sans-serif'] = ['SimHei', 'Arial Unicode MS', 'DejaVu Sans']
-plt.rcParams['axes.unicode_minus'] = False
+plt.rcParams.update(FONT_RCPARAMS)
 
 def load_sentiment_stats(file_path):
     """加载情感分析统计数据"""
@@ -89,43 +91,52 @@ def create_bar_chart_comparison(custom_stats, snownlp_stats):
         os.makedirs(output_dir)
     
     plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, '情感分析方法对比柱状图.png'), dpi=300, bbox_inches='tight')
+    output_path = save_figure(os.path.join(output_dir, '情感分析方法对比柱状图.png'))
     plt.close()
+    return output_path
 
-def create_pie_charts(custom_stats, snownlp_stats):
-    """为每个科学家创建饼图"""
+def create_scientist_pie_chart(scientist, custom_data, snownlp_data, pie_charts_dir):
+    """为一位科学家创建两种方法的饼图"""
+    # 创建子图
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 7))
+    
+    # 自研方法饼图
+    sizes_custom = [custom_data['正面句子数'], custom_data['负面句子数'], custom_data['中性句子数']]
+    labels_custom = ['正面', '负面', '中性']
+    colors_custom = ['green', 'red', 'gray']
+    
+    ax1.pie(sizes_custom, labels=labels_custom, colors=colors_custom, autopct='%1.1f%%', startangle=90)
+    ax1.set_title(f'{scientist} - 自研情感分析')
+    
+    # SnowNLP方法饼图
+    sizes_snownlp = [snownlp_data['正面句子数'], snownlp_data['负面句子数'], snownlp_data['中性句子数']]
+    labels_snownlp = ['正面', '负面', '中性']
+    colors_snownlp = ['lightgreen', 'lightcoral', 'lightgray']
+    
+    ax2.pie(sizes_snownlp, labels=labels_snownlp, colors=colors_snownlp, autopct='%1.1f%%', startangle=90)
+    ax2.set_title(f'{scientist} - SnowNLP情感分析')
+    
+    output_path = os.path.join(pie_charts_dir, f'{scientist}_情感分布饼图.png')
+    plt.tight_layout()
+    output_path = save_figure(output_path)
+    plt.close()
+    return output_path
+
+def pie_chart_tasks(custom_stats, snownlp_stats):
+    """每位科学家一张饼图，返回 (绘图函数, 参数) 任务列表"""
     output_dir = "output/sentiment_visualizations"
     pie_charts_dir = os.path.join(output_dir, "情感分布饼图")
     if not os.path.exists(pie_charts_dir):
         os.makedirs(pie_charts_dir)
     
-    scientists = list(custom_stats.keys())
-    
-    for scientist in scientists:
-        # 创建子图
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 7))
-        
-        # 自研方法饼图
-        custom_data = custom_stats[scientist]
-        sizes_custom = [custom_data['正面句子数'], custom_data['负面句子数'], custom_data['中性句子数']]
-        labels_custom = ['正面', '负面', '中性']
-        colors_custom = ['green', 'red', 'gray']
-        
-        ax1.pie(sizes_custom, labels=labels_custom, colors=colors_custom, autopct='%1.1f%%', startangle=90)
-        ax1.set_title(f'{scientist} - 自研情感分析')
-        
-        # SnowNLP方法饼图
-        snownlp_data = snownlp_stats[scientist]
-        sizes_snownlp = [snownlp_data['正面句子数'], snownlp_data['负面句子数'], snownlp_data['中性句子数']]
-        labels_snownlp = ['正面', '负面', '中性']
-        colors_snownlp = ['lightgreen', 'lightcoral', 'lightgray']
-        
-        ax2.pie(sizes_snownlp, labels=labels_snownlp, colors=colors_snownlp, autopct='%1.1f%%', startangle=90)
-        ax2.set_title(f'{scientist} - SnowNLP情感分析')
-        
-        plt.tight_layout()
-        plt.savefig(os.path.join(pie_charts_dir, f'{scientist}_情感分布饼图.png'), dpi=300, bbox_inches='tight')
-        plt.close()
+    return [
+        (create_scientist_pie_chart, (scientist, custom_stats[scientist], snownlp_stats[scientist], pie_charts_dir))
+        for scientist in custom_stats
+    ]
+
+def create_pie_charts(custom_stats, snownlp_stats, workers=0, cache=None):
+    """为每个科学家创建饼图"""
+    render_all(pie_chart_tasks(custom_stats, snownlp_stats), workers, cache)
 
 def create_horizontal_bar_chart(custom_stats, snownlp_stats):
     """创建横向柱状图显示平均情感得分"""
@@ -166,8 +177,9 @@ def create_horizontal_bar_chart(custom_stats, snownlp_stats):
         os.makedirs(output_dir)
     
     plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, '情感分析平均得分对比.png'), dpi=300, bbox_inches='tight')
+    output_path = save_figure(os.path.join(output_dir, '情感分析平均得分对比.png'))
     plt.close()
+    return output_path
 
 def create_stacked_area_chart(custom_stats, snownlp_stats):
     """创建堆叠面积图显示情感分布趋势"""
@@ -221,8 +233,9 @@ def create_stacked_area_chart(custom_stats, snownlp_stats):
         os.makedirs(output_dir)
     
     plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, '情感分布堆叠面积图.png'), dpi=300, bbox_inches='tight')
+    output_path = save_figure(os.path.join(output_dir, '情感分布堆叠面积图.png'))
     plt.close()
+    return output_path
 
 def create_heatmap(custom_stats, snownlp_stats):
     """创建热力图显示情感分布"""
@@ -269,27 +282,34 @@ def create_heatmap(custom_stats, snownlp_stats):
         os.makedirs(output_dir)
     
     plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, '情感分析热力图.png'), dpi=300, bbox_inches='tight')
+    output_path = save_figure(os.path.join(output_dir, '情感分析热力图.png'))
     plt.close()
+    return output_path
+
+def chart_tasks(custom_stats, snownlp_stats):
+    """所有互不依赖的图表任务：四张汇总图加每位科学家的饼图"""
+    tasks = [
+        (create_bar_chart_comparison, (custom_stats, snownlp_stats)),
+        (create_horizontal_bar_chart, (custom_stats, snownlp_stats)),
+        (create_stacked_area_chart, (custom_stats, snownlp_stats)),
+        (create_heatmap, (custom_stats, snownlp_stats))
+    ]
+    tasks.extend(pie_chart_tasks(custom_stats, snownlp_stats))
+    return tasks
 
 def main():
+    parser = argparse.ArgumentParser(description="生成情感分析可视化图表")
+    add_render_arguments(parser)
+    args = parser.parse_args()
+    cache = setup_rendering(args)
+    
     print("正在收集情感分析数据...")
     custom_stats, snownlp_stats = collect_all_sentiment_data()
     
-    print("正在生成柱状图对比...")
-    create_bar_chart_comparison(custom_stats, snownlp_stats)
-    
-    print("正在生成饼图...")
-    create_pie_charts(custom_stats, snownlp_stats)
-    
-    print("正在生成横向柱状图...")
-    create_horizontal_bar_chart(custom_stats, snownlp_stats)
-    
-    print("正在生成堆叠面积图...")
-    create_stacked_area_chart(custom_stats, snownlp_stats)
-    
-    print("正在生成热力图...")
-    create_heatmap(custom_stats, snownlp_stats)
+    tasks = chart_tasks(custom_stats, snownlp_stats)
+    print(f"正在生成柱状图、横向柱状图、堆叠面积图、热力图和 {len(custom_stats)} 张饼图...")
+    render_all(tasks, args.workers, cache)
+    cache.save()
     
     print("所有情感分析可视化图表已生成完成！")
     print("结果保存在 output/sentiment_visualizations 目录中")
@@ -4,6 +4,42 @@
 import os
 import json
 import pandas as pd
+from 流水线清单 import load_manifest
+from 消极句子存储 import NegativeSentenceStore, DEFAULT_DB_PATH
+
+def load_counts_from_outputs(output_dir="output"):
+    """没有流水线清单时（较早的输出），从各科学家的清洗结果文件统计计数"""
+    sentiment_dir = os.path.join(output_dir, "sentiment_data")
+    association_dir = os.path.join(output_dir, "association_data")
+    cleaned_dir = os.path.join(output_dir, "cleaned_data")
+    if not os.path.exists(sentiment_dir):
+        return []
+    
+    # 消极句子数来自消极句子库的聚合查询（库不存在时记为 '-'）
+    negative_counts = None
+    if os.path.exists(DEFAULT_DB_PATH):
+        with NegativeSentenceStore() as store:
+            negative_counts = store.counts()
+    
+    scientists_data = []
+    for filename in sorted(os.listdir(sentiment_dir)):
+        if not filename.endswith("_情感分析.json"):
+            continue
+        scientist_name = filename.replace("_情感分析.json", "")
+        with open(os.path.join(sentiment_dir, filename), 'r', encoding='utf-8') as f:
+            sentiment_count = len(json.load(f))
+        with open(os.path.join(association_dir, f"{scientist_name}_关联分析.json"), 'r', encoding='utf-8') as f:
+            association_count = len(json.load(f))
+        with open(os.path.join(cleaned_dir, f"{scientist_name}_清洗文本.txt"), 'r', encoding='utf-8') as f:
+            cleaned_chars = len(f.read())
+        scientists_data.append({
+            "科学家": scientist_name,
+            "情感句子数": sentiment_count,
+            "关联词汇数": association_count,
+            "清洗后字符数": cleaned_chars,
+            "消极句子数": '-' if negative_counts is None else negative_counts.get(scientist_name, 0)
+        })
+    return scientists_data
 
 def generate_summary_report():
     """生成数据清理总结报告"""
@@ -13,56 +49,40 @@ def generate_summary_report():
     report_lines.append("## 处理概览")
     report_lines.append("")
     
-    # 统计信息
-    total_scientists = 0
-    total_sentiment_sentences = 0
-    total_association_words = 0
-    total_cleaned_chars = 0
-    
+    # 读取清洗阶段和情感分析阶段记录的计数，不再重新读取数据文件
+    manifest = load_manifest()
     scientists_data = []
+    for scientist_name, counters in manifest.items():
+        if '清洗后字符数' not in counters:
+            continue
+        scientists_data.append({
+            "科学家": scientist_name,
+            "情感句子数": counters['情感句子数'],
+            "关联词汇数": counters['关联词汇数'],
+            "清洗后字符数": counters['清洗后字符数'],
+            "消极句子数": counters.get('消极句子数', '-')
+        })
     
-    # 遍历所有科学家的数据
-    sentiment_dir = "output/sentiment_data"
-    association_dir = "output/association_data"
-    cleaned_dir = "output/cleaned_data"
+    if not scientists_data:
+        # 较早的输出没有清单，改为读取各科学家的清洗结果文件
+        scientists_data = load_counts_from_outputs()
     
-    for filename in os.listdir(sentiment_dir):
-        if filename.endswith("_情感分析.json"):
-            scientist_name = filename.replace("_情感分析.json", "")
-            total_scientists += 1
-            
-            # 读取情感分析数据
-            sentiment_file = os.path.join(sentiment_dir, filename)
-            with open(sentiment_file, 'r', encoding='utf-8') as f:
-                sentiment_data = json.load(f)
-            sentiment_count = len(sentiment_data)
-            total_sentiment_sentences += sentiment_count
-            
-            # 读取关联分析数据
-            association_file = os.path.join(association_dir, f"{scientist_name}_关联分析.json")
-            with open(association_file, 'r', encoding='utf-8') as f:
-                association_data = json.load(f)
-            association_count = len(association_data)
-            total_association_words += association_count
-            
-            # 读取清洗后文本
-            cleaned_file = os.path.join(cleaned_dir, f"{scientist_name}_清洗文本.txt")
-            with open(cleaned_file, 'r', encoding='utf-8') as f:
-                cleaned_text = f.read()
-            cleaned_chars = len(cleaned_text)
-            total_cleaned_chars += cleaned_chars
-            
-            scientists_data.append({
-                "科学家": scientist_name,
-                "情感句子数": sentiment_count,
-                "关联词汇数": association_count,
-                "清洗后字符数": cleaned_chars
-            })
+    if not scientists_data:
+        print("未找到流水线清单和清洗结果，请先运行 高级数据清理.py")
+        return
+    
+    # 统计信息
+    total_scientists = len(scientists_data)
+    total_sentiment_sentences = sum(row["情感句子数"] for row in scientists_data)
+    total_association_words = sum(row["关联词汇数"] for row in scientists_data)
+    total_cleaned_chars = sum(row["清洗后字符数"] for row in scientists_data)
+    total_negative_sentences = sum(row["消极句子数"] for row in scientists_data if row["消极句子数"] != '-')
     
     report_lines.append(f"总共处理科学家数量: {total_scientists}")
     report_lines.append(f"总共情感分析句子数: {total_sentiment_sentences}")
     report_lines.append(f"总共关联分析词汇数: {total_association_words}")
     report_lines.append(f"总共清洗后字符数: {total_cleaned_chars}")
+    report_lines.append(f"总共消极情感句子数: {total_negative_sentences}")
     report_lines.append("")
     
     report_lines.append("## 各科学家数据详情")
@@ -73,10 +93,10 @@ def generate_summary_report():
     df = df.sort_values(by="清洗后字符数", ascending=False)
     
     # 添加表格
-    report_lines.append("| 科学家 | 情感句子数 | 关联词汇数 | 清洗后字符数 |")
-    report_lines.append("|--------|------------|------------|--------------|")
+    report_lines.append("| 科学家 | 情感句子数 | 关联词汇数 | 清洗后字符数 | 消极句子数 |")
+    report_lines.append("|--------|------------|------------|--------------|------------|")
     for _, row in df.iterrows():
-        report_lines.append(f"| {row['科学家']} | {row['情感句子数']} | {row['关联词汇数']} | {row['清洗后字符数']} |")
+        report_lines.append(f"| {row['科学家']} | {row['情感句子数']} | {row['关联词汇数']} | {row['清洗后字符数']} | {row['消极句子数']} |")
     
     report_lines.append("")
     report_lines.append("## 数据处理说明")
@@ -104,6 +124,7 @@ def generate_summary_report():
     print(f"总共情感分析句子数: {total_sentiment_sentences}")
     print(f"总共关联分析词汇数: {total_association_words}")
     print(f"总共清洗后字符数: {total_cleaned_chars}")
+    print(f"总共消极情感句子数: {total_negative_sentences}")
     print("\n各科学家数据详情:")
     print(df.to_string(index=False))
 
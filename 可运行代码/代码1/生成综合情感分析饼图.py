@@ -3,32 +3,20 @@
 
 import os
 import json
+import argparse
+from 并行渲染 import FONT_RCPARAMS, render_all, add_render_arguments
+from 渲染配置 import save_figure, setup_rendering
 import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
 
 # 设置中文字体支持
-plt.rcParams['font.sans-serif'] = ['SimHei', 'Arial Unicode MS', 'DejaVu Sans']
-plt.rcParams['axes.unicode_minus'] = False
+plt.rcParams.update(FONT_RCPARAMS)
 
-def create_comprehensive_pie_charts():
-    """创建综合情感分析饼图"""
-    # 读取自研情感分析汇总数据
-    custom_summary_file = "output/sentiment_analysis/所有科学家情感分析汇总.csv"
-    custom_df = pd.read_csv(custom_summary_file)
-    
-    # 读取SnowNLP情感分析汇总数据
-    snownlp_summary_file = "output/sentiment_analysis_snownlp/所有科学家SnowNLP情感分析汇总.csv"
-    snownlp_df = pd.read_csv(snownlp_summary_file)
-    
-    # 计算总体统计数据
-    total_custom_positive = custom_df['正面句子数'].sum()
-    total_custom_negative = custom_df['负面句子数'].sum()
-    total_custom_neutral = custom_df['中性句子数'].sum()
-    
-    total_snownlp_positive = snownlp_df['正面句子数'].sum()
-    total_snownlp_negative = snownlp_df['负面句子数'].sum()
-    total_snownlp_neutral = snownlp_df['中性句子数'].sum()
+def create_overall_pie_chart(custom_totals, snownlp_totals, output_path):
+    """创建两种方法总体情感分布及正负面对比的综合饼图"""
+    total_custom_positive, total_custom_negative, total_custom_neutral = custom_totals
+    total_snownlp_positive, total_snownlp_negative, total_snownlp_neutral = snownlp_totals
     
     # 创建综合饼图
     fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(20, 16))
@@ -72,39 +60,22 @@ def create_comprehensive_pie_charts():
         autotext.set_weight('bold')
     
     plt.tight_layout()
-    plt.savefig('output/sentiment_visualizations/综合情感分析饼图.png', dpi=300, bbox_inches='tight')
+    output_path = save_figure(output_path)
     plt.close()
-    
-    # 创建按科学家分布的饼图
-    create_scientist_distribution_pie_charts(custom_df, snownlp_df)
+    return output_path
 
-def create_scientist_distribution_pie_charts(custom_df, snownlp_df):
-    """创建按科学家分布的情感分析饼图"""
-    # 按总句子数排序
-    custom_df_sorted = custom_df.sort_values('总句子数', ascending=False)
-    
-    # 创建按科学家正面情感分布的饼图
+def create_distribution_pie_chart(scientists, custom_counts, snownlp_counts, sentiment, output_path):
+    """创建某一情感（正面/负面）句子在各科学家之间分布的饼图"""
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(20, 10))
     
-    # 自研方法各科学家正面句子数
-    scientists = custom_df_sorted['科学家'].tolist()
-    custom_positive_counts = custom_df_sorted['正面句子数'].tolist()
-    
     # 为避免颜色重复，生成一组颜色
     colors = plt.cm.Set3(np.linspace(0, 1, len(scientists)))
     
-    wedges1, texts1, autotexts1 = ax1.pie(custom_positive_counts, labels=scientists, colors=colors, autopct='%1.1f%%', startangle=90)
-    ax1.set_title('自研情感分析方法 - 各科学家正面句子分布', fontsize=16, pad=20)
-    
-    # SnowNLP方法各科学家正面句子数
-    # 按相同顺序排列科学家
-    snownlp_positive_counts = []
-    for scientist in scientists:
-        count = snownlp_df[snownlp_df['科学家'] == scientist]['正面句子数'].iloc[0]
-        snownlp_positive_counts.append(count)
+    wedges1, texts1, autotexts1 = ax1.pie(custom_counts, labels=scientists, colors=colors, autopct='%1.1f%%', startangle=90)
+    ax1.set_title(f'自研情感分析方法 - 各科学家{sentiment}句子分布', fontsize=16, pad=20)
     
-    wedges2, texts2, autotexts2 = ax2.pie(snownlp_positive_counts, labels=scientists, colors=colors, autopct='%1.1f%%', startangle=90)
-    ax2.set_title('SnowNLP情感分析方法 - 各科学家正面句子分布', fontsize=16, pad=20)
+    wedges2, texts2, autotexts2 = ax2.pie(snownlp_counts, labels=scientists, colors=colors, autopct='%1.1f%%', startangle=90)
+    ax2.set_title(f'SnowNLP情感分析方法 - 各科学家{sentiment}句子分布', fontsize=16, pad=20)
     
     # 调整文本大小
     for autotext in autotexts1 + autotexts2:
@@ -117,44 +88,65 @@ def create_scientist_distribution_pie_charts(custom_df, snownlp_df):
         text.set_fontsize(9)
     
     plt.tight_layout()
-    plt.savefig('output/sentiment_visualizations/各科学家正面情感分布饼图.png', dpi=300, bbox_inches='tight')
+    output_path = save_figure(output_path)
     plt.close()
+    return output_path
+
+def scientist_distribution_tasks(custom_df, snownlp_df):
+    """按科学家分布的正面、负面饼图任务"""
+    # 按总句子数排序
+    custom_df_sorted = custom_df.sort_values('总句子数', ascending=False)
+    scientists = custom_df_sorted['科学家'].tolist()
     
-    # 创建按科学家负面情感分布的饼图
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(20, 10))
-    
-    # 自研方法各科学家负面句子数
-    custom_negative_counts = custom_df_sorted['负面句子数'].tolist()
-    
-    wedges1, texts1, autotexts1 = ax1.pie(custom_negative_counts, labels=scientists, colors=colors, autopct='%1.1f%%', startangle=90)
-    ax1.set_title('自研情感分析方法 - 各科学家负面句子分布', fontsize=16, pad=20)
-    
-    # SnowNLP方法各科学家负面句子数
-    snownlp_negative_counts = []
-    for scientist in scientists:
-        count = snownlp_df[snownlp_df['科学家'] == scientist]['负面句子数'].iloc[0]
-        snownlp_negative_counts.append(count)
+    # SnowNLP结果按相同顺序排列科学家
+    snownlp_by_scientist = snownlp_df.set_index('科学家')
     
-    wedges2, texts2, autotexts2 = ax2.pie(snownlp_negative_counts, labels=scientists, colors=colors, autopct='%1.1f%%', startangle=90)
-    ax2.set_title('SnowNLP情感分析方法 - 各科学家负面句子分布', fontsize=16, pad=20)
+    tasks = []
+    for sentiment, column in [('正面', '正面句子数'), ('负面', '负面句子数')]:
+        custom_counts = custom_df_sorted[column].tolist()
+        snownlp_counts = [int(snownlp_by_scientist.loc[scientist, column]) for scientist in scientists]
+        output_path = f'output/sentiment_visualizations/各科学家{sentiment}情感分布饼图.png'
+        tasks.append((create_distribution_pie_chart, (scientists, custom_counts, snownlp_counts, sentiment, output_path)))
+    return tasks
+
+def comprehensive_pie_tasks(custom_df, snownlp_df):
+    """综合饼图和按科学家分布饼图的全部任务"""
+    custom_totals = tuple(int(custom_df[column].sum()) for column in ['正面句子数', '负面句子数', '中性句子数'])
+    snownlp_totals = tuple(int(snownlp_df[column].sum()) for column in ['正面句子数', '负面句子数', '中性句子数'])
+    
+    tasks = [(create_overall_pie_chart, (custom_totals, snownlp_totals, 'output/sentiment_visualizations/综合情感分析饼图.png'))]
+    tasks.extend(scientist_distribution_tasks(custom_df, snownlp_df))
+    return tasks
+
+def create_comprehensive_pie_charts(workers=0, cache=None):
+    """创建综合情感分析饼图"""
+    # 读取自研情感分析汇总数据
+    custom_summary_file = "output/sentiment_analysis/所有科学家情感分析汇总.csv"
+    custom_df = pd.read_csv(custom_summary_file)
     
-    # 调整文本大小
-    for autotext in autotexts1 + autotexts2:
-        autotext.set_fontsize(10)
-        autotext.set_color('white')
-        autotext.set_weight('bold')
+    # 读取SnowNLP情感分析汇总数据
+    snownlp_summary_file = "output/sentiment_analysis_snownlp/所有科学家SnowNLP情感分析汇总.csv"
+    snownlp_df = pd.read_csv(snownlp_summary_file)
     
-    # 减少标签字体大小以避免重叠
-    for text in texts1 + texts2:
-        text.set_fontsize(9)
+    output_dir = "output/sentiment_visualizations"
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
     
-    plt.tight_layout()
-    plt.savefig('output/sentiment_visualizations/各科学家负面情感分布饼图.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    render_all(comprehensive_pie_tasks(custom_df, snownlp_df), workers, cache)
+
+def create_scientist_distribution_pie_charts(custom_df, snownlp_df, workers=0, cache=None):
+    """创建按科学家分布的情感分析饼图"""
+    render_all(scientist_distribution_tasks(custom_df, snownlp_df), workers, cache)
 
 def main():
+    parser = argparse.ArgumentParser(description="生成综合情感分析饼图")
+    add_render_arguments(parser)
+    args = parser.parse_args()
+    cache = setup_rendering(args)
+    
     print("正在生成综合情感分析饼图...")
-    create_comprehensive_pie_charts()
+    create_comprehensive_pie_charts(args.workers, cache)
+    cache.save()
     print("综合情感分析饼图已生成完成！")
     print("结果保存在 output/sentiment_visualizations 目录中")
 
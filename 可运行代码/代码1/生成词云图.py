@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import hashlib
+import argparse
+import numpy as np
+from PIL import Image
+from wordcloud import WordCloud
+import matplotlib.pyplot as plt
+from matplotlib import font_manager
+from 并行渲染 import FONT_RCPARAMS, render_all, add_render_arguments
+from 渲染配置 import save_figure, setup_rendering
+
+# 设置中文字体支持
+plt.rcParams.update(FONT_RCPARAMS)
+
+# 词云图的两种数据来源：输入目录、文件名后缀、输出目录、输出文件名后缀、标题后缀
+SOURCES = {
+    'tfidf': {
+        'input_dir': 'output/tfidf_analysis',
+        'suffix': '_TFIDF词汇.json',
+        'output_dir': 'output/tfidf_word_clouds',
+        'output_suffix': '_TFIDF词云图.png',
+        'title': 'TF-IDF词云图'
+    },
+    'frequency': {
+        'input_dir': 'output/word_frequency',
+        'suffix': '_词频统计.json',
+        'output_dir': 'output/word_clouds',
+        'output_suffix': '_词频词云图.png',
+        'title': '词频词云图'
+    }
+}
+
+# 中文字体候选路径（Windows 黑体、macOS、Linux 常见的中文字体），都找不到时再通过 matplotlib 查找
+FONT_CANDIDATES = [
+    "C:/Windows/Fonts/simhei.ttf",
+    "C:/Windows/Fonts/msyh.ttc",
+    "/System/Library/Fonts/PingFang.ttc",
+    "/Library/Fonts/Arial Unicode.ttf",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc"
+]
+
+# 词云样式
+WORDCLOUD_STYLE = {
+    'width': 800,
+    'height': 600,
+    'background_color': 'white',
+    'max_words': 200,
+    'colormap': 'plasma',
+    'random_state': 42
+}
+
+# 每个进程内按（字体, 遮罩）复用的 WordCloud 对象和遮罩数组
+_wordclouds = {}
+
+
+def find_font_path(font_path=None):
+    """查找一次中文字体文件，找不到时返回 None（词云使用 wordcloud 自带字体，中文可能无法显示）"""
+    candidates = [font_path] if font_path else FONT_CANDIDATES
+    for path in candidates:
+        if path and os.path.exists(path):
+            return path
+    if font_path:
+        raise FileNotFoundError(f"字体文件不存在: {font_path}")
+
+    for family in FONT_RCPARAMS['font.sans-serif']:
+        try:
+            return str(font_manager.findfont(font_manager.FontProperties(family=family), fallback_to_default=False))
+        except ValueError:
+            continue
+    print("警告: 未找到中文字体，词云中的中文可能无法显示，可用 --font 指定字体文件")
+    return None
+
+
+def file_md5(file_path):
+    with open(file_path, 'rb') as f:
+        return hashlib.md5(f.read()).hexdigest()
+
+
+def get_wordcloud(font_path, mask_path):
+    """返回当前进程中复用的 WordCloud 对象，字体和遮罩图片只在第一次使用时加载"""
+    key = (font_path, mask_path)
+    if key not in _wordclouds:
+        mask = np.array(Image.open(mask_path).convert('L')) if mask_path else None
+        _wordclouds[key] = WordCloud(font_path=font_path, mask=mask, **WORDCLOUD_STYLE)
+    return _wordclouds[key]
+
+
+def load_tfidf_weights(file_path):
+    """TF-IDF结果：{词语: 权重}"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_frequency_weights(file_path):
+    """词频统计结果：[{'科学家', '词语', '频次'}, ...] → {词语: 频次}"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        records = json.load(f)
+    return {record['词语']: record['频次'] for record in records}
+
+
+def frequency_vector(weights):
+    """按词语排序、去掉非正权重的 (词语, 权重) 元组，作为绘图参数时同样的数据得到同样的缓存键"""
+    return tuple(sorted((word, float(weight)) for word, weight in weights.items() if weight > 0))
+
+
+def render_word_cloud(frequencies, title, output_path, font_path=None, mask_path=None, mask_md5=None):
+    """根据 (词语, 权重) 元组生成一张词云图，返回输出路径
+
+    mask_md5 只用于渲染缓存：遮罩图片内容变化时重新渲染。
+    """
+    wc = get_wordcloud(font_path, mask_path)
+    # WordCloud 只在创建时初始化一次随机数，复用时每张图重新设种子，布局才与渲染顺序和进程无关
+    wc.random_state.seed(WORDCLOUD_STYLE['random_state'])
+    wc.generate_from_frequencies(dict(frequencies))
+
+    plt.figure(figsize=(10, 8))
+    plt.imshow(wc, interpolation='bilinear')
+    plt.axis('off')
+    plt.title(title, fontsize=20)
+
+    output_path = save_figure(output_path)
+    plt.close()
+    return output_path
+
+
+def collect_word_cloud_tasks(source, font_path=None, mask_path=None, input_dir=None, output_dir=None):
+    """为某个数据来源下的每位科学家生成一个绘图任务"""
+    settings = SOURCES[source]
+    input_dir = input_dir or settings['input_dir']
+    output_dir = output_dir or settings['output_dir']
+    load_weights = load_tfidf_weights if source == 'tfidf' else load_frequency_weights
+    mask_md5 = file_md5(mask_path) if mask_path else None
+
+    if not os.path.exists(input_dir):
+        print(f"跳过 {source}: 输入目录 {input_dir} 不存在")
+        return []
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    tasks = []
+    for filename in sorted(os.listdir(input_dir)):
+        if not filename.endswith(settings['suffix']):
+            continue
+        scientist_name = filename.replace(settings['suffix'], '')
+        frequencies = frequency_vector(load_weights(os.path.join(input_dir, filename)))
+        if not frequencies:
+            print(f"跳过 {scientist_name}: 没有可用的词汇权重")
+            continue
+        output_path = os.path.join(output_dir, scientist_name + settings['output_suffix'])
+        title = f"{scientist_name} {settings['title']}"
+        tasks.append((render_word_cloud, (frequencies, title, output_path, font_path, mask_path, mask_md5)))
+    return tasks
+
+
+def generate_word_clouds(sources, font_path=None, mask_path=None, workers=0, cache=None):
+    """生成指定数据来源的全部词云图，返回输出路径列表"""
+    font_path = find_font_path(font_path)
+    tasks = []
+    for source in sources:
+        tasks.extend(collect_word_cloud_tasks(source, font_path, mask_path))
+    print(f"正在生成 {len(tasks)} 张词云图...")
+    return render_all(tasks, workers, cache)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="根据TF-IDF或词频统计结果生成各科学家词云图")
+    parser.add_argument('--source', choices=['tfidf', 'frequency', 'all'], default='all',
+                        help="词汇权重来源：TF-IDF分析、词频统计或两者都生成")
+    parser.add_argument('--font', help="中文字体文件路径（默认自动查找）")
+    parser.add_argument('--mask', help="词云形状遮罩图片（白色区域不放置词语）")
+    add_render_arguments(parser)
+    args = parser.parse_args()
+    cache = setup_rendering(args)
+
+    sources = list(SOURCES) if args.source == 'all' else [args.source]
+    output_paths = generate_word_clouds(sources, args.font, args.mask, args.workers, cache)
+    cache.save()
+
+    print(f"词云图生成完毕，共 {len(output_paths)} 张")
+    for source in sources:
+        print(f"结果保存在 {SOURCES[source]['output_dir']} 目录中")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,11 @@
 
 import os
 import json
+import argparse
 import networkx as nx
 import matplotlib.pyplot as plt
+from 渲染配置 import save_figure, add_profile_arguments, setup_rendering
+from 布局缓存 import cached_spring_layout
 from collections import Counter
 
 # 设置中文字体支持
@@ -76,7 +79,7 @@ def visualize_detailed_graph(G, scientist_name, output_path):
     plt.figure(figsize=(16, 12))
     
     # 为节点分配位置
-    pos = nx.spring_layout(G, k=3, iterations=100)
+    pos = cached_spring_layout(G, f"{scientist_name}_详细关系图谱", k=3, iterations=100)
     
     # 绘制节点
     for node, attrs in G.nodes(data=True):
@@ -110,12 +113,18 @@ def visualize_detailed_graph(G, scientist_name, output_path):
     
     # 保存图像
     plt.tight_layout()
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    output_path = save_figure(output_path)
     plt.close()
     
     print(f"{scientist_name}的详细关系图谱已保存到 {output_path}")
+    return output_path
 
 def main():
+    parser = argparse.ArgumentParser(description="生成详细的科学家关系图谱")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    cache = setup_rendering(args)
+    
     # 创建输出目录
     output_dir = "output/detailed_person_graphs"
     if not os.path.exists(output_dir):
@@ -144,8 +153,9 @@ def main():
         
         # 生成可视化
         output_path = os.path.join(output_dir, f"{scientist_name}_详细关系图谱.png")
-        visualize_detailed_graph(G, scientist_name, output_path)
+        cache.render(visualize_detailed_graph, (G, scientist_name, output_path))
     
+    cache.save()
     print(f"\n所有科学家的详细关系图谱构建完成！结果保存在 {output_dir} 目录中。")
 
 if __name__ == "__main__":
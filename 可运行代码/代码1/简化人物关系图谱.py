@@ -3,10 +3,13 @@
 
 import os
 import json
+import argparse
 import pandas as pd
 from collections import defaultdict
 import networkx as nx
 import matplotlib.pyplot as plt
+from 渲染配置 import save_figure, add_profile_arguments, setup_rendering
+from 布局缓存 import cached_spring_layout
 
 # 设置中文字体支持
 plt.rcParams['font.sans-serif'] = ['SimHei', 'Arial Unicode MS', 'DejaVu Sans']
@@ -79,7 +82,7 @@ def visualize_simplified_graph(G, scientists, output_path="output/simplified_per
     plt.figure(figsize=(20, 15))
     
     # 为节点分配位置
-    pos = nx.spring_layout(G, k=2, iterations=50)
+    pos = cached_spring_layout(G, "简化人物关系图谱", k=2, iterations=50)
     
     # 区分节点类型
     scientist_nodes = [n for n, attr in G.nodes(data=True) if attr.get('type') == 'scientist']
@@ -116,10 +119,11 @@ def visualize_simplified_graph(G, scientists, output_path="output/simplified_per
     
     # 保存图像
     plt.tight_layout()
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    output_path = save_figure(output_path)
     plt.close()
     
     print(f"简化人物关系图谱已保存到 {output_path}")
+    return output_path
 
 def export_simplified_graph_data(G, output_path="output/simplified_person_graph_data.json"):
     """导出简化人物关系图数据为JSON格式"""
@@ -171,6 +175,11 @@ def generate_simplified_statistics(G, scientists):
         print(f"  {scientist}: {person_count}个关联人物, {scientist_count}个科学家合作")
 
 def main():
+    parser = argparse.ArgumentParser(description="构建并可视化简化人物关系图谱")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    cache = setup_rendering(args)
+    
     # 创建输出目录
     output_dir = "output/simplified_person_graph"
     if not os.path.exists(output_dir):
@@ -185,12 +194,13 @@ def main():
     
     # 可视化简化人物关系图谱
     visualize_path = os.path.join(output_dir, "简化人物关系图谱.png")
-    visualize_simplified_graph(G, scientists, visualize_path)
+    cache.render(visualize_simplified_graph, (G, scientists, visualize_path))
     
     # 导出图数据
     graph_data_path = os.path.join(output_dir, "简化人物关系图数据.json")
     export_simplified_graph_data(G, graph_data_path)
     
+    cache.save()
     print(f"\n简化人物关系图谱构建完成！结果保存在 {output_dir} 目录中。")
 
 if __name__ == "__main__":
@@ -2,9 +2,20 @@
 # -*- coding: utf-8 -*-
 
 import os
+import re
+import sys
 import json
+import hashlib
+import argparse
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
+from 频率草图 import SpaceSavingSketch
+from 后台写入 import BackgroundWriter
+from 性能追踪 import tracer, span, count, add_tracing_arguments, setup_tracing
+
+# 发布的高频词数量
+TOP_N = 100
 
 def load_association_data(file_path):
     """加载关联分析数据"""
@@ -18,18 +29,27 @@ def calculate_word_frequency(words):
     word_freq = Counter(words)
     return word_freq
 
-def analyze_scientist_frequency(scientist_name, association_file):
-    """分析单个科学家的词频"""
-    print(f"正在分析 {scientist_name} 的词频...")
+def count_scientist_words(scientist_name, association_file, epsilon=None, keep_full=False):
+    """统计单个科学家的词频（在工作进程中执行，每个文件只读取一次）
     
-    # 加载关联分析数据
+    近似模式（给定 epsilon）下只返回前100个词，整体统计改用草图；
+    keep_full 为 True 时（分片模式需要保存完整的部分词频）仍返回完整计数。
+    """
     words = load_association_data(association_file)
-    
-    # 计算词频
     word_freq = calculate_word_frequency(words)
     
+    if epsilon is None:
+        return scientist_name, word_freq, None
+    
+    sketch = SpaceSavingSketch(epsilon).update_counts(word_freq)
+    if not keep_full:
+        word_freq = Counter(dict(word_freq.most_common(TOP_N)))
+    return scientist_name, word_freq, sketch
+
+def analyze_scientist_frequency(scientist_name, word_freq):
+    """分析单个科学家的词频"""
     # 获取前100个高频词
-    top_words = word_freq.most_common(100)
+    top_words = word_freq.most_common(TOP_N)
     
     # 创建结果列表
     results = []
@@ -40,26 +60,70 @@ def analyze_scientist_frequency(scientist_name, association_file):
             '频次': freq
         })
     
-    return results, word_freq
+    return results
 
-def generate_overall_frequency(association_dir):
-    """生成整体词频统计"""
-    print("正在生成整体词频统计...")
+def count_all_scientists(association_dir, scientist_names=None, max_workers=None, epsilon=None, keep_full=False):
+    """并行统计各科学家的词频，返回 ({科学家: Counter}, 合并后的草图或None)"""
+    tasks = []
+    for filename in sorted(os.listdir(association_dir)):
+        if filename.endswith('_关联分析.json'):
+            scientist_name = filename.replace('_关联分析.json', '')
+            if scientist_names is None or scientist_name in scientist_names:
+                tasks.append((scientist_name, os.path.join(association_dir, filename)))
     
-    all_words = []
+    if not tasks:
+        return {}, None
     
-    # 遍历所有科学家的关联分析数据
-    for filename in os.listdir(association_dir):
-        if filename.endswith('_关联分析.json'):
-            file_path = os.path.join(association_dir, filename)
-            words = load_association_data(file_path)
-            all_words.extend(words)
+    scientist_freqs = {}
+    merged_sketch = SpaceSavingSketch(epsilon) if epsilon is not None else None
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        names, files = zip(*tasks)
+        for scientist_name, word_freq, sketch in executor.map(
+                count_scientist_words, names, files, [epsilon] * len(tasks), [keep_full] * len(tasks)):
+            scientist_freqs[scientist_name] = word_freq
+            if sketch is not None:
+                merged_sketch.merge(sketch)
+    
+    return scientist_freqs, merged_sketch
+
+def merge_word_frequencies(partial_freqs):
+    """合并多份部分词频（可来自不同进程或不同机器上的分片）"""
+    merged = Counter()
+    for word_freq in partial_freqs:
+        merged.update(word_freq)
+    return merged
+
+def generate_approximate_overall_frequency(sketches, epsilon):
+    """由各进程或分片的草图合并生成近似整体词频统计（附误差上界）"""
+    print("正在生成近似整体词频统计...")
+    
+    overall_sketch = SpaceSavingSketch(epsilon)
+    for sketch in sketches:
+        overall_sketch.merge(sketch)
+    
+    # 频次为上界估计，真实频次不低于 频次-误差上界
+    overall_results = []
+    for word, count, error in overall_sketch.most_common(TOP_N):
+        overall_results.append({
+            '词语': word,
+            '频次': count,
+            '误差上界': error
+        })
+    
+    print(f"草图容量: {overall_sketch.capacity}，总词数: {overall_sketch.total}，"
+          f"未列出词的频次上界: {overall_sketch.min_count()}")
+    
+    return overall_results, overall_sketch
+
+def generate_overall_frequency(scientist_freqs):
+    """由各科学家的词频合并生成整体词频统计"""
+    print("正在生成整体词频统计...")
     
-    # 计算整体词频
-    overall_freq = calculate_word_frequency(all_words)
+    # 合并得到整体词频
+    overall_freq = merge_word_frequencies(scientist_freqs[name] for name in sorted(scientist_freqs))
     
     # 获取前100个高频词
-    top_overall = overall_freq.most_common(100)
+    top_overall = overall_freq.most_common(TOP_N)
     
     # 保存整体词频统计
     overall_results = []
@@ -86,53 +150,190 @@ def save_frequency_results(results, output_file):
     
     print(f"结果已保存到 {csv_file} 和 {output_file}")
 
+def save_partial_counts(scientist_freqs, output_file):
+    """保存部分词频（完整计数，供之后合并）"""
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump({name: dict(word_freq) for name, word_freq in scientist_freqs.items()},
+                  f, ensure_ascii=False)
+    
+    print(f"部分词频已保存到 {output_file}")
+
+def save_partial_sketch(sketch, output_file):
+    """保存分片的高频词草图"""
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(sketch.to_dict(), f, ensure_ascii=False)
+    
+    print(f"分片草图已保存到 {output_file}")
+
+def list_partial_files(partial_dir, sketch=False):
+    """列出同一次分片运行的全部部分结果文件（分片_序号_分片数.json 或 _草图.json）
+
+    目录中混有不同分片数的文件（如之前运行留下的 分片_0_2 和 分片_0_3）或缺少分片时报错，
+    避免重复或遗漏计数。
+    """
+    pattern = re.compile(r'分片_(\d+)_(\d+)' + ('_草图' if sketch else '') + r'\.json$')
+    shards = {}
+    for filename in sorted(os.listdir(partial_dir)) if os.path.exists(partial_dir) else []:
+        match = pattern.fullmatch(filename)
+        if match:
+            shards[(int(match.group(1)), int(match.group(2)))] = os.path.join(partial_dir, filename)
+    if not shards:
+        return []
+    
+    shard_counts = sorted({num_shards for _, num_shards in shards})
+    if len(shard_counts) > 1:
+        raise ValueError(f"{partial_dir} 中混有不同分片数的部分结果（{', '.join(map(str, shard_counts))}），"
+                         f"请删除之前运行留下的文件")
+    num_shards = shard_counts[0]
+    missing = [str(index) for index in range(num_shards) if (index, num_shards) not in shards]
+    if missing:
+        raise ValueError(f"{partial_dir} 中缺少分片 {', '.join(missing)}（共 {num_shards} 个分片）")
+    return [shards[(index, num_shards)] for index in range(num_shards)]
+
+def load_partial_sketches(partial_dir):
+    """加载同一次分片运行的全部分片草图"""
+    sketches = []
+    for file_path in list_partial_files(partial_dir, sketch=True):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            sketches.append(SpaceSavingSketch.from_dict(json.load(f)))
+    return sketches
+
+def load_partial_counts(partial_dir):
+    """加载同一次分片运行的全部部分词频文件，返回 {科学家: Counter}"""
+    scientist_freqs = {}
+    for file_path in list_partial_files(partial_dir):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        
+        # 同一科学家出现在多个分片中时计数相加
+        for scientist_name, word_freq in data.items():
+            scientist_freqs.setdefault(scientist_name, Counter()).update(word_freq)
+    return scientist_freqs
+
+def shard_of(scientist_name, num_shards):
+    """按科学家名的md5哈希分片，与机器、进程和文件顺序无关（词频统计和分片处理共用）"""
+    digest = hashlib.md5(scientist_name.encode('utf-8')).hexdigest()
+    return int(digest, 16) % num_shards
+
+def select_shard(association_dir, shard_index, num_shards):
+    """返回属于指定分片的科学家"""
+    return {
+        filename.replace('_关联分析.json', '')
+        for filename in os.listdir(association_dir)
+        if filename.endswith('_关联分析.json')
+        and shard_of(filename.replace('_关联分析.json', ''), num_shards) == shard_index
+    }
+
+def save_scientist_frequencies(scientist_freqs, output_dir, writer):
+    """保存（交给后台写入线程）并打印每个科学家的词频统计，返回所有科学家的前100词列表"""
+    all_scientist_results = []
+    
+    for scientist_name in sorted(scientist_freqs):
+        word_freq = scientist_freqs[scientist_name]
+        results = analyze_scientist_frequency(scientist_name, word_freq)
+        all_scientist_results.extend(results)
+        
+        # 保存单个科学家的词频统计
+        output_file = os.path.join(output_dir, f"{scientist_name}_词频统计.json")
+        writer.submit(save_frequency_results, results, output_file)
+        
+        # 打印前10个高频词
+        print(f"\n{scientist_name} 的前10个高频词:")
+        for i, (word, freq) in enumerate(word_freq.most_common(10)):
+            print(f"  {i+1}. {word}: {freq}")
+        print()
+    
+    return all_scientist_results
+
 def main():
+    parser = argparse.ArgumentParser(description="统计各科学家及整体词频")
+    parser.add_argument('--shard', help="只统计指定分片，格式为 序号/分片数（如 0/4），结果写入部分词频目录")
+    parser.add_argument('--merge', action='store_true', help="合并部分词频目录中的所有分片，生成整体统计")
+    parser.add_argument('--workers', type=int, default=None, help="并行进程数（默认为CPU核数）")
+    parser.add_argument('--approximate', action='store_true', help="整体词频使用内存有界的 Space-Saving 草图近似统计")
+    parser.add_argument('--epsilon', type=float, default=0.001, help="近似模式的相对误差（草图容量为 1/epsilon）")
+    add_tracing_arguments(parser)
+    args = parser.parse_args()
+    setup_tracing(args)
+    
     # 设置目录路径
     association_dir = "output/association_data"
     output_dir = "output/word_frequency"
+    partial_dir = os.path.join(output_dir, "partial_counts")
     
     # 创建输出目录
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
     
-    # 存储所有科学家的词频结果
-    all_scientist_results = []
+    epsilon = args.epsilon if args.approximate else None
     
-    # 分析每个科学家的词频
-    for filename in os.listdir(association_dir):
-        if filename.endswith('_关联分析.json'):
-            scientist_name = filename.replace('_关联分析.json', '')
-            file_path = os.path.join(association_dir, filename)
-            
-            # 分析词频
-            results, word_freq = analyze_scientist_frequency(scientist_name, file_path)
-            all_scientist_results.extend(results)
-            
-            # 保存单个科学家的词频统计
-            output_file = os.path.join(output_dir, f"{scientist_name}_词频统计.json")
-            save_frequency_results(results, output_file)
-            
-            # 打印前10个高频词
-            print(f"\n{scientist_name} 的前10个高频词:")
-            for i, (word, freq) in enumerate(word_freq.most_common(10)):
-                print(f"  {i+1}. {word}: {freq}")
-            print()
+    # 保存文件交给后台线程，与后续的合并计算同时进行
+    writer = BackgroundWriter()
+    
+    if args.merge:
+        # 合并各分片（可在不同机器上生成后拷贝到同一目录）
+        scientist_freqs = load_partial_counts(partial_dir)
+        sketches = load_partial_sketches(partial_dir) if args.approximate else []
+        if not scientist_freqs:
+            print(f"错误: {partial_dir} 中没有部分词频文件，请先用 --shard 统计各分片")
+            sys.exit(1)
+        if args.approximate and not sketches:
+            print(f"错误: {partial_dir} 中没有分片草图，近似合并需要各分片也使用 --approximate 统计")
+            sys.exit(1)
+    else:
+        scientist_names = None
+        if args.shard:
+            shard_index, num_shards = (int(x) for x in args.shard.split('/'))
+            scientist_names = select_shard(association_dir, shard_index, num_shards)
+        
+        print("正在并行统计各科学家的词频...")
+        with span("并行统计词频"):
+            # 分片保存的部分词频必须是完整计数，之后的精确合并和显著词分析才正确
+            scientist_freqs, sketch = count_all_scientists(association_dir, scientist_names, args.workers, epsilon,
+                                                           keep_full=bool(args.shard))
+        count("科学家", len(scientist_freqs))
+        sketches = [sketch] if sketch is not None else []
+        
+        # 分片模式只保存单个科学家结果和部分词频，整体统计在合并时生成
+        if args.shard:
+            if not os.path.exists(partial_dir):
+                os.makedirs(partial_dir)
+            save_scientist_frequencies(scientist_freqs, output_dir, writer)
+            writer.submit(save_partial_counts, scientist_freqs,
+                          os.path.join(partial_dir, f"分片_{shard_index}_{num_shards}.json"))
+            if sketch is not None:
+                writer.submit(save_partial_sketch, sketch,
+                              os.path.join(partial_dir, f"分片_{shard_index}_{num_shards}_草图.json"))
+            writer.close()
+            tracer.save("词频统计")
+            return
+    
+    all_scientist_results = save_scientist_frequencies(scientist_freqs, output_dir, writer)
     
     # 生成整体词频统计
-    overall_results, overall_freq = generate_overall_frequency(association_dir)
+    with span("整体词频统计", 近似=args.approximate):
+        if args.approximate:
+            overall_results, _ = generate_approximate_overall_frequency(sketches, args.epsilon)
+        else:
+            overall_results, _ = generate_overall_frequency(scientist_freqs)
     
     # 保存整体词频统计
     overall_file = os.path.join(output_dir, "整体词频统计.json")
-    save_frequency_results(overall_results, overall_file)
+    writer.submit(save_frequency_results, overall_results, overall_file)
     
     # 保存所有科学家的词频统计
     all_scientists_file = os.path.join(output_dir, "所有科学家词频统计.json")
-    save_frequency_results(all_scientist_results, all_scientists_file)
+    writer.submit(save_frequency_results, all_scientist_results, all_scientists_file)
+    
+    # 等待所有文件写完（后台写入出错时在这里抛出）
+    with span("等待写入完成"):
+        writer.close()
+    tracer.save("词频统计")
     
     # 打印整体前20个高频词
     print("整体前20个高频词:")
-    for i, (word, freq) in enumerate(overall_freq.most_common(20)):
-        print(f"  {i+1}. {word}: {freq}")
+    for i, row in enumerate(overall_results[:20]):
+        print(f"  {i+1}. {row['词语']}: {row['频次']}")
     
     print(f"\n词频统计完成! 结果保存在 {output_dir} 目录中。")
 
@@ -4,11 +4,8 @@ echo 开始女科学家传记数据清理项目...
 echo 正在安装依赖包...
 pip install -r requirements.txt -i https://pypi.tuna.tsinghua.edu.cn/simple
 
-echo 正在运行数据清理管道...
-python advanced_data_cleaning.py
-
-echo 正在生成总结报告...
-python generate_report.py
+echo 正在运行分析流水线（输出已是最新的阶段会跳过）...
+python 运行流水线.py
 
 echo 项目执行完成！
 echo.
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import glob
+import time
+import argparse
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from 性能追踪 import tracer, span, add_tracing_arguments, setup_tracing, TRACE_ENV
+from 渲染配置 import RENDER_PROFILES, RENDER_PROFILE_ENV, get_profile
+
+# 脚本所在目录（各阶段脚本与本文件放在一起）
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 各阶段的运行日志
+LOG_DIR = "output/logs"
+
+# 流水线阶段：每个阶段声明依赖的阶段、读取的输入和产生的输出
+# 输入/输出可以是文件、目录或通配符；输出都存在且比输入和脚本本身新时跳过该阶段
+# render 为 True 的绘图阶段还要求上次运行使用的渲染配置与本次相同
+STAGES = [
+    {
+        'name': '数据清理',
+        'script': '高级数据清理.py',
+        'deps': [],
+        'inputs': ['*.docx'],
+        'outputs': ['output/sentiment_data', 'output/association_data', 'output/cleaned_data',
+                    'output/sentence_index', 'output/manifest/cleaning.json']
+    },
+    {
+        'name': '情感分析',
+        'script': '情感分析.py',
+        'deps': ['数据清理'],
+        'inputs': ['output/sentiment_data'],
+        'outputs': ['output/sentiment_analysis/*_情感分析统计.json', 'output/negative_sentences.db',
+                    'output/manifest/sentiment.json']
+    },
+    {
+        'name': 'SnowNLP情感分析',
+        'script': '使用SnowNLP情感分析.py',
+        'deps': ['数据清理'],
+        'inputs': ['output/sentiment_data'],
+        'outputs': ['output/sentiment_analysis_snownlp']
+    },
+    {
+        'name': 'TF-IDF分析',
+        'script': 'TFIDF分析.py',
+        'deps': ['数据清理'],
+        'inputs': ['output/cleaned_data'],
+        'outputs': ['output/tfidf_analysis']
+    },
+    {
+        'name': '词频统计',
+        'script': '词频统计.py',
+        'deps': ['数据清理'],
+        'inputs': ['output/association_data'],
+        'outputs': ['output/word_frequency/*词频统计.csv']
+    },
+    {
+        'name': '关键词显著性',
+        'script': '关键词显著性.py',
+        'deps': ['数据清理'],
+        'inputs': ['output/association_data'],
+        'outputs': ['output/word_frequency/*关键词统计.csv']
+    },
+    {
+        'name': '共现分析',
+        'script': '共现分析.py',
+        'deps': ['数据清理'],
+        'inputs': ['output/association_data', 'output/sentence_index'],
+        'outputs': ['output/cooccurrence']
+    },
+    {
+        'name': '关联规则挖掘',
+        'script': '关联规则挖掘.py',
+        'deps': ['数据清理'],
+        'inputs': ['output/sentiment_data'],
+        'outputs': ['output/association_rules']
+    },
+    {
+        'name': '汇总情感分析',
+        'script': '汇总情感分析.py',
+        'deps': ['情感分析'],
+        'inputs': ['output/sentiment_analysis/*_情感分析统计.csv', 'output/manifest/sentiment.json'],
+        'outputs': ['output/sentiment_analysis/所有科学家情感分析汇总.csv']
+    },
+    {
+        'name': '提取消极情感句子',
+        'script': '提取消极情感句子.py',
+        'deps': ['情感分析'],
+        'inputs': ['output/negative_sentences.db'],
+        'outputs': ['output/negative_sentences']
+    },
+    {
+        'name': '消极句子文本文件',
+        'script': '生成消极句子文本文件.py',
+        'deps': ['情感分析'],
+        'inputs': ['output/negative_sentences.db'],
+        'outputs': ['output/negative_sentences_text']
+    },
+    {
+        'name': '消极情感句子报告',
+        'script': '生成消极情感句子报告.py',
+        'deps': ['情感分析'],
+        'inputs': ['output/negative_sentences.db'],
+        'outputs': ['output/消极情感句子分析报告.txt']
+    },
+    {
+        'name': '情感分析可视化',
+        'script': '生成情感分析可视化图表.py',
+        'deps': ['情感分析', 'SnowNLP情感分析'],
+        'inputs': ['output/sentiment_analysis/*_情感分析统计.json',
+                   'output/sentiment_analysis_snownlp/*_SnowNLP情感分析统计.json'],
+        'outputs': ['output/sentiment_visualizations/情感分析方法对比柱状图.png',
+                    'output/sentiment_visualizations/情感分析热力图.png'],
+        'render': True
+    },
+    {
+        'name': '综合情感分析饼图',
+        'script': '生成综合情感分析饼图.py',
+        'deps': ['汇总情感分析', 'SnowNLP情感分析'],
+        'inputs': ['output/sentiment_analysis/所有科学家情感分析汇总.csv',
+                   'output/sentiment_analysis_snownlp/所有科学家SnowNLP情感分析汇总.csv'],
+        'outputs': ['output/sentiment_visualizations/综合情感分析饼图.png'],
+        'render': True
+    },
+    {
+        'name': '词云图',
+        'script': '生成词云图.py',
+        'deps': ['TF-IDF分析', '词频统计'],
+        'inputs': ['output/tfidf_analysis/*_TFIDF词汇.json', 'output/word_frequency/*_词频统计.json'],
+        'outputs': ['output/tfidf_word_clouds', 'output/word_clouds'],
+        'render': True
+    },
+    {
+        'name': '近似最近邻索引',
+        'script': '近似最近邻索引.py',
+        'deps': ['TF-IDF分析'],
+        'inputs': ['output/cleaned_data', 'output/sentiment_data', 'output/tfidf_analysis'],
+        'outputs': ['output/ann_index']
+    },
+    {
+        'name': '详细关系图谱',
+        'script': '生成详细科学家关系图谱.py',
+        'deps': ['数据清理'],
+        'inputs': ['output/association_data'],
+        'outputs': ['output/detailed_person_graphs'],
+        'render': True
+    },
+    {
+        'name': '简化人物关系图谱',
+        'script': '简化人物关系图谱.py',
+        'deps': [],
+        'inputs': [],
+        'outputs': ['output/simplified_person_graph'],
+        'render': True
+    },
+    {
+        'name': '各科学家简化关系图谱',
+        'script': '生成各个科学家简化关系图谱.py',
+        'deps': [],
+        'inputs': [],
+        'outputs': ['output/individual_simplified_graphs'],
+        'render': True
+    },
+    {
+        'name': '总结报告',
+        'script': '生成报告.py',
+        'deps': ['数据清理', '情感分析'],
+        'inputs': ['output/manifest'],
+        'outputs': ['数据清理总结报告.md']
+    },
+]
+
+
+def expand_paths(patterns):
+    """把文件、目录和通配符展开为文件列表（目录递归展开）"""
+    files = []
+    for pattern in patterns:
+        for path in glob.glob(pattern):
+            if os.path.isdir(path):
+                for root, dirs, names in os.walk(path):
+                    files.extend(os.path.join(root, name) for name in names)
+            else:
+                files.append(path)
+    return files
+
+
+def newest_mtime(patterns):
+    """输入中最新文件的修改时间，没有文件时为 0"""
+    return max((os.path.getmtime(f) for f in expand_paths(patterns)), default=0)
+
+
+def profile_stamp_file(stage):
+    """绘图阶段上次成功运行时使用的渲染配置记录"""
+    return os.path.join(LOG_DIR, f"{stage['name']}.profile")
+
+
+def last_profile(stage):
+    """绘图阶段上次使用的渲染配置，没有记录时为 None"""
+    try:
+        with open(profile_stamp_file(stage), 'r', encoding='utf-8') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def is_up_to_date(stage):
+    """所有输出都存在，且每个输出都比输入和脚本本身新；绘图阶段还要求渲染配置没变"""
+    if stage.get('render') and last_profile(stage) != get_profile():
+        return False
+    input_time = newest_mtime(stage['inputs'] + [os.path.join(SCRIPT_DIR, stage['script'])])
+    for pattern in stage['outputs']:
+        files = expand_paths([pattern])
+        if not files:
+            return False
+        if max(os.path.getmtime(f) for f in files) < input_time:
+            return False
+    return True
+
+
+def check_stages(stages):
+    """检查依赖的阶段都存在且没有环"""
+    names = {stage['name'] for stage in stages}
+    for stage in stages:
+        for dep in stage['deps']:
+            if dep not in names:
+                raise ValueError(f"阶段 {stage['name']} 依赖未知阶段 {dep}")
+
+    # 按依赖关系逐层取出阶段，取不完说明有环
+    remaining = {stage['name']: set(stage['deps']) for stage in stages}
+    while remaining:
+        ready = [name for name, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"阶段依赖存在环: {', '.join(remaining)}")
+        for name in ready:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+
+def select_stages(stages, targets):
+    """只保留目标阶段及其所有上游阶段"""
+    if not targets:
+        return stages
+    by_name = {stage['name']: stage for stage in stages}
+    selected = set()
+    pending = list(targets)
+    while pending:
+        name = pending.pop()
+        if name not in by_name:
+            raise ValueError(f"未知阶段: {name}")
+        if name not in selected:
+            selected.add(name)
+            pending.extend(by_name[name]['deps'])
+    return [stage for stage in stages if stage['name'] in selected]
+
+
+def run_stage(stage, trace_options=''):
+    """在子进程中运行一个阶段的脚本，输出写入日志文件，返回 (退出码, 耗时)
+
+    trace_options 不为空时通过环境变量让子进程开启性能追踪。
+    """
+    log_file = os.path.join(LOG_DIR, f"{stage['name']}.log")
+    env = dict(os.environ, PYTHONIOENCODING='utf-8', MPLBACKEND='Agg')
+    if trace_options:
+        env[TRACE_ENV] = trace_options
+    start = time.time()
+    with span(stage['name'], 脚本=stage['script']), open(log_file, 'w', encoding='utf-8') as log:
+        process = subprocess.run(
+            [sys.executable, os.path.join(SCRIPT_DIR, stage['script'])],
+            stdout=log, stderr=subprocess.STDOUT, env=env
+        )
+    return process.returncode, time.time() - start
+
+
+def run_pipeline(stages, jobs, force=False, dry_run=False, trace_options=''):
+    """按依赖顺序运行各阶段，互不依赖的阶段并行运行
+
+    上游阶段在本次重新运行时，下游阶段也会重新运行；
+    某个阶段失败时，依赖它的阶段不再运行，其他阶段继续。
+    """
+    check_stages(stages)
+    if not os.path.exists(LOG_DIR):
+        os.makedirs(LOG_DIR)
+
+    names = {stage['name'] for stage in stages}
+    by_name = {stage['name']: stage for stage in stages}
+    waiting = {stage['name']: stage for stage in stages}
+    status = {}
+    rerun = set()
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        while waiting or running:
+            # 找出依赖都已完成的阶段
+            for name, stage in list(waiting.items()):
+                deps = [dep for dep in stage['deps'] if dep in names]
+                if any(status.get(dep) in ('失败', '未运行') for dep in deps):
+                    status[name] = '未运行'
+                    del waiting[name]
+                    print(f"[未运行] {name}（上游阶段失败）")
+                    continue
+                if not all(dep in status for dep in deps):
+                    continue
+
+                del waiting[name]
+                if not force and not any(dep in rerun for dep in deps) and is_up_to_date(stage):
+                    status[name] = '跳过'
+                    print(f"[跳过] {name}（输出已是最新）")
+                    continue
+
+                rerun.add(name)
+                if dry_run:
+                    status[name] = '待运行'
+                    print(f"[待运行] {name}")
+                    continue
+
+                print(f"[开始] {name}")
+                running[executor.submit(run_stage, stage, trace_options)] = name
+
+            if not running:
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                returncode, elapsed = future.result()
+                if returncode == 0:
+                    status[name] = '完成'
+                    if by_name[name].get('render'):
+                        with open(profile_stamp_file(by_name[name]), 'w', encoding='utf-8') as f:
+                            f.write(get_profile())
+                    print(f"[完成] {name}，耗时 {elapsed:.1f} 秒")
+                else:
+                    status[name] = '失败'
+                    print(f"[失败] {name}，退出码 {returncode}，详见 {os.path.join(LOG_DIR, name + '.log')}")
+
+    return status
+
+
+def main():
+    parser = argparse.ArgumentParser(description="按依赖关系运行全部分析脚本，跳过输出已是最新的阶段")
+    parser.add_argument('stages', nargs='*', help="只运行这些阶段（及其上游阶段），默认运行全部")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help="同时运行的阶段数")
+    parser.add_argument('--force', action='store_true', help="忽略修改时间，全部重新运行")
+    parser.add_argument('--dry-run', action='store_true', help="只列出需要运行的阶段")
+    parser.add_argument('--list', action='store_true', help="列出所有阶段")
+    parser.add_argument('--render-profile', choices=list(RENDER_PROFILES), help="各绘图阶段使用的渲染配置（draft / publication / svg）")
+    add_tracing_arguments(parser)
+    args = parser.parse_args()
+    setup_tracing(args)
+
+    if args.list:
+        for stage in STAGES:
+            deps = '、'.join(stage['deps']) or '无'
+            print(f"{stage['name']:<12} {stage['script']:<24} 依赖: {deps}")
+        return
+
+    # 各阶段子进程通过环境变量继承渲染配置
+    if args.render_profile:
+        os.environ[RENDER_PROFILE_ENV] = args.render_profile
+    
+    # 各阶段子进程使用与本进程相同的追踪选项
+    trace_options = ','.join(name for name, enabled in [
+        ('trace', tracer.enabled), ('profile', args.profile), ('memory', args.trace_memory)] if enabled)
+    
+    start = time.time()
+    status = run_pipeline(select_stages(STAGES, args.stages), args.jobs, args.force, args.dry_run, trace_options)
+    tracer.save("流水线")
+
+    counts = {}
+    for value in status.values():
+        counts[value] = counts.get(value, 0) + 1
+    summary = '，'.join(f"{key} {value} 个" for key, value in counts.items())
+    print(f"\n流水线结束，总耗时 {time.time() - start:.1f} 秒: {summary}")
+
+    if '失败' in counts or '未运行' in counts:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import time
+import argparse
+import numpy as np
+from scipy import sparse
+
+from TFIDF分析 import (prepare_documents, calculate_tfidf, load_document_embeddings, load_svd_components,
+                       project_to_embeddings)
+
+
+class RandomHyperplaneLSHIndex:
+    """基于随机超平面的局部敏感哈希索引（余弦相似度）"""
+
+    def __init__(self, num_tables=16, num_bits=10, num_probes=4, seed=42):
+        # 哈希表数量、每个表的哈希位数、每个表额外探测的桶数
+        self.num_tables = num_tables
+        self.num_bits = num_bits
+        self.num_probes = num_probes
+        self.seed = seed
+
+        self.ids = []
+        self.row_of = {}
+        self.vectors = None
+        self.hyperplanes = None
+        # 所有表按哈希值排序后的 (哈希值, 行号) 数组，查询时用二分查找定位桶
+        self.sorted_keys = None
+        self.sorted_rows = None
+
+    def build(self, vectors, ids):
+        """构建索引（vectors 可以是稀疏TF-IDF矩阵或稠密降维向量）"""
+        if vectors.shape[0] != len(ids):
+            raise ValueError(f"向量数量 {vectors.shape[0]} 与编号数量 {len(ids)} 不一致")
+
+        self.ids = list(ids)
+        self.row_of = {item_id: row for row, item_id in enumerate(self.ids)}
+        self.vectors = normalize_rows(vectors)
+
+        # 为所有表一次性生成随机超平面
+        rng = np.random.default_rng(self.seed)
+        dim = self.vectors.shape[1]
+        self.hyperplanes = rng.standard_normal((dim, self.num_tables * self.num_bits)).astype(np.float32)
+
+        # 计算所有向量的哈希值；不同表的哈希值加上表偏移后合并为一个有序数组
+        keys, _ = self._hash(self.vectors)
+        global_keys = (keys + self._table_offsets()).ravel()
+        order = np.argsort(global_keys, kind='stable')
+        self.sorted_keys = global_keys[order]
+        self.sorted_rows = (order // self.num_tables).astype(np.int64)
+
+        return self
+
+    def _table_offsets(self):
+        """每个表的哈希值偏移量，保证不同表的桶互不重叠"""
+        return np.arange(self.num_tables, dtype=np.int64) << self.num_bits
+
+    def _hash(self, vectors):
+        """计算哈希值，同时返回投影值（用于多探测）"""
+        projections = vectors @ self.hyperplanes
+        projections = np.asarray(projections, dtype=np.float32).reshape(
+            -1, self.num_tables, self.num_bits
+        )
+        bits = (projections > 0).astype(np.int64)
+        weights = np.left_shift(1, np.arange(self.num_bits, dtype=np.int64))
+        keys = (bits * weights).sum(axis=2)
+        return keys, projections
+
+    def _candidate_rows(self, query_vector):
+        """收集所有表中命中桶及探测桶内的候选行号"""
+        keys, projections = self._hash(query_vector)
+        keys = keys[0]
+        margins = np.abs(projections[0])
+
+        # 主桶 + 翻转投影最接近0的若干位得到的相邻桶
+        flip_bits = np.argsort(margins, axis=1)[:, :self.num_probes]
+        flipped = keys[:, None] ^ np.left_shift(1, flip_bits)
+        probe_keys = np.concatenate([keys[:, None], flipped], axis=1)
+        probe_keys = (probe_keys + self._table_offsets()[:, None]).ravel()
+
+        # 一次二分查找定位所有桶，再把各桶区间展开成行号
+        lefts = np.searchsorted(self.sorted_keys, probe_keys, side='left')
+        rights = np.searchsorted(self.sorted_keys, probe_keys, side='right')
+        lengths = rights - lefts
+        total = int(lengths.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.int64)
+
+        starts = np.repeat(lefts - np.cumsum(lengths) + lengths, lengths)
+        positions = starts + np.arange(total)
+        return np.unique(self.sorted_rows[positions])
+
+    def query(self, vector, k=10, exclude_rows=None):
+        """查询与给定向量最相似的 k 个条目，返回 [(编号, 相似度), ...]"""
+        query_vector = normalize_rows(vector.reshape(1, -1) if isinstance(vector, np.ndarray) else vector)
+        rows = self._candidate_rows(query_vector)
+        if exclude_rows is not None:
+            rows = np.setdiff1d(rows, np.asarray(exclude_rows))
+        if rows.size == 0:
+            return []
+
+        # 只对候选集做精确的余弦相似度重排
+        scores = self.vectors[rows] @ query_vector.T
+        scores = np.asarray(scores.todense() if sparse.issparse(scores) else scores).ravel()
+
+        top = np.argsort(-scores, kind='stable')[:k]
+        return [(self.ids[rows[i]], float(scores[i])) for i in top]
+
+    def query_by_id(self, item_id, k=10):
+        """查询与索引中某个条目最相似的 k 个其他条目"""
+        row = self.row_of[item_id]
+        return self.query(self.vectors[row], k=k, exclude_rows=[row])
+
+    def save(self, index_dir):
+        """保存索引到目录"""
+        if not os.path.exists(index_dir):
+            os.makedirs(index_dir)
+
+        np.savez_compressed(
+            os.path.join(index_dir, "lsh_index.npz"),
+            hyperplanes=self.hyperplanes,
+            sorted_keys=self.sorted_keys,
+            sorted_rows=self.sorted_rows,
+            config=np.array([self.num_tables, self.num_bits, self.num_probes, self.seed])
+        )
+
+        if sparse.issparse(self.vectors):
+            sparse.save_npz(os.path.join(index_dir, "vectors_sparse.npz"), self.vectors)
+        else:
+            np.save(os.path.join(index_dir, "vectors_dense.npy"), self.vectors)
+
+        with open(os.path.join(index_dir, "ids.json"), 'w', encoding='utf-8') as f:
+            json.dump(self.ids, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, index_dir):
+        """从目录加载索引"""
+        data = np.load(os.path.join(index_dir, "lsh_index.npz"))
+        num_tables, num_bits, num_probes, seed = (int(x) for x in data['config'])
+
+        index = cls(num_tables=num_tables, num_bits=num_bits, num_probes=num_probes, seed=seed)
+        index.hyperplanes = data['hyperplanes']
+        index.sorted_keys = data['sorted_keys']
+        index.sorted_rows = data['sorted_rows']
+
+        sparse_file = os.path.join(index_dir, "vectors_sparse.npz")
+        if os.path.exists(sparse_file):
+            index.vectors = sparse.load_npz(sparse_file).tocsr()
+        else:
+            index.vectors = np.load(os.path.join(index_dir, "vectors_dense.npy"))
+
+        with open(os.path.join(index_dir, "ids.json"), 'r', encoding='utf-8') as f:
+            # JSON会把元组编号还原为列表，这里统一转回元组以便按编号查询
+            index.ids = [tuple(i) if isinstance(i, list) else i for i in json.load(f)]
+        index.row_of = {item_id: row for row, item_id in enumerate(index.ids)}
+
+        return index
+
+
+def normalize_rows(vectors):
+    """对向量按行做L2归一化"""
+    if sparse.issparse(vectors):
+        vectors = sparse.csr_matrix(vectors, dtype=np.float32)
+        norms = np.sqrt(np.asarray(vectors.multiply(vectors).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sparse.diags(1.0 / norms).dot(vectors).tocsr()
+
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def brute_force_query(vectors, query_row, k=10):
+    """暴力扫描全部向量，返回最相似的 k 个行号（排除自身）"""
+    scores = vectors @ vectors[query_row].T
+    scores = np.asarray(scores.todense() if sparse.issparse(scores) else scores).ravel()
+    scores[query_row] = -np.inf
+    return np.argsort(-scores, kind='stable')[:k]
+
+
+def benchmark_recall(index, num_queries=100, k=10, seed=0):
+    """对比LSH索引与暴力扫描的召回率和查询耗时"""
+    rng = np.random.default_rng(seed)
+    num_items = len(index.ids)
+    query_rows = rng.choice(num_items, size=min(num_queries, num_items), replace=False)
+
+    recalls = []
+    ann_time = 0.0
+    brute_time = 0.0
+
+    for row in query_rows:
+        start = time.perf_counter()
+        exact_rows = brute_force_query(index.vectors, row, k=k)
+        brute_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        approx = index.query(index.vectors[row], k=k, exclude_rows=[row])
+        ann_time += time.perf_counter() - start
+
+        exact_ids = {index.ids[r] for r in exact_rows}
+        approx_ids = {item_id for item_id, _ in approx}
+        recalls.append(len(exact_ids & approx_ids) / max(1, len(exact_ids)))
+
+    return {
+        '查询数': len(query_rows),
+        'k': k,
+        '平均召回率': round(float(np.mean(recalls)), 4),
+        '暴力扫描平均耗时(毫秒)': round(brute_time / len(query_rows) * 1000, 3),
+        'LSH平均耗时(毫秒)': round(ann_time / len(query_rows) * 1000, 3)
+    }
+
+
+def load_sentences(sentiment_dir):
+    """加载所有科学家的句子，返回句子列表和 (科学家, 句子编号) 编号列表"""
+    sentences = []
+    ids = []
+    for filename in sorted(os.listdir(sentiment_dir)):
+        if filename.endswith('_情感分析.json'):
+            scientist_name = filename.replace('_情感分析.json', '')
+            with open(os.path.join(sentiment_dir, filename), 'r', encoding='utf-8') as f:
+                scientist_sentences = json.load(f)
+            for i, sentence in enumerate(scientist_sentences):
+                sentences.append(sentence)
+                ids.append((scientist_name, i + 1))
+    return sentences, ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description="构建传记和句子的近似最近邻索引")
+    parser.add_argument('--embeddings', action='store_true',
+                        help="使用 TFIDF分析.py 拟合的截断SVD嵌入代替稀疏TF-IDF向量（维度由其 --dims 决定）")
+    args = parser.parse_args()
+    
+    # 设置目录路径
+    cleaned_dir = "output/cleaned_data"
+    sentiment_dir = "output/sentiment_data"
+    tfidf_dir = "output/tfidf_analysis"
+    output_dir = "output/ann_index"
+
+    # 计算TF-IDF向量
+    documents, scientist_names = prepare_documents(cleaned_dir)
+    tfidf_matrix, feature_names, vectorizer = calculate_tfidf(documents, scientist_names)
+
+    # 传记级索引
+    print("正在构建传记相似度索引...")
+    biography_vectors = tfidf_matrix
+    if args.embeddings:
+        # 复用TF-IDF阶段保存的文档嵌入，按科学家名称对齐行顺序
+        embeddings, embedding_names = load_document_embeddings(tfidf_dir)
+        row_of = {name: row for row, name in enumerate(embedding_names)}
+        biography_vectors = embeddings[[row_of[name] for name in scientist_names]]
+    biography_index = RandomHyperplaneLSHIndex(num_tables=4, num_bits=4, num_probes=2)
+    biography_index.build(biography_vectors, scientist_names)
+    biography_index.save(os.path.join(output_dir, "biographies"))
+
+    for scientist_name in scientist_names[:3]:
+        print(f"\n与 {scientist_name} 最相似的传记:")
+        for similar_name, score in biography_index.query_by_id(scientist_name, k=3):
+            print(f"  {similar_name}: {score:.4f}")
+
+    # 句子级索引（复用同一个TF-IDF向量空间）
+    print("\n正在构建句子相似度索引...")
+    sentences, sentence_ids = load_sentences(sentiment_dir)
+    sentence_vectors = vectorizer.transform(sentences)
+    if args.embeddings:
+        # 句子用传记拟合的同一个SVD投影，与传记嵌入处于同一空间
+        sentence_vectors = project_to_embeddings(sentence_vectors, load_svd_components(tfidf_dir, feature_names))
+    sentence_index = RandomHyperplaneLSHIndex(num_tables=16, num_bits=10, num_probes=4)
+    sentence_index.build(sentence_vectors, sentence_ids)
+    sentence_index.save(os.path.join(output_dir, "sentences"))
+
+    # 召回率基准测试
+    print("\n句子索引召回率基准测试（对比暴力扫描）:")
+    report = benchmark_recall(sentence_index, num_queries=200, k=10)
+    for key, value in report.items():
+        print(f"  {key}: {value}")
+
+    with open(os.path.join(output_dir, "召回率基准测试.json"), 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"\n近似最近邻索引构建完成! 结果保存在 {output_dir} 目录中。")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import math
+import heapq
+from collections import Counter
+
+
+class SpaceSavingSketch:
+    """Space-Saving 高频词草图（内存有界，可合并）
+
+    每个被跟踪的词保存 计数 和 误差：真实频次位于 [计数-误差, 计数] 之间；
+    未被跟踪的词真实频次不超过 min_count()。
+    """
+
+    def __init__(self, epsilon=0.001, capacity=None):
+        # 单条数据流时误差不超过 epsilon * 总词数
+        self.capacity = capacity if capacity else math.ceil(1 / epsilon)
+        self.counts = {}
+        self.errors = {}
+        self.total = 0
+
+    def min_count(self):
+        """草图已满时返回最小计数（未跟踪词频次的上界），否则为0"""
+        if len(self.counts) < self.capacity:
+            return 0
+        return min(self.counts.values())
+
+    def update(self, words, chunk_size=100000):
+        """按块处理词语流，每块先精确计数再并入草图"""
+        chunk = []
+        for word in words:
+            chunk.append(word)
+            if len(chunk) >= chunk_size:
+                self.update_counts(Counter(chunk))
+                chunk = []
+        if chunk:
+            self.update_counts(Counter(chunk))
+        return self
+
+    def update_counts(self, word_freq):
+        """并入一份精确词频（例如单个科学家的 Counter）"""
+        # 容量为无穷大：精确的一侧永远不满，min_count() 为0，未出现的词不会被加上虚假的计数
+        exact = SpaceSavingSketch(capacity=math.inf)
+        exact.counts = dict(word_freq)
+        exact.errors = dict.fromkeys(word_freq, 0)
+        exact.total = sum(word_freq.values())
+        return self.merge(exact)
+
+    def merge(self, other):
+        """合并另一份草图（来自其他进程或分片），结果仍保持误差保证"""
+        min_self = self.min_count()
+        min_other = other.min_count()
+
+        # 某一侧未跟踪的词，其频次最多为该侧的最小计数
+        counts = {}
+        errors = {}
+        for word in self.counts.keys() | other.counts.keys():
+            counts[word] = self.counts.get(word, min_self) + other.counts.get(word, min_other)
+            errors[word] = self.errors.get(word, min_self) + other.errors.get(word, min_other)
+
+        # 只保留计数最大的 capacity 个词
+        if len(counts) > self.capacity:
+            kept = heapq.nlargest(self.capacity, counts.items(), key=lambda item: item[1])
+            counts = dict(kept)
+            errors = {word: errors[word] for word in counts}
+
+        self.counts = counts
+        self.errors = errors
+        self.total += other.total
+        return self
+
+    def most_common(self, n=None):
+        """返回 [(词语, 计数, 误差上界), ...]，按计数降序"""
+        items = sorted(self.counts.items(), key=lambda item: (-item[1], item[0]))
+        if n is not None:
+            items = items[:n]
+        return [(word, count, self.errors[word]) for word, count in items]
+
+    def to_dict(self):
+        """转换为可保存为JSON的字典"""
+        return {
+            '容量': self.capacity,
+            '总词数': self.total,
+            '计数': self.counts,
+            '误差': self.errors
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """从字典恢复草图"""
+        sketch = cls(capacity=data['容量'])
+        sketch.total = data['总词数']
+        sketch.counts = dict(data['计数'])
+        sketch.errors = dict(data['误差'])
+        return sketch
+
+
+def check_exact_under_capacity(chunks, capacity=1000):
+    """自检：词数未超过容量时，分块并入草图的结果应与精确计数完全一致、误差均为0"""
+    sketch = SpaceSavingSketch(capacity=capacity)
+    exact = Counter()
+    for chunk in chunks:
+        sketch.update_counts(Counter(chunk))
+        exact.update(chunk)
+    assert len(exact) <= capacity, "自检数据的词数超过了草图容量"
+    assert sketch.counts == dict(exact), f"草图计数与精确计数不一致: {sketch.counts} != {dict(exact)}"
+    assert not any(sketch.errors.values()), f"未满的草图不应有误差: {sketch.errors}"
+    assert sketch.total == sum(exact.values())
+
+
+if __name__ == "__main__":
+    check_exact_under_capacity([['a'] * 5 + ['c'] * 2, ['b'] * 3])
+    check_exact_under_capacity([list("一二三四五六七八九十"[:i]) for i in range(1, 11)], capacity=10)
+    words = [f"词{i % 37}" for i in range(5000)]
+    check_exact_under_capacity([words[i:i + 300] for i in range(0, len(words), 300)])
+    print("频率草图自检通过")
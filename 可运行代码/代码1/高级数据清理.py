@@ -3,10 +3,15 @@
 
 import os
 import re
+import argparse
 import jieba
 import pandas as pd
 from docx import Document
 import json
+from 倒排索引检索 import SentenceIndexBuilder
+from 流水线清单 import record_stage
+from 检查点 import UnitCheckpoint
+from 性能追踪 import tracer, span, count, add_tracing_arguments, setup_tracing
 
 class AdvancedDataCleaningPipeline:
     def __init__(self):
@@ -211,8 +216,42 @@ class AdvancedDataCleaningPipeline:
             with open(cleaned_file, 'w', encoding='utf-8') as f:
                 f.write(data['cleaned_text'])
         
+        # 记录各科学家的计数，报告直接从清单生成
+        record_stage("cleaning", {
+            scientist: {
+                '情感句子数': len(data['sentiment_data']),
+                '关联词汇数': len(data['association_data']),
+                '清洗后字符数': len(data['cleaned_text'])
+            }
+            for scientist, data in results.items()
+        }, os.path.join(output_dir, "manifest"))
+        
         print(f"Results saved to {output_dir} directory")
     
+    def tokenize_sentence_for_index(self, sentence):
+        """为句子检索索引分词（保留领域词，做实体对齐）"""
+        words = self.tokenize_chinese(sentence)
+        filtered_words = self.remove_stopwords(words, for_sentiment=True)
+        return self.entity_resolution(filtered_words)
+    
+    def build_sentence_index(self, results, output_dir="output"):
+        """构建句子级倒排索引"""
+        builder = SentenceIndexBuilder()
+        
+        # 科学家按名称排序，保证索引内容与目录遍历顺序无关
+        for scientist in sorted(results):
+            tokenized_sentences = [
+                self.tokenize_sentence_for_index(sentence)
+                for sentence in results[scientist]['sentiment_data']
+            ]
+            builder.add_scientist(scientist, tokenized_sentences)
+        
+        index = builder.build()
+        index_dir = os.path.join(output_dir, "sentence_index")
+        index.save(index_dir)
+        
+        print(f"Sentence index saved to {index_dir} directory")
+    
     def process_single_document(self, file_path):
         """处理单个文档"""
         print(f"Processing {file_path}...")
@@ -239,30 +278,59 @@ class AdvancedDataCleaningPipeline:
             'cleaned_text': normalized_text
         }
     
-    def process_all_documents(self, folder_path):
-        """处理所有文档"""
+    def process_all_documents(self, folder_path, checkpoint=None):
+        """处理所有文档（传入检查点时，已处理的文档直接读取结果）"""
         results = {}
         
         for filename in os.listdir(folder_path):
             if filename.endswith('.docx'):
                 file_path = os.path.join(folder_path, filename)
-                result = self.process_single_document(file_path)
+                with span("清洗文档", 文档=filename):
+                    result = checkpoint.load(filename) if checkpoint is not None else None
+                    if result is None:
+                        result = self.process_single_document(file_path)
+                        if checkpoint is not None and result is not None:
+                            checkpoint.save(filename, result)
                 
                 if result is not None:
                     scientist_name = filename.replace('.docx', '')
                     results[scientist_name] = result
+                    count("文档")
+                    count("句子", len(result['sentiment_data']))
+                    count("关联词汇", len(result['association_data']))
         
         return results
 
 def main():
+    parser = argparse.ArgumentParser(description="高级数据清理")
+    parser.add_argument('--resume', action='store_true', help="从上次中断处继续，跳过已处理的文档")
+    add_tracing_arguments(parser)
+    args = parser.parse_args()
+    setup_tracing(args)
+    
     pipeline = AdvancedDataCleaningPipeline()
     
+    # 每处理完一个文档保存一次检查点
+    checkpoint = UnitCheckpoint("cleaning")
+    if not args.resume:
+        checkpoint.reset()
+    
     # 处理所有文档
     folder_path = "."
-    results = pipeline.process_all_documents(folder_path)
+    with span("处理文档"):
+        results = pipeline.process_all_documents(folder_path, checkpoint)
     
     # 保存结果
-    pipeline.save_results(results)
+    with span("保存结果"):
+        pipeline.save_results(results)
+    
+    # 构建句子检索索引
+    with span("构建句子索引"):
+        pipeline.build_sentence_index(results)
+    
+    # 全部完成后删除检查点
+    checkpoint.clear()
+    tracer.save("数据清理")
     
     # 输出结果示例
     for scientist, data in list(results.items())[:3]:  # 只显示前3个科学家的结果
@@ -1,5 +1,7 @@
 import networkx as nx
 import matplotlib.pyplot as plt
+from render_profiles import save_figure, get_profile
+from layout_cache import cached_spring_layout
 
 # 1. 配置 Windows 中文字体（确保中文显示）
 try:
@@ -71,7 +73,7 @@ for node in G.nodes():
 plt.figure(figsize=(14, 10))
 
 # 弹簧布局
-pos = nx.spring_layout(G, k=5.0, iterations=200, seed=42)
+pos = cached_spring_layout(G, 'Link', cache_dir='layout_cache', k=5.0, iterations=200, seed=42)  # 图结构不变时复用上次布局
 
 # 绘制节点
 nx.draw_networkx_nodes(G, pos, node_size=6000, node_color=node_colors, alpha=0.9, edgecolors='black', linewidths=2)
@@ -97,13 +99,13 @@ plt.title('何泽慧核心关系网络图谱', fontsize=16, pad=25)
 # 保存图谱
 plt.axis('off')
 plt.tight_layout()
-plt.savefig(
+output_file = save_figure(
     '何泽慧关系图谱_终极兼容完美版.png',
-    dpi=300,
+    get_profile(),  # 环境变量 RENDER_PROFILE=draft 时快速预览
     bbox_inches='tight'
 )
 plt.close()
 
-print("🎉 图谱生成成功！文件：何泽慧关系图谱_终极兼容完美版.png")
+print(f"🎉 图谱生成成功！文件：{output_file}")
 print(f"📊 包含 {len(all_nodes)} 人，{len(edges)} 条关系")
 print("✅ 中文正常 | ✅ 无参数错误 | ✅ 兼容 nx 1.x+ & matplotlib 2.x+")
\ No newline at end of file
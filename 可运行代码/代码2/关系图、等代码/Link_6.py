@@ -1,5 +1,7 @@
 import networkx as nx
 import matplotlib.pyplot as plt
+from render_profiles import save_figure, get_profile
+from layout_cache import cached_spring_layout
 
 # 1. 配置Windows中文字体（解决中文显示问题）
 try:
@@ -125,8 +127,9 @@ for node in G.nodes():
 plt.figure(figsize=(19, 15))
 
 # 弹簧布局：优化中文长标签显示
-pos = nx.spring_layout(
+pos = cached_spring_layout(
     G,
+    'Link_6', cache_dir='layout_cache',  # 图结构不变时复用上次布局，少量变化时从上次坐标热启动
     k=8.0,  # 增大节点间距，适配长中文标签
     iterations=300,  # 多次迭代优化布局
     seed=42  # 固定布局一致性
@@ -163,13 +166,13 @@ plt.title('玛丽·居里（居里夫人）核心关系网络图谱', fontsize=2
 # 隐藏坐标轴，保存高清图谱
 plt.axis('off')
 plt.tight_layout()
-plt.savefig(
+output_file = save_figure(
     '居里夫人关系图谱_终极兼容版.png',
-    dpi=300,
+    get_profile(),  # 环境变量 RENDER_PROFILE=draft 时快速预览
     bbox_inches='tight'  # 确保中文标签不被截断
 )
 plt.close()
 
-print("🎉 图谱生成成功！文件：居里夫人关系图谱_终极兼容版.png")
+print(f"🎉 图谱生成成功！文件：{output_file}")
 print(f"📊 包含 {len(G.nodes())} 位关键人物，{len(edges)} 条核心关系")
 print("✅ 中文显示正常 | ✅ 无参数错误 | ✅ 兼容 nx 1.x+ & matplotlib 2.x+")
\ No newline at end of file
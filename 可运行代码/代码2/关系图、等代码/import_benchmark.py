@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+language_chinese 启动耗时基准：在干净的子进程中测量导入耗时和第一次情感分析耗时，
+超出预算或导入时加载了较重的依赖时以非零状态退出，可放在提交前检查或CI中
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+import tempfile
+import statistics
+from typing import Any, Dict, List
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 子进程在临时目录中运行（language_chinese 会在当前目录写日志），从脚本目录导入
+PROBE_ENV = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [SCRIPT_DIR, os.environ.get('PYTHONPATH')])),
+                 PYTHONIOENCODING='utf-8')
+
+# 导入 language_chinese 的耗时预算（秒）
+IMPORT_BUDGET_SECONDS = 1.5
+
+# 导入 language_chinese 时不应加载的模块（应在用到它们的阶段内导入）
+HEAVY_MODULES = [
+    'sklearn', 'scipy', 'matplotlib', 'seaborn', 'networkx', 'community',
+    'tqdm', 'docx', 'jieba.posseg', 'jieba.analyse'
+]
+
+# 子进程中执行的测量代码：导入 → 创建分析器 → 分析一句话（包含jieba词典加载）
+PROBE = '''
+import sys, time, json, tempfile
+heavy = {heavy!r}
+start = time.perf_counter()
+import language_chinese
+import_seconds = time.perf_counter() - start
+loaded_on_import = [m for m in heavy if m in sys.modules]
+
+start = time.perf_counter()
+analyzer = language_chinese.ChineseScientistBiographyAnalyzer(".", tempfile.mkdtemp())
+analyzer.analyze_chinese_sentiment("她在实验室里取得了重要的突破，获得了国际同行的高度评价。")
+sentiment_seconds = time.perf_counter() - start
+loaded_for_sentiment = [m for m in heavy if m in sys.modules]
+
+print(json.dumps({{"import": import_seconds, "first_sentiment": sentiment_seconds,
+                  "loaded_on_import": loaded_on_import,
+                  "loaded_for_sentiment": loaded_for_sentiment}}))
+'''
+
+
+def run_probe() -> Dict[str, Any]:
+    """在新的Python进程中运行一次测量"""
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE.format(heavy=HEAVY_MODULES)],
+        cwd=tempfile.gettempdir(), env=PROBE_ENV, capture_output=True, text=True, encoding='utf-8', check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(limit: int = 15) -> List[str]:
+    """用 python -X importtime 列出累计耗时最长的模块"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import language_chinese'],
+        cwd=tempfile.gettempdir(), env=PROBE_ENV, capture_output=True, text=True, encoding='utf-8', check=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        # 格式: "import time: <自身耗时us> | <累计耗时us> | <模块名>"
+        _, cumulative_us, name = line.split('|', 2)
+        rows.append((int(cumulative_us), name.strip()))
+    rows.sort(reverse=True)
+    return [f"{cumulative / 1e6:8.3f}s  {name}" for cumulative, name in rows[:limit]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="测量 language_chinese 的导入耗时并检查启动预算")
+    parser.add_argument('--repeat', type=int, default=5, help="测量次数，取中位数")
+    parser.add_argument('--budget', type=float, default=IMPORT_BUDGET_SECONDS, help="导入耗时预算（秒）")
+    parser.add_argument('--details', action='store_true', help="列出导入耗时最长的模块")
+    args = parser.parse_args()
+
+    runs = [run_probe() for _ in range(args.repeat)]
+    import_seconds = statistics.median(run['import'] for run in runs)
+    sentiment_seconds = statistics.median(run['first_sentiment'] for run in runs)
+    loaded_on_import = runs[-1]['loaded_on_import']
+    loaded_for_sentiment = runs[-1]['loaded_for_sentiment']
+
+    print(f"导入 language_chinese: {import_seconds:.3f}s（预算 {args.budget:.3f}s，{args.repeat} 次取中位数）")
+    print(f"第一次情感分析（含jieba词典加载）: {sentiment_seconds:.3f}s")
+    print(f"情感分析加载的较重依赖: {', '.join(loaded_for_sentiment) or '无'}")
+    if args.details:
+        print("导入耗时最长的模块（累计）:")
+        for line in slowest_imports():
+            print(f"  {line}")
+
+    failed = False
+    if import_seconds > args.budget:
+        print(f"超出预算: 导入耗时 {import_seconds:.3f}s > {args.budget:.3f}s")
+        failed = True
+    if loaded_on_import:
+        print(f"导入时加载了应延迟导入的模块: {', '.join(loaded_on_import)}")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
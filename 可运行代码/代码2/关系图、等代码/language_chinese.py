@@ -4,8 +4,6 @@
 针对中文文本的完整解决方案
 """
 import jieba
-import jieba.posseg as pseg
-import jieba.analyse
 import pandas as pd
 import numpy as np
 import re
@@ -14,52 +12,64 @@ import warnings
 import json
 import pickle
 import hashlib
+import shutil
+import argparse
+import threading
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional, Any, Set
 import logging
-from tqdm import tqdm
 from collections import defaultdict, Counter
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import gc
-from docx import Document
-from sklearn.preprocessing import MinMaxScaler, StandardScaler
-from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
-from sklearn.decomposition import LatentDirichletAllocation, NMF
-from sklearn.metrics import silhouette_score, calinski_harabasz_score
-from sklearn.cluster import KMeans
-from sklearn.manifold import TSNE
-import matplotlib.pyplot as plt
-import seaborn as sns
-import networkx as nx
-import matplotlib
-from matplotlib import font_manager
-import community as community_louvain
-from scipy import sparse
-from scipy.stats import zscore
-
-# 设置matplotlib中文字体
-try:
-    # 尝试多种中文字体路径
-    font_paths = [
-        "C:\\Windows\\Fonts\\simhei.ttf",  # Windows黑体
-        "C:\\Windows\\Fonts\\msyh.ttc",  # Windows微软雅黑
-        "C:\\Windows\\Fonts\\simsun.ttc",  # Windows宋体
-        "/System/Library/Fonts/PingFang.ttc",  # Mac苹方
-        "/usr/share/fonts/truetype/droid/DroidSansFallbackFull.ttf",  # Linux
-    ]
+from result_export import write_json, write_excel_streaming, write_csv_bundle
+from tracing import Tracer
+from render_profiles import RENDER_PROFILES, RenderCache, save_figure
+
+# sklearn、matplotlib、networkx、jieba词性标注和关键词提取、tqdm、python-docx 等较重的依赖
+# 在用到它们的阶段内导入，导入本模块和只做情感分析时不必加载（见 import_benchmark.py）
+
+# 中文字体候选路径
+CHINESE_FONT_PATHS = [
+    "C:\\Windows\\Fonts\\simhei.ttf",  # Windows黑体
+    "C:\\Windows\\Fonts\\msyh.ttc",  # Windows微软雅黑
+    "C:\\Windows\\Fonts\\simsun.ttc",  # Windows宋体
+    "/System/Library/Fonts/PingFang.ttc",  # Mac苹方
+    "/usr/share/fonts/truetype/droid/DroidSansFallbackFull.ttf",  # Linux
+]
+
+_font_configured = False
+
+
+def get_pyplot():
+    """
+    导入 matplotlib.pyplot，第一次调用时设置中文字体
+
+    Returns:
+        matplotlib.pyplot 模块
+    """
+    global _font_configured
+    import matplotlib
+    import matplotlib.pyplot as plt
+
+    if not _font_configured:
+        _font_configured = True
+        try:
+            # 尝试多种中文字体路径
+            from matplotlib import font_manager
+            for font_path in CHINESE_FONT_PATHS:
+                if os.path.exists(font_path):
+                    font_prop = font_manager.FontProperties(fname=font_path)
+                    matplotlib.rcParams['font.sans-serif'] = [font_prop.get_name()]
+                    matplotlib.rcParams['axes.unicode_minus'] = False
+                    break
+            else:
+                # 如果找不到字体文件，尝试使用系统已安装的字体
+                matplotlib.rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei', 'SimSun']
+                matplotlib.rcParams['axes.unicode_minus'] = False
+        except Exception as e:
+            print(f"字体设置警告: {e}")
+    return plt
 
-    for font_path in font_paths:
-        if os.path.exists(font_path):
-            font_prop = font_manager.FontProperties(fname=font_path)
-            matplotlib.rcParams['font.sans-serif'] = [font_prop.get_name()]
-            matplotlib.rcParams['axes.unicode_minus'] = False
-            break
-    else:
-        # 如果找不到字体文件，尝试使用系统已安装的字体
-        matplotlib.rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei', 'SimSun']
-        matplotlib.rcParams['axes.unicode_minus'] = False
-except Exception as e:
-    print(f"字体设置警告: {e}")
 
 # 配置日志
 logging.basicConfig(
@@ -75,9 +85,24 @@ logger = logging.getLogger(__name__)
 warnings.filterwarnings('ignore')
 
 
+_jieba_initialized = False
+_jieba_lock = threading.Lock()
+
+
 # 初始化jieba，添加专业词汇
 def initialize_jieba():
-    """初始化jieba分词器，添加专业词汇"""
+    """初始化jieba分词器，添加专业词汇（只执行一次，在第一次分词前调用）"""
+    global _jieba_initialized
+    if _jieba_initialized:
+        return
+    with _jieba_lock:
+        if not _jieba_initialized:
+            _add_jieba_words()
+            _jieba_initialized = True
+
+
+def _add_jieba_words():
+    """向jieba词典添加科学家人名和学术词汇"""
     # 添加科学家人名（可根据需要扩展）
     scientists = [
         '屠呦呦', '张弥曼', '颜宁', '庄小威', '李飞飞',
@@ -103,8 +128,6 @@ def initialize_jieba():
         logger.info(f"已加载自定义词典: {custom_dict_path}")
 
 
-initialize_jieba()
-
 # 中文停用词扩展（学术专用）
 CHINESE_STOPWORDS = set([
     # 基础停用词
@@ -204,6 +227,13 @@ CHINESE_RELATIONSHIP_PATTERNS = {
 class ChineseScientistBiographyAnalyzer:
     """中文科学家传记分析器"""
 
+    # 流水线阶段（按执行顺序），每完成一个阶段保存一次检查点
+    PIPELINE_STAGES = ['load', 'sentiment', 'network', 'topics', 'visualization']
+
+    # 检查点中保存的分析状态
+    CHECKPOINT_ATTRIBUTES = ['df', 'sentiment_df', 'relationship_graph', 'relationship_data',
+                             'topics', 'topic_distributions', 'quality_metrics', 'performance_stats']
+
     def __init__(self, input_path: str, output_folder: str = "chinese_results"):
         """
         初始化中文分析器
@@ -224,9 +254,9 @@ class ChineseScientistBiographyAnalyzer:
         self.topics = None
         self.topic_distributions = None
 
-        # 初始化工具
-        self.scaler = MinMaxScaler()
-        self.std_scaler = StandardScaler()
+        # 初始化工具（首次使用时创建，避免导入本模块时加载 sklearn）
+        self._scaler = None
+        self._std_scaler = None
 
         # 质量评估
         self.quality_metrics = {}
@@ -235,11 +265,44 @@ class ChineseScientistBiographyAnalyzer:
         # 缓存
         self._cache = {}
 
+        # 断点续跑
+        self.checkpoint_dir = os.path.join(self.output_folder, "checkpoints")
+        self.resume = False
+
+        # 导出格式: 'excel'（流式写入xlsx）、'csv'（每个工作表一个CSV）或 'both'
+        self.export_format = 'excel'
+
+        # 性能追踪（默认关闭，调用 self.tracer.enable() 开启）
+        self.tracer = Tracer()
+
+        # 图表渲染配置: 'draft'（低分辨率快速查看）、'publication'（300dpi）或 'svg'
+        self.render_profile = 'publication'
+        # 为 True 时忽略渲染缓存，所有图表重新渲染
+        self.force_render = False
+        # 关系网络布局后端: 'spring'（nx.spring_layout）、'force'（网格加速的多层级布局）或 'auto'（按节点数选择）
+        self.layout_backend = 'auto'
+
         # 确保输出目录存在
         os.makedirs(self.output_folder, exist_ok=True)
 
         logger.info(f"初始化中文分析器: input={input_path}, output={output_folder}")
 
+    @property
+    def scaler(self):
+        """MinMaxScaler 实例"""
+        if self._scaler is None:
+            from sklearn.preprocessing import MinMaxScaler
+            self._scaler = MinMaxScaler()
+        return self._scaler
+
+    @property
+    def std_scaler(self):
+        """StandardScaler 实例"""
+        if self._std_scaler is None:
+            from sklearn.preprocessing import StandardScaler
+            self._std_scaler = StandardScaler()
+        return self._std_scaler
+
     def _cache_key(self, func_name: str, *args) -> str:
         """生成缓存键"""
         arg_str = "_".join(str(arg) for arg in args)
@@ -248,12 +311,75 @@ class ChineseScientistBiographyAnalyzer:
 
     def _get_cached(self, key: str):
         """获取缓存结果"""
-        return self._cache.get(key)
+        value = self._cache.get(key)
+        self.tracer.count('cache_hits' if value is not None else 'cache_misses')
+        return value
 
     def _set_cached(self, key: str, value):
         """设置缓存"""
         self._cache[key] = value
 
+    def _atomic_pickle(self, path: str, value: Any):
+        """先写临时文件再重命名，保证检查点文件要么完整要么不存在"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = path + ".tmp"
+        with open(temp_path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+
+    def _stage_checkpoint_path(self, stage: str) -> str:
+        """阶段检查点文件路径"""
+        return os.path.join(self.checkpoint_dir, f"stage_{stage}.pkl")
+
+    def _save_stage_checkpoint(self, stage: str):
+        """保存阶段完成后的分析状态"""
+        state = {attr: getattr(self, attr) for attr in self.CHECKPOINT_ATTRIBUTES}
+        self._atomic_pickle(self._stage_checkpoint_path(stage), state)
+        logger.info(f"已保存阶段检查点: {stage}")
+
+    def _load_latest_stage_checkpoint(self) -> Optional[str]:
+        """
+        恢复最近完成的阶段的分析状态
+
+        Returns:
+            最近完成的阶段名，没有检查点时返回 None
+        """
+        for stage in reversed(self.PIPELINE_STAGES):
+            path = self._stage_checkpoint_path(stage)
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    state = pickle.load(f)
+                for attr, value in state.items():
+                    setattr(self, attr, value)
+                logger.info(f"从阶段检查点恢复: {stage}")
+                return stage
+        return None
+
+    def _unit_checkpoint_path(self, stage: str, unit: str) -> str:
+        """单个科学家（文档）检查点文件路径"""
+        digest = hashlib.md5(unit.encode('utf-8')).hexdigest()
+        return os.path.join(self.checkpoint_dir, stage, f"{digest}.pkl")
+
+    def _load_unit_checkpoint(self, stage: str, unit: str) -> Optional[Any]:
+        """续跑时读取已完成单元的结果，未完成或未开启续跑时返回 None"""
+        if not self.resume:
+            return None
+        path = self._unit_checkpoint_path(stage, unit)
+        if not os.path.exists(path):
+            return None
+        self.tracer.count('checkpoint_hits')
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+    def _save_unit_checkpoint(self, stage: str, unit: str, value: Any):
+        """保存单个科学家（文档）的结果"""
+        self._atomic_pickle(self._unit_checkpoint_path(stage, unit), value)
+
+    def _clear_checkpoints(self):
+        """删除所有检查点"""
+        if os.path.exists(self.checkpoint_dir):
+            shutil.rmtree(self.checkpoint_dir)
+
     def extract_text_from_docx(self, docx_path: str) -> str:
         """从Word文档提取文本（支持中文）"""
         cache_key = self._cache_key("extract_text", docx_path)
@@ -262,6 +388,7 @@ class ChineseScientistBiographyAnalyzer:
             return cached
 
         try:
+            from docx import Document
             doc = Document(docx_path)
             text_parts = []
 
@@ -331,8 +458,10 @@ class ChineseScientistBiographyAnalyzer:
             return result
 
         # 分词
+        initialize_jieba()
         if use_pos:
             # 使用词性标注
+            import jieba.posseg as pseg
             words = pseg.cut(text)
             tokens = []
             for word, flag in words:
@@ -350,6 +479,7 @@ class ChineseScientistBiographyAnalyzer:
         if tokens:
             # 使用jieba的TF-IDF关键词提取
             try:
+                import jieba.analyse
                 keywords = jieba.analyse.extract_tags(
                     ' '.join(tokens),
                     topK=20,
@@ -408,6 +538,7 @@ class ChineseScientistBiographyAnalyzer:
             return {'score': 0, 'confidence': 0, 'positive_words': [], 'negative_words': []}
 
         # 分词
+        initialize_jieba()
         words = jieba.cut(text)
         words = [w for w in words if w not in CHINESE_STOPWORDS and len(w) > 1]
 
@@ -550,6 +681,8 @@ class ChineseScientistBiographyAnalyzer:
     def _extract_relationships_by_ner(self, text: str, scientist_name: str, relationships: Dict):
         """基于命名实体识别提取关系（简化版）"""
         # 使用jieba的词性标注来识别人名和机构名
+        import jieba.posseg as pseg
+        initialize_jieba()
         words = pseg.cut(text)
 
         persons = []
@@ -662,6 +795,7 @@ class ChineseScientistBiographyAnalyzer:
 
     def load_and_preprocess_biographies(self) -> bool:
         """加载并预处理所有中文传记"""
+        from tqdm import tqdm
         logger.info("开始加载和预处理中文Word文档...")
         start_time = datetime.now()
 
@@ -672,24 +806,32 @@ class ChineseScientistBiographyAnalyzer:
             logger.error("未找到Word文档")
             return False
 
-        # 处理每个文档
+        # 处理每个文档（续跑时已完成分词的文档直接从检查点读取）
         scientist_data = []
+        processed_by_file = {}
 
         for docx_file in tqdm(docx_files, desc="处理文档"):
-            result = self._process_single_chinese_biography(docx_file)
+            checkpoint = self._load_unit_checkpoint('load', docx_file)
+            if checkpoint is not None:
+                processed_by_file[docx_file] = checkpoint
+                continue
+            with self.tracer.span('extract_document', file=os.path.basename(docx_file)):
+                result = self._process_single_chinese_biography(docx_file)
             if result:
                 scientist_data.append(result)
 
-        if not scientist_data:
+        if not scientist_data and not processed_by_file:
             logger.error("没有成功提取任何有效文本")
             return False
 
         # 构建DataFrame
-        processed_data = []
-
         for data in scientist_data:
             # 分词和短语提取
-            tokens, phrases = self.segment_chinese_text(data['cleaned_text'], use_pos=True)
+            with self.tracer.span('segment_document', scientist=data['name']):
+                tokens, phrases = self.segment_chinese_text(data['cleaned_text'], use_pos=True)
+            self.tracer.count('documents')
+            self.tracer.count('tokens', len(tokens))
+            self.tracer.count('sentences', len(data['sentences']))
 
             # 计算文本统计指标
             word_count = len(tokens)
@@ -700,7 +842,7 @@ class ChineseScientistBiographyAnalyzer:
             ttr = unique_words / word_count if word_count > 0 else 0
             avg_sent_len = np.mean([len(s) for s in data['sentences']]) if data['sentences'] else 0
 
-            processed_data.append({
+            record = {
                 'scientist': data['name'],
                 'full_text': data['cleaned_text'],
                 'raw_text': data['raw_text'],
@@ -715,15 +857,20 @@ class ChineseScientistBiographyAnalyzer:
                 'avg_sentence_length': avg_sent_len,
                 'sentence_length_std': np.std([len(s) for s in data['sentences']]) if len(data['sentences']) > 1 else 0,
                 'file_path': data['file_path']
-            })
+            }
+            processed_by_file[data['file_path']] = record
+            self._save_unit_checkpoint('load', data['file_path'], record)
+
+        # 保持与文档列表相同的顺序
+        processed_data = [processed_by_file[f] for f in docx_files if f in processed_by_file]
 
         self.df = pd.DataFrame(processed_data)
 
         # 记录质量指标
         self.quality_metrics['data_loading'] = {
             'total_files': len(docx_files),
-            'valid_files': len(scientist_data),
-            'success_rate': len(scientist_data) / len(docx_files),
+            'valid_files': len(processed_data),
+            'success_rate': len(processed_data) / len(docx_files),
             'avg_text_length': self.df['word_count'].mean(),
             'avg_sentence_count': self.df['sentence_count'].mean(),
             'avg_ttr': self.df['ttr'].mean()
@@ -780,6 +927,7 @@ class ChineseScientistBiographyAnalyzer:
 
     def analyze_sentiment_for_all(self) -> bool:
         """为所有科学家进行情感分析"""
+        from tqdm import tqdm
         if self.df is None:
             logger.error("请先加载传记数据")
             return False
@@ -798,8 +946,15 @@ class ChineseScientistBiographyAnalyzer:
                 sentiment_results.append(self._create_default_sentiment_result(scientist))
                 continue
 
+            # 续跑时跳过已完成的科学家
+            checkpoint = self._load_unit_checkpoint('sentiment', scientist)
+            if checkpoint is not None:
+                sentiment_results.append(checkpoint)
+                continue
+
             # 进行高级情感分析
-            sentiment_result = self.analyze_chinese_sentiment_advanced(text)
+            with self.tracer.span('document_sentiment', scientist=scientist):
+                sentiment_result = self.analyze_chinese_sentiment_advanced(text)
 
             # 句子级分析
             sentence_analyses = []
@@ -807,31 +962,33 @@ class ChineseScientistBiographyAnalyzer:
             negative_sentences = []
             neutral_sentences = []
 
-            for sentence in sentences[:100]:  # 限制句子数量
-                if len(sentence.strip()) < 5:
-                    continue
-
-                # 句子情感分析
-                sent_sentiment = self.analyze_chinese_sentiment(sentence)
-                score = sent_sentiment['score']
-
-                # 分类
-                if score > 0.1:
-                    sentiment_label = 'positive'
-                    positive_sentences.append(sentence)
-                elif score < -0.1:
-                    sentiment_label = 'negative'
-                    negative_sentences.append(sentence)
-                else:
-                    sentiment_label = 'neutral'
-                    neutral_sentences.append(sentence)
-
-                sentence_analyses.append({
-                    'sentence': sentence,
-                    'score': score,
-                    'sentiment_label': sentiment_label,
-                    'confidence': sent_sentiment['confidence']
-                })
+            with self.tracer.span('sentence_sentiment', scientist=scientist):
+                for sentence in sentences[:100]:  # 限制句子数量
+                    if len(sentence.strip()) < 5:
+                        continue
+
+                    # 句子情感分析
+                    sent_sentiment = self.analyze_chinese_sentiment(sentence)
+                    score = sent_sentiment['score']
+
+                    # 分类
+                    if score > 0.1:
+                        sentiment_label = 'positive'
+                        positive_sentences.append(sentence)
+                    elif score < -0.1:
+                        sentiment_label = 'negative'
+                        negative_sentences.append(sentence)
+                    else:
+                        sentiment_label = 'neutral'
+                        neutral_sentences.append(sentence)
+
+                    sentence_analyses.append({
+                        'sentence': sentence,
+                        'score': score,
+                        'sentiment_label': sentiment_label,
+                        'confidence': sent_sentiment['confidence']
+                    })
+            self.tracer.count('sentences_scored', len(sentence_analyses))
 
             # 计算统计指标
             total_sent = len(sentence_analyses)
@@ -863,6 +1020,7 @@ class ChineseScientistBiographyAnalyzer:
                 'positive_words': sentiment_result.get('positive_words', []),
                 'negative_words': sentiment_result.get('negative_words', [])
             })
+            self._save_unit_checkpoint('sentiment', scientist, sentiment_results[-1])
 
         self.sentiment_df = pd.DataFrame(sentiment_results)
 
@@ -903,6 +1061,8 @@ class ChineseScientistBiographyAnalyzer:
 
     def build_relationship_network(self) -> bool:
         """构建中文学术关系网络"""
+        import networkx as nx
+        from tqdm import tqdm
         if self.df is None:
             logger.error("请先加载传记数据")
             return False
@@ -994,6 +1154,8 @@ class ChineseScientistBiographyAnalyzer:
 
     def perform_chinese_topic_modeling(self, num_topics: int = 5, method: str = 'lda') -> bool:
         """中文主题建模"""
+        from sklearn.feature_extraction.text import CountVectorizer
+        from sklearn.decomposition import LatentDirichletAllocation, NMF
         if self.df is None or len(self.df) < 3:
             logger.warning("数据不足，跳过主题建模")
             return False
@@ -1174,21 +1336,36 @@ class ChineseScientistBiographyAnalyzer:
         """创建中文可视化图表"""
         logger.info("创建可视化图表...")
 
+        # 输入数据和绘图代码都没变的图表不重新渲染
+        cache = RenderCache(os.path.join(self.output_folder, "render_cache.json"),
+                            enabled=not self.force_render)
+        topic_column = None
+        if self.df is not None and 'dominant_topic' in self.df.columns:
+            topic_column = self.df['dominant_topic'].tolist()
+        word_counts = self.df[['scientist', 'word_count']] if self.df is not None else None
+
         try:
             # 1. 情感分析可视化
-            self._plot_sentiment_analysis_chinese()
+            cache.render(self._plot_sentiment_analysis_chinese, data=self.sentiment_df, profile=self.render_profile)
 
-            # 2. 关系网络可视化
-            self._plot_relationship_network_chinese()
+            # 2. 关系网络可视化（布局后端不同时节点位置不同，也作为缓存的输入）
+            cache.render(self._plot_relationship_network_chinese, data=(self.relationship_graph, self.layout_backend),
+                         profile=self.render_profile)
 
             # 3. 主题建模可视化
             if self.topics is not None:
-                self._plot_topic_modeling_chinese()
+                cache.render(self._plot_topic_modeling_chinese, data=(self.topics, topic_column),
+                             profile=self.render_profile)
 
             # 4. 综合可视化
-            self._plot_comprehensive_chinese()
+            cache.render(self._plot_comprehensive_chinese,
+                         data=(word_counts, self.sentiment_df, self.relationship_graph,
+                               self.performance_stats, self.quality_metrics),
+                         profile=self.render_profile)
 
-            logger.info("可视化图表创建完成")
+            cache.save()
+            self.tracer.count('charts_cached', cache.hits)
+            logger.info(f"可视化图表创建完成（渲染 {cache.misses} 张，缓存命中 {cache.hits} 张）")
 
         except Exception as e:
             logger.error(f"可视化创建失败: {e}")
@@ -1197,6 +1374,7 @@ class ChineseScientistBiographyAnalyzer:
         """绘制中文情感分析结果"""
         if self.sentiment_df is None:
             return
+        plt = get_pyplot()
 
         fig, axes = plt.subplots(2, 2, figsize=(15, 12))
 
@@ -1266,15 +1444,20 @@ class ChineseScientistBiographyAnalyzer:
 
         # 保存图表
         save_path = os.path.join(self.output_folder, "sentiment_analysis_chinese.png")
-        plt.savefig(save_path, dpi=300, bbox_inches='tight', facecolor='white')
+        save_path = save_figure(save_path, self.render_profile, facecolor='white')
         plt.show()
 
         logger.info(f"情感分析图表已保存至: {save_path}")
+        return save_path
 
     def _plot_relationship_network_chinese(self):
         """绘制中文关系网络"""
         if self.relationship_graph is None:
             return
+        import networkx as nx
+        from layout_cache import cached_spring_layout
+        from force_layout import select_layout_function
+        plt = get_pyplot()
 
         plt.figure(figsize=(14, 12))
 
@@ -1284,8 +1467,12 @@ class ChineseScientistBiographyAnalyzer:
         scientist_nodes = [n for n, d in G.nodes(data=True) if d.get('type') == 'scientist']
         other_nodes = [n for n in G.nodes() if n not in scientist_nodes]
 
-        # 布局算法
-        pos = nx.spring_layout(G, k=2, iterations=100, seed=42)
+        # 布局算法（按图结构缓存，网络有少量变化时从上次坐标热启动；大图改用网格加速的力导向布局）
+        layout_func = select_layout_function(G.number_of_nodes(), self.layout_backend)
+        layout_kwargs = {'k': 2} if layout_func is nx.spring_layout else {}
+        with self.tracer.span('network_layout', nodes=G.number_of_nodes(), layout=layout_func.__name__):
+            pos = cached_spring_layout(G, "relationship_network", os.path.join(self.output_folder, "layout_cache"),
+                                       layout_func=layout_func, iterations=100, seed=42, **layout_kwargs)
 
         # 绘制节点
         nx.draw_networkx_nodes(G, pos, nodelist=scientist_nodes,
@@ -1350,15 +1537,17 @@ class ChineseScientistBiographyAnalyzer:
 
         # 保存图表
         save_path = os.path.join(self.output_folder, "relationship_network_chinese.png")
-        plt.savefig(save_path, dpi=300, bbox_inches='tight', facecolor='white')
+        save_path = save_figure(save_path, self.render_profile, facecolor='white')
         plt.show()
 
         logger.info(f"关系网络图表已保存至: {save_path}")
+        return save_path
 
     def _plot_topic_modeling_chinese(self):
         """绘制中文主题建模结果"""
         if self.topics is None:
             return
+        plt = get_pyplot()
 
         fig, axes = plt.subplots(1, 2, figsize=(15, 6))
 
@@ -1411,13 +1600,15 @@ class ChineseScientistBiographyAnalyzer:
 
         # 保存图表
         save_path = os.path.join(self.output_folder, "topic_modeling_chinese.png")
-        plt.savefig(save_path, dpi=300, bbox_inches='tight', facecolor='white')
+        save_path = save_figure(save_path, self.render_profile, facecolor='white')
         plt.show()
 
         logger.info(f"主题建模图表已保存至: {save_path}")
+        return save_path
 
     def _plot_comprehensive_chinese(self):
         """绘制综合可视化图表"""
+        plt = get_pyplot()
         fig = plt.figure(figsize=(18, 12))
 
         # 1. 文本长度分布
@@ -1581,65 +1772,25 @@ class ChineseScientistBiographyAnalyzer:
 
         # 保存图表
         save_path = os.path.join(self.output_folder, "comprehensive_analysis_chinese.png")
-        plt.savefig(save_path, dpi=300, bbox_inches='tight', facecolor='white')
+        save_path = save_figure(save_path, self.render_profile, facecolor='white')
         plt.show()
 
         logger.info(f"综合图表已保存至: {save_path}")
+        return save_path
 
     def export_results(self):
         """导出中文分析结果"""
         logger.info("导出中文分析结果...")
 
-        # 1. Excel格式
-        if self.df is not None and self.sentiment_df is not None:
-            with pd.ExcelWriter(os.path.join(self.output_folder, "chinese_analysis_results.xlsx"),
-                                engine='openpyxl') as writer:
-
-                # 基础数据
-                df_export = self.df.copy()
-                if 'sentences' in df_export.columns:
-                    df_export['sentences'] = df_export['sentences'].apply(
-                        lambda x: ' | '.join(x) if isinstance(x, list) else x)
-                if 'tokens' in df_export.columns:
-                    df_export['tokens'] = df_export['tokens'].apply(lambda x: ' '.join(x) if isinstance(x, list) else x)
-
-                df_export.to_excel(writer, sheet_name='基础数据', index=False)
-
-                # 情感分析
-                sentiment_export = self.sentiment_df.copy()
-                if 'sentence_analyses' in sentiment_export.columns:
-                    sentiment_export = sentiment_export.drop(columns=['sentence_analyses'])
-                sentiment_export.to_excel(writer, sheet_name='情感分析', index=False)
-
-                # 关系网络摘要
-                if hasattr(self, 'relationship_data') and self.relationship_data:
-                    rel_summary = []
-                    for data in self.relationship_data:
-                        rel_summary.append({
-                            '科学家': data['scientist'],
-                            '总关系数': data['total_relationships'],
-                            '合作者': len(data['relationships'].get('collaborators', [])),
-                            '导师': len(data['relationships'].get('advisors', [])),
-                            '学生': len(data['relationships'].get('students', [])),
-                            '同事': len(data['relationships'].get('colleagues', [])),
-                            '机构': len(data['relationships'].get('institutions', []))
-                        })
-                    pd.DataFrame(rel_summary).to_excel(writer, sheet_name='关系网络', index=False)
-
-                # 主题建模
-                if self.topics is not None:
-                    topics_df = pd.DataFrame([
-                        {
-                            '主题ID': t['topic_id'],
-                            '主题类型': t['topic_type'],
-                            '关键词': ', '.join(t['top_words'][:10]),
-                            '一致性分数': t['coherence_score']
-                        }
-                        for t in self.topics
-                    ])
-                    topics_df.to_excel(writer, sheet_name='主题建模', index=False)
-
-            logger.info("Excel格式结果已导出")
+        # 1. 表格数据（Excel和/或CSV包）
+        sheets = self._build_export_sheets()
+        if sheets:
+            if self.export_format in ('excel', 'both'):
+                write_excel_streaming(sheets, os.path.join(self.output_folder, "chinese_analysis_results.xlsx"))
+                logger.info("Excel格式结果已导出")
+            if self.export_format in ('csv', 'both'):
+                write_csv_bundle(sheets, os.path.join(self.output_folder, "chinese_analysis_tables"))
+                logger.info("CSV格式结果已导出")
 
         # 2. JSON格式
         full_data = {
@@ -1657,13 +1808,13 @@ class ChineseScientistBiographyAnalyzer:
             }
         }
 
-        with open(os.path.join(self.output_folder, "chinese_analysis_summary.json"), 'w',
-                  encoding='utf-8') as f:
-            json.dump(full_data, f, indent=2, ensure_ascii=False)
+        # 质量指标中含有NumPy标量，使用支持NumPy的序列化
+        write_json(full_data, os.path.join(self.output_folder, "chinese_analysis_summary.json"))
 
         # 3. 网络数据
         if self.relationship_graph is not None:
             try:
+                import networkx as nx
                 nx.write_gexf(self.relationship_graph,
                               os.path.join(self.output_folder, "chinese_academic_network.gexf"))
                 logger.info("网络数据（GEXF格式）已导出")
@@ -1675,6 +1826,60 @@ class ChineseScientistBiographyAnalyzer:
 
         logger.info(f"所有结果已导出至: {self.output_folder}")
 
+    def _build_export_sheets(self) -> Dict[str, pd.DataFrame]:
+        """整理要导出的表格
+
+        Returns:
+            工作表名称到DataFrame的映射，缺少基础数据或情感分析结果时为空
+        """
+        sheets = {}
+        if self.df is None or self.sentiment_df is None:
+            return sheets
+
+        # 基础数据
+        df_export = self.df.copy()
+        if 'sentences' in df_export.columns:
+            df_export['sentences'] = df_export['sentences'].apply(
+                lambda x: ' | '.join(x) if isinstance(x, list) else x)
+        if 'tokens' in df_export.columns:
+            df_export['tokens'] = df_export['tokens'].apply(lambda x: ' '.join(x) if isinstance(x, list) else x)
+        sheets['基础数据'] = df_export
+
+        # 情感分析
+        sentiment_export = self.sentiment_df
+        if 'sentence_analyses' in sentiment_export.columns:
+            sentiment_export = sentiment_export.drop(columns=['sentence_analyses'])
+        sheets['情感分析'] = sentiment_export
+
+        # 关系网络摘要
+        if hasattr(self, 'relationship_data') and self.relationship_data:
+            rel_summary = []
+            for data in self.relationship_data:
+                rel_summary.append({
+                    '科学家': data['scientist'],
+                    '总关系数': data['total_relationships'],
+                    '合作者': len(data['relationships'].get('collaborators', [])),
+                    '导师': len(data['relationships'].get('advisors', [])),
+                    '学生': len(data['relationships'].get('students', [])),
+                    '同事': len(data['relationships'].get('colleagues', [])),
+                    '机构': len(data['relationships'].get('institutions', []))
+                })
+            sheets['关系网络'] = pd.DataFrame(rel_summary)
+
+        # 主题建模
+        if self.topics is not None:
+            sheets['主题建模'] = pd.DataFrame([
+                {
+                    '主题ID': t['topic_id'],
+                    '主题类型': t['topic_type'],
+                    '关键词': ', '.join(t['top_words'][:10]),
+                    '一致性分数': t['coherence_score']
+                }
+                for t in self.topics
+            ])
+
+        return sheets
+
     def _export_chinese_summary(self):
         """导出中文文本摘要"""
         summary = []
@@ -1704,6 +1909,7 @@ class ChineseScientistBiographyAnalyzer:
             summary.append("")
 
         if self.relationship_graph is not None:
+            import networkx as nx
             summary.append(f"关系网络: {self.relationship_graph.number_of_nodes()} 节点, "
                            f"{self.relationship_graph.number_of_edges()} 边")
             summary.append(f"网络密度: {nx.density(self.relationship_graph):.3f}")
@@ -1728,40 +1934,79 @@ class ChineseScientistBiographyAnalyzer:
                   encoding='utf-8') as f:
             f.write('\n'.join(summary))
 
-    def run_complete_analysis(self, enable_topic_modeling: bool = True) -> bool:
-        """运行完整中文分析流程"""
+    def run_complete_analysis(self, enable_topic_modeling: bool = True, resume: bool = False) -> bool:
+        """
+        运行完整中文分析流程
+
+        Args:
+            enable_topic_modeling: 是否进行主题建模
+            resume: 是否从上次中断处继续（跳过已完成的阶段和科学家）
+
+        Returns:
+            是否成功完成
+        """
         logger.info("=" * 60)
         logger.info("🚀 开始中文女科学家传记分析")
         logger.info("=" * 60)
 
         total_start = datetime.now()
 
+        # 断点续跑：恢复最近完成的阶段，之前的阶段全部跳过
+        self.resume = resume
+        completed_stages = []
+        if resume:
+            last_stage = self._load_latest_stage_checkpoint()
+            if last_stage is not None:
+                completed_stages = self.PIPELINE_STAGES[:self.PIPELINE_STAGES.index(last_stage) + 1]
+                logger.info(f"跳过已完成的阶段: {', '.join(completed_stages)}")
+        else:
+            self._clear_checkpoints()
+
         try:
             # 1. 加载和预处理
-            if not self.load_and_preprocess_biographies():
-                logger.error("数据加载失败")
-                return False
+            if 'load' not in completed_stages:
+                with self.tracer.span('load'):
+                    if not self.load_and_preprocess_biographies():
+                        logger.error("数据加载失败")
+                        return False
+                    self._save_stage_checkpoint('load')
 
             # 2. 情感分析
-            if not self.analyze_sentiment_for_all():
-                logger.warning("情感分析出现警告，继续执行...")
+            if 'sentiment' not in completed_stages:
+                with self.tracer.span('sentiment'):
+                    if not self.analyze_sentiment_for_all():
+                        logger.warning("情感分析出现警告，继续执行...")
+                    self._save_stage_checkpoint('sentiment')
 
             # 3. 关系网络构建
-            if not self.build_relationship_network():
-                logger.warning("关系网络构建出现警告，继续执行...")
+            if 'network' not in completed_stages:
+                with self.tracer.span('network'):
+                    if not self.build_relationship_network():
+                        logger.warning("关系网络构建出现警告，继续执行...")
+                    self._save_stage_checkpoint('network')
 
             # 4. 主题建模（可选）
-            if enable_topic_modeling:
-                self.perform_chinese_topic_modeling(num_topics=min(5, len(self.df)), method='lda')
+            if 'topics' not in completed_stages:
+                with self.tracer.span('topics'):
+                    if enable_topic_modeling:
+                        self.perform_chinese_topic_modeling(num_topics=min(5, len(self.df)), method='lda')
+                    self._save_stage_checkpoint('topics')
 
             # 5. 可视化
-            try:
-                self.create_visualizations()
-            except Exception as e:
-                logger.warning(f"可视化失败: {e}")
+            if 'visualization' not in completed_stages:
+                with self.tracer.span('visualization'):
+                    try:
+                        self.create_visualizations()
+                    except Exception as e:
+                        logger.warning(f"可视化失败: {e}")
+                    self._save_stage_checkpoint('visualization')
 
             # 6. 导出结果
-            self.export_results()
+            with self.tracer.span('export'):
+                self.export_results()
+
+            # 全部完成后不再需要检查点
+            self._clear_checkpoints()
 
             # 总耗时
             total_time = (datetime.now() - total_start).total_seconds()
@@ -1790,6 +2035,9 @@ class ChineseScientistBiographyAnalyzer:
             print(f"\n❌ 分析失败: {e}")
             return False
 
+        finally:
+            self.tracer.save('chinese_analysis', os.path.join(self.output_folder, 'traces'))
+
     def _cleanup(self):
         """清理资源"""
         self._cache.clear()
@@ -1803,6 +2051,19 @@ class ChineseScientistBiographyAnalyzer:
 
 def main():
     """主函数 - 使用示例"""
+    parser = argparse.ArgumentParser(description="中文女科学家传记分析")
+    parser.add_argument('--resume', action='store_true', help="从上次中断的阶段和科学家继续")
+    parser.add_argument('--export-format', choices=['excel', 'csv', 'both'], default='excel',
+                        help="表格导出格式：流式Excel、CSV包或两者")
+    parser.add_argument('--trace', action='store_true', help="记录各阶段和各文档耗时，输出JSON和Chrome trace")
+    parser.add_argument('--profile', action='store_true', help="同时记录 cProfile 函数级耗时")
+    parser.add_argument('--trace-memory', action='store_true', help="同时用 tracemalloc 记录内存")
+    parser.add_argument('--render-profile', choices=list(RENDER_PROFILES), default='publication',
+                        help="图表渲染配置: draft 低分辨率快速查看, publication 300dpi, svg 矢量图")
+    parser.add_argument('--force-render', action='store_true', help="忽略渲染缓存，重新渲染所有图表")
+    parser.add_argument('--layout-backend', choices=['auto', 'spring', 'force'], default='auto',
+                        help="关系网络布局: spring 为 nx.spring_layout, force 为网格加速的多层级力导向布局, auto 按节点数选择")
+    args = parser.parse_args()
 
     # 替换为你的Word文档文件夹路径或单个Word文件路径
     word_folder_path = "D:\\Project\\shuju\\.venv\\wenjian"  # 请修改为实际路径
@@ -1812,10 +2073,17 @@ def main():
         input_path=word_folder_path,
         output_folder="chinese_analysis_results"
     )
+    analyzer.export_format = args.export_format
+    analyzer.render_profile = args.render_profile
+    analyzer.force_render = args.force_render
+    analyzer.layout_backend = args.layout_backend
+    if args.trace or args.profile or args.trace_memory:
+        analyzer.tracer.enable(profile=args.profile, memory=args.trace_memory)
 
     # 运行完整中文分析
     success = analyzer.run_complete_analysis(
-        enable_topic_modeling=True
+        enable_topic_modeling=True,
+        resume=args.resume
     )
 
     if success:
@@ -1837,6 +2105,8 @@ if __name__ == "__main__":
     print("=" * 60)
     print("请确保已安装以下依赖:")
     print("  pip install jieba pandas numpy matplotlib seaborn networkx scikit-learn python-docx")
+    print("可选（加快结果导出）:")
+    print("  pip install orjson xlsxwriter")
     print("=" * 60)
 
     main()
\ No newline at end of file
@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+"""
+图布局缓存：与 代码1 共用同一个实现（代码1/布局缓存.py），缓存文件格式也相同
+"""
+
+from tracing import SHARED_DIR  # noqa: F401  确保 代码1 在导入路径中
+
+from 布局缓存 import (  # noqa: E402
+    REFINE_ITERATIONS, MIN_SHARED_RATIO, graph_signature, warm_start_positions, cached_spring_layout
+)
+
+__all__ = ['REFINE_ITERATIONS', 'MIN_SHARED_RATIO', 'graph_signature', 'warm_start_positions',
+           'cached_spring_layout']
@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+"""
+图表渲染配置与渲染缓存：与 代码1 共用同一个实现（代码1/渲染配置.py）
+"""
+
+from tracing import SHARED_DIR  # noqa: F401  确保 代码1 在导入路径中
+
+from 渲染配置 import (  # noqa: E402
+    RENDER_PROFILES, DEFAULT_PROFILE, RENDER_PROFILE_ENV, RenderCache,
+    get_profile, set_profile, profile_path, save_figure, data_hash
+)
+
+__all__ = ['RENDER_PROFILES', 'DEFAULT_PROFILE', 'RENDER_PROFILE_ENV', 'RenderCache',
+           'get_profile', 'set_profile', 'profile_path', 'save_figure', 'data_hash']
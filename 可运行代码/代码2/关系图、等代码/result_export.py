@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+分析结果序列化：支持NumPy类型的JSON、常量内存Excel写入和CSV包导出
+"""
+
+import os
+import json
+from typing import Any, Dict, Iterator, List
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
+# Excel单元格最多容纳的字符数，超出部分截断（否则文件无法被Excel打开）
+EXCEL_MAX_CELL_CHARS = 32767
+
+
+def _to_builtin(obj: Any) -> Any:
+    """把NumPy/pandas对象转换为JSON可序列化的Python内置类型"""
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, np.floating):
+        return float(obj)
+    if isinstance(obj, np.bool_):
+        return bool(obj)
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, (pd.Timestamp, np.datetime64)):
+        return pd.Timestamp(obj).isoformat()
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj)
+    if isinstance(obj, pd.Series):
+        return obj.tolist()
+    if isinstance(obj, pd.DataFrame):
+        return obj.to_dict(orient='records')
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class NumpyJSONEncoder(json.JSONEncoder):
+    """标准库json的编码器，支持NumPy标量和数组"""
+
+    def default(self, obj):
+        try:
+            return _to_builtin(obj)
+        except TypeError:
+            return super().default(obj)
+
+
+def dumps_json(data: Any) -> bytes:
+    """序列化为UTF-8编码的JSON（缩进2格，中文不转义）
+
+    安装了orjson时直接在C层序列化NumPy数组和标量，否则使用NumpyJSONEncoder。
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            data,
+            default=_to_builtin,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(data, cls=NumpyJSONEncoder, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def write_json(data: Any, file_path: str):
+    """写入JSON文件"""
+    with open(file_path, 'wb') as f:
+        f.write(dumps_json(data))
+
+
+def _iter_sheet_rows(df: pd.DataFrame, chunk_size: int = 1000) -> Iterator[List[Any]]:
+    """分块把DataFrame转换为Python内置类型的行（缺失值为None），避免一次性复制整张表"""
+    for start in range(0, len(df), chunk_size):
+        chunk = df.iloc[start:start + chunk_size]
+        for row in chunk.astype(object).where(chunk.notna(), None).values.tolist():
+            for i, value in enumerate(row):
+                if isinstance(value, str):
+                    if len(value) > EXCEL_MAX_CELL_CHARS:
+                        row[i] = value[:EXCEL_MAX_CELL_CHARS]
+                elif isinstance(value, (np.generic, np.ndarray)):
+                    row[i] = _to_builtin(value)
+                elif isinstance(value, (list, tuple, dict, set)):
+                    row[i] = str(value)[:EXCEL_MAX_CELL_CHARS]
+            yield row
+
+
+def write_excel_streaming(sheets: Dict[str, pd.DataFrame], file_path: str):
+    """逐行流式写入多个工作表，内存占用与行数无关
+
+    优先使用xlsxwriter的constant_memory模式，未安装时使用openpyxl的write_only模式。
+
+    Args:
+        sheets: 工作表名称到DataFrame的映射（按插入顺序写入）
+        file_path: 输出的xlsx文件路径
+    """
+    if xlsxwriter is not None:
+        workbook = xlsxwriter.Workbook(file_path, {'constant_memory': True, 'strings_to_urls': False})
+        try:
+            for sheet_name, df in sheets.items():
+                worksheet = workbook.add_worksheet(sheet_name[:31])
+                worksheet.write_row(0, 0, [str(c) for c in df.columns])
+                for row_idx, row in enumerate(_iter_sheet_rows(df), start=1):
+                    worksheet.write_row(row_idx, 0, row)
+        finally:
+            workbook.close()
+        return
+
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    for sheet_name, df in sheets.items():
+        worksheet = workbook.create_sheet(sheet_name[:31])
+        worksheet.append([str(c) for c in df.columns])
+        for row in _iter_sheet_rows(df):
+            worksheet.append(row)
+    workbook.save(file_path)
+
+
+def write_csv_bundle(sheets: Dict[str, pd.DataFrame], folder: str) -> List[str]:
+    """把每个工作表写成一个CSV文件（utf-8-sig，Excel可直接打开）
+
+    Args:
+        sheets: 工作表名称到DataFrame的映射
+        folder: 输出目录
+
+    Returns:
+        写入的文件路径列表
+    """
+    os.makedirs(folder, exist_ok=True)
+    paths = []
+    for sheet_name, df in sheets.items():
+        path = os.path.join(folder, f"{sheet_name}.csv")
+        df.to_csv(path, index=False, encoding='utf-8-sig')
+        paths.append(path)
+    return paths
@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+"""
+性能追踪：与 代码1 共用同一个实现（代码1/性能追踪.py），追踪结果的格式也相同
+"""
+
+import os
+import sys
+
+SHARED_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '代码1'))
+if SHARED_DIR not in sys.path:
+    sys.path.append(SHARED_DIR)
+
+from 性能追踪 import Tracer, TRACE_DIR  # noqa: E402
+
+__all__ = ['Tracer', 'TRACE_DIR']